@@ -0,0 +1,127 @@
+"""Benchmark: columnar audit-log segments versus raw JSONL.
+
+Writes one ``audit_log_YYYY-MM-DD.jsonl`` file of ``--events`` checksummed
+events into a temporary directory, compacts it with each codec and reports:
+
+- the on-disk footprint of the JSONL file and of each segment,
+- an aggregate over two columns (events per ``event_type`` and
+  ``severity``) by parsing every JSONL line versus decoding just those two
+  columns of the segment,
+- a selective query (one ``subject_id``) through the JSONL sidecar index
+  versus the segment's filter-first read,
+- a full read of every event from either form.
+
+Usage::
+
+    python benchmarks/bench_audit_columns.py [--events 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from business_infinity.workflows._audit_logs import (
+    AuditLogStore,
+    _open_view,
+    build_log_index,
+    compact_log_file,
+    event_checksum,
+    iter_lines,
+)
+from business_infinity.workflows._columnar import ColumnarSegment
+
+EVENT_TYPES = ("boardroom_decision", "agent_vote", "mcp_request", "access_granted", "business_transaction")
+T0 = datetime(2026, 1, 1)
+
+
+def _write_file(path: str, events: int) -> None:
+    step = timedelta(days=1) / events
+    with open(path, "w") as handle:
+        for i in range(events):
+            event = {
+                "event_id": f"5f0c{i:08x}-1c2d-4e5f-8a9b-{i * 7919 % 10**12:012d}",
+                "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+                "timestamp": (T0 + step * i).isoformat(),
+                "severity": ("low", "medium", "high", "critical")[i % 4],
+                "subject_id": f"agent-{i % 500}",
+                "subject_type": "agent",
+                "action": f"Made decision: {('budget', 'hiring', 'pricing')[i % 3]}",
+                "context": {"amount": round(i * 1.5, 2), "votes": [0.9, 0.7, 0.8]},
+                "rationale": "Aligns with strategic goals",
+                "evidence": [],
+                "metrics": {"confidence_score": 0.87},
+                "signature": None,
+                "compliance_tags": ["sox", "gdpr"] if i % 2 else ["sox"],
+                "retention_until": (T0 + step * i + timedelta(days=2555)).isoformat(),
+            }
+            event["checksum"] = event_checksum(event)
+            handle.write(json.dumps(event) + "\n")
+
+
+def _jsonl_events(path: str):
+    view = _open_view(path)
+    for _, line in iter_lines(view):
+        yield json.loads(line)
+    view.close()
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "audit_log_2026-01-01.jsonl")
+        _write_file(source, args.events)
+        build_log_index(source)
+        jsonl_bytes = os.path.getsize(source)
+        print(f"events: {args.events}  JSONL: {jsonl_bytes / 2**20:.1f} MiB")
+
+        counts, scan = _timed(lambda: Counter((e["event_type"], e["severity"]) for e in _jsonl_events(source)))
+        print(f"  aggregate, JSONL parse         {scan:7.3f}s")
+        store = AuditLogStore(directory)
+        indexed, lookup = _timed(lambda: list(store.query(subject_id="agent-7")))
+        print(f"  subject query, sidecar index   {lookup:7.3f}s")
+        everything, full = _timed(lambda: list(_jsonl_events(source)))
+        print(f"  every event, JSONL parse       {full:7.3f}s")
+
+        for codec in ("zlib", "lzma"):
+            copy = os.path.join(directory, codec, os.path.basename(source))
+            os.makedirs(os.path.dirname(copy))
+            shutil.copy(source, copy)
+            summary, elapsed = _timed(lambda: compact_log_file(copy, codec=codec))
+            segment = ColumnarSegment(summary and os.path.join(os.path.dirname(copy), summary["segment"]))
+            print(
+                f"{codec}: segment {summary['segment_bytes'] / 2**20:.1f} MiB "
+                f"({summary['ratio']:.1f}x smaller), compacted and checked in {elapsed:.1f}s"
+            )
+
+            found, took = _timed(lambda: Counter(
+                (row["event_type"], row["severity"]) for row in segment.scan(["event_type", "severity"])
+            ))
+            assert found == counts
+            print(f"  aggregate, 2 columns           {took:7.3f}s  ({scan / took:.0f}x)  "
+                  f"{segment.bytes_read / 2**10:.0f} KiB read")
+            matches, took = _timed(lambda: list(segment.select(equals={"subject_id": "agent-7"})))
+            assert matches == indexed
+            print(f"  subject query, filter first    {took:7.3f}s  ({lookup / took:.1f}x)")
+            rows, took = _timed(lambda: list(segment.scan()))
+            assert rows == everything
+            print(f"  every event, all columns       {took:7.3f}s  ({full / took:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
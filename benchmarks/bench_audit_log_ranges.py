@@ -0,0 +1,106 @@
+"""Benchmark: time-range reads over a large audit-log file.
+
+Writes one ``audit_log_YYYY-MM-DD.jsonl`` file of ``--lines`` time-ordered
+events (about 500 bytes each) into a temporary directory, builds its sparse
+timestamp index, then times windows of several widths read:
+
+- by parsing every line and filtering on ``timestamp`` (no index),
+- through :meth:`AuditLogStore.query`, which binary-searches the block
+  index for the start and stops at the first line past the window.
+
+Usage::
+
+    python benchmarks/bench_audit_log_ranges.py [--lines 2000000] [--block-lines 1024]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from business_infinity.workflows._audit_logs import (
+    AuditLogStore,
+    _open_view,
+    build_time_index,
+    event_time,
+    iter_lines,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _write_file(path: str, lines: int) -> None:
+    step = timedelta(days=1) / lines
+    with open(path, "w") as handle:
+        for i in range(lines):
+            handle.write(json.dumps({
+                "event_id": f"ev-{i}",
+                "event_type": ("boardroom_decision", "agent_vote", "mcp_request")[i % 3],
+                "timestamp": (T0 + step * i).isoformat(timespec="microseconds"),
+                "severity": ("low", "medium", "high", "critical")[i % 4],
+                "subject_id": f"agent-{i % 500}",
+                "subject_type": "agent",
+                "action": "Made decision: budget",
+                "context": {"amount": i * 1.5, "votes": [0.9, 0.7, 0.8], "note": "x" * 120},
+                "rationale": "Aligns with strategic goals",
+                "metrics": {"confidence_score": 0.87},
+                "checksum": "0" * 64,
+                "signature": None,
+                "compliance_tags": ["sox"],
+                "retention_until": "2033-01-01T00:00:00",
+            }) + "\n")
+
+
+def _scan(path: str, start: datetime, end: datetime) -> int:
+    view = _open_view(path)
+    found = 0
+    for _, line in iter_lines(view):
+        when = event_time(json.loads(line))
+        found += start <= when <= end
+    view.close()
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    parser.add_argument("--block-lines", type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "audit_log_2026-01-01.jsonl")
+        _write_file(path, args.lines)
+        start = time.perf_counter()
+        index = build_time_index(path, args.block_lines)
+        built = time.perf_counter() - start
+        print(
+            f"lines: {args.lines}  size: {os.path.getsize(path) / 2**30:.2f} GiB  "
+            f"blocks: {len(index['offsets'])}  index: {os.path.getsize(path + '.ts.json') / 1024:.0f} KiB  "
+            f"built in {built:.1f}s"
+        )
+
+        store = AuditLogStore(directory, block_lines=args.block_lines)
+        for label, width in (("1 second", timedelta(seconds=1)), ("1 minute", timedelta(minutes=1)),
+                             ("1 hour", timedelta(hours=1))):
+            window_start = T0 + timedelta(hours=13, minutes=17, seconds=23.5)
+            window_end = window_start + width
+            begin = time.perf_counter()
+            expected = _scan(path, window_start, window_end)
+            scan = time.perf_counter() - begin
+            stats: dict = {}
+            begin = time.perf_counter()
+            found = sum(1 for _ in store.query(start_time=window_start, end_time=window_end, stats=stats))
+            indexed = time.perf_counter() - begin
+            assert found == expected
+            print(
+                f"{label:9s} window: {found:>7} events  full scan {scan:7.2f}s  "
+                f"indexed {indexed * 1000:8.1f}ms  ({stats['lines_read']} lines parsed, {scan / indexed:,.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: local audit-log checksum verification and indexed queries.
+
+Writes ``--files`` daily ``audit_log_YYYY-MM-DD.jsonl`` files of
+``--events`` checksummed events each into a temporary directory, then times:
+
+- checksum verification of every file inline and across ``--processes``
+  worker processes (speed-up needs that many free CPUs),
+- a selective query (one ``subject_id`` and ``event_type``) answered by
+  parsing every line versus through the sidecar indexes.
+
+Usage::
+
+    python benchmarks/bench_audit_logs.py [--files 8] [--events 50000] [--processes 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from business_infinity.workflows._audit_logs import AuditLogStore, event_checksum, iter_lines, _open_view
+
+EVENT_TYPES = ("boardroom_decision", "agent_vote", "mcp_request", "access_granted", "business_transaction")
+
+
+def _write_files(directory: str, files: int, events: int) -> int:
+    size = 0
+    for day_number in range(files):
+        day = (date(2026, 1, 1) + timedelta(days=day_number)).isoformat()
+        path = os.path.join(directory, f"audit_log_{day}.jsonl")
+        with open(path, "w") as handle:
+            for i in range(events):
+                event = {
+                    "event_id": f"{day}-{i}",
+                    "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+                    "timestamp": f"{day}T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}.000001",
+                    "severity": ("low", "medium", "high", "critical")[i % 4],
+                    "subject_id": f"agent-{i % 500}",
+                    "subject_type": "agent",
+                    "action": "Made decision: budget",
+                    "context": {"amount": i * 1.5, "votes": [0.9, 0.7, 0.8]},
+                    "rationale": "Aligns with strategic goals",
+                    "evidence": [],
+                    "metrics": {"confidence_score": 0.87},
+                    "signature": None,
+                    "compliance_tags": ["sox"],
+                    "retention_until": "2033-01-01T00:00:00",
+                }
+                event["checksum"] = event_checksum(event)
+                handle.write(json.dumps(event) + "\n")
+        size += os.path.getsize(path)
+    return size
+
+
+def _full_scan(store: AuditLogStore, subject_id: str, event_type: str) -> int:
+    found = 0
+    for _, path in store.files():
+        view = _open_view(path)
+        for _, line in iter_lines(view):
+            event = json.loads(line)
+            found += event["subject_id"] == subject_id and event["event_type"] == event_type
+        view.close()
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        size = _write_files(directory, args.files, args.events)
+        store = AuditLogStore(directory)
+        total = args.files * args.events
+        print(f"files: {args.files}  events: {total}  size: {size / 2**20:.1f} MiB  CPUs: {os.cpu_count()}")
+
+        for label, processes in (("inline", 0), (f"{args.processes} processes", args.processes)):
+            start = time.perf_counter()
+            result = asyncio.run(store.verify(processes))
+            elapsed = time.perf_counter() - start
+            assert result["verified"] and result["events_checked"] == total
+            print(f"verify + index, {label:12s} {elapsed:6.2f}s  {total / elapsed:>10,.0f} events/s")
+
+        start = time.perf_counter()
+        scanned = _full_scan(store, "agent-7", "mcp_request")
+        scan = time.perf_counter() - start
+        stats: dict = {}
+        start = time.perf_counter()
+        indexed = list(store.query(subject_id="agent-7", event_type="mcp_request", stats=stats))
+        lookup = time.perf_counter() - start
+        assert len(indexed) == scanned
+        print(f"query, full scan            {scan:6.3f}s  {total} lines parsed")
+        print(f"query, sidecar index        {lookup:6.3f}s  {stats['lines_read']} lines parsed  ({scan / lookup:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
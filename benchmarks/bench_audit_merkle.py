@@ -0,0 +1,115 @@
+"""Benchmark: linear hash-chain vs. per-day Merkle verification of the audit trail.
+
+Generates a synthetic decision trail (one record per ``--spacing`` seconds)
+served by an in-memory compliance-report client, then times:
+
+- the linear SHA-256 chain (:func:`verify_audit_chain`),
+- per-day Merkle roots with chunks hashed inline,
+- per-day Merkle roots with chunks hashed in a process pool of
+  ``--processes`` workers (speed-up needs that many free CPUs),
+
+and the size and build time of one inclusion proof (:func:`prove_entry`).
+
+Usage::
+
+    python benchmarks/bench_audit_merkle.py [--entries 200000] [--spacing 5] [--processes 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from business_infinity.workflows._audit import (
+    chain_hash,
+    get_process_pool,
+    iter_daily_roots,
+    prove_entry,
+    verify_audit_chain,
+    verify_inclusion,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class TrailClient:
+    """Serves ``generate_compliance_report`` from a pre-built list of records."""
+
+    def __init__(self, entries: List[Dict[str, Any]], spacing: float) -> None:
+        self.entries = entries
+        self.spacing = spacing
+
+    async def generate_compliance_report(self, start_time, end_time, report_type) -> Dict[str, Any]:
+        first = max(0, int((start_time - T0).total_seconds() // self.spacing))
+        last = int((end_time - T0).total_seconds() // self.spacing)
+        return {"entries": self.entries[first:last + 1]}
+
+
+def _trail(count: int, spacing: float) -> List[Dict[str, Any]]:
+    entries, prev = [], "0" * 64
+    for i in range(count):
+        entry = {
+            "id": f"decision-{i}",
+            "timestamp": (T0 + timedelta(seconds=spacing * i)).isoformat(),
+            "agent_id": ("ceo", "cfo", "cto", "coo")[i % 4],
+            "title": f"Decision {i}",
+            "rationale": "Approved after review of budget, risk and covenant impact. " * 3,
+            "confidence": 0.5 + (i % 50) / 100,
+        }
+        prev = entry["hash"] = chain_hash(prev, entry)
+        entries.append(entry)
+    return entries
+
+
+async def _run(args: argparse.Namespace) -> None:
+    entries = _trail(args.entries, args.spacing)
+    client = TrailClient(entries, args.spacing)
+    end = T0 + timedelta(seconds=args.spacing * args.entries)
+
+    start = time.perf_counter()
+    verifier, _ = await verify_audit_chain(client, T0, end)
+    linear = time.perf_counter() - start
+    assert verifier.anomaly_count == 0
+
+    results = {}
+    for label, executor in (("inline", None), (f"{args.processes} processes", get_process_pool(args.processes))):
+        start = time.perf_counter()
+        days = [day async for day in iter_daily_roots(client, T0, end, args.chunk_size, executor)]
+        results[label] = (time.perf_counter() - start, days)
+    assert len({tuple(days) for _, days in results.values()}) == 1, "pooled roots differ"
+
+    target = entries[len(entries) // 2]
+    start = time.perf_counter()
+    proof = await prove_entry(
+        client, target["id"], datetime.fromisoformat(target["timestamp"]), args.chunk_size,
+        get_process_pool(args.processes),
+    )
+    proving = time.perf_counter() - start
+    assert verify_inclusion(proof["leaf_hash"], proof["proof"], proof["day_root"])
+
+    days = len(next(iter(results.values()))[1])
+    print(f"entries: {args.entries}  days: {days}  chunk: {args.chunk_size}  CPUs: {os.cpu_count()}")
+    print(f"linear chain:         {linear:6.2f}s  {args.entries / linear:>10,.0f} entries/s")
+    for label, (elapsed, _) in results.items():
+        print(f"merkle, {label:13s} {elapsed:6.2f}s  {args.entries / elapsed:>10,.0f} entries/s")
+    print(
+        f"inclusion proof:      {proving:6.2f}s  {len(proof['proof'])} hashes "
+        f"for 1 of {proof['entry_count']} entries that day"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--spacing", type=float, default=5.0, help="seconds between records")
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--processes", type=int, default=4)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark: retention sweeps over ``audit_logs`` versus a load-filter-rewrite pass.
+
+Writes ``--days`` daily files of ``--events`` checksummed events into a
+temporary directory; ``--short-share`` of the events are kept 90 days, the
+rest seven years.  With the clock ``--due`` days past the first short
+expiry, only that many days hold expired events.  Reports:
+
+- the baseline: every file loaded whole, filtered and rewritten,
+- :meth:`AuditLogStore.sweep` (the expiry heap picks the due days, each
+  streamed into its replacement), and a second sweep with nothing due,
+- the peak Python heap while pruning one day either way,
+- verifying the pruned days against their retention manifests.
+
+Sidecar indexes are built first (by a verify pass), as they would be in
+service.
+
+Usage::
+
+    python benchmarks/bench_audit_retention.py [--days 30] [--events 20000] [--due 5] [--short-share 0.4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+from business_infinity.workflows._audit_logs import AuditLogStore, event_checksum, prune_log_file
+from business_infinity.workflows._columnar import to_micros
+
+T0 = datetime(2026, 1, 1)
+
+
+def _write_day(directory: str, day: int, events: int, short_share: float) -> None:
+    start = T0 + timedelta(days=day)
+    step = timedelta(days=1) / events
+    with open(os.path.join(directory, f"audit_log_{start.date().isoformat()}.jsonl"), "w") as handle:
+        for i in range(events):
+            when = start + step * i
+            keep = timedelta(days=90) if i % 100 < short_share * 100 else timedelta(days=2555)
+            event = {
+                "event_id": f"5f0c{day:04x}{i:08x}-1c2d-4e5f-8a9b-{i * 7919 % 10**12:012d}",
+                "event_type": ("boardroom_decision", "agent_vote", "mcp_request")[i % 3],
+                "timestamp": when.isoformat(),
+                "severity": ("low", "medium", "high", "critical")[i % 4],
+                "subject_id": f"agent-{i % 500}",
+                "subject_type": "agent",
+                "action": f"Made decision: {('budget', 'hiring', 'pricing')[i % 3]}",
+                "context": {"amount": round(i * 1.5, 2), "votes": [0.9, 0.7, 0.8]},
+                "signature": None,
+                "compliance_tags": ["sox"],
+                "retention_until": (when + keep).isoformat(),
+            }
+            event["checksum"] = event_checksum(event)
+            handle.write(json.dumps(event) + "\n")
+
+
+def _load_filter_rewrite(paths: List[str], now: int) -> int:
+    pruned = 0
+    for path in paths:
+        with open(path) as handle:
+            events = [json.loads(line) for line in handle]
+        kept = [event for event in events if to_micros(event["retention_until"]) > now]
+        pruned += len(events) - len(kept)
+        with open(path, "w") as handle:
+            handle.writelines(json.dumps(event) + "\n" for event in kept)
+    return pruned
+
+
+def _peak(function, *args) -> int:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    now_at = T0 + timedelta(days=90 + args.due)
+    now = to_micros(now_at.isoformat())
+    with tempfile.TemporaryDirectory() as pristine, tempfile.TemporaryDirectory() as work:
+        for day in range(args.days):
+            _write_day(pristine, day, args.events, args.short_share)
+        size = sum(os.path.getsize(os.path.join(pristine, name)) for name in os.listdir(pristine))
+        print(f"{args.days} days x {args.events} events, {size / 2**20:.1f} MiB; {args.due} day(s) due")
+
+        def reset() -> None:
+            shutil.rmtree(work)
+            shutil.copytree(pristine, work)
+
+        reset()
+        start = time.perf_counter()
+        pruned = _load_filter_rewrite([os.path.join(work, name) for name in sorted(os.listdir(work))], now)
+        print(f"{'load-filter-rewrite':24s} {time.perf_counter() - start:8.3f}s  pruned {pruned}")
+
+        reset()
+        store = AuditLogStore(work)
+        start = time.perf_counter()
+        await store.verify(processes=0)
+        print(f"{'verify before sweep':24s} {time.perf_counter() - start:8.3f}s")
+        start = time.perf_counter()
+        result = await store.sweep(now=now_at, processes=0)
+        print(f"{'sweep':24s} {time.perf_counter() - start:8.3f}s  pruned {result['events_pruned']} "
+              f"from {result['files_swept']} files, {result['bytes_reclaimed'] / 2**20:.1f} MiB reclaimed")
+        start = time.perf_counter()
+        again = await store.sweep(now=now_at, processes=0)
+        print(f"{'sweep, nothing due':24s} {time.perf_counter() - start:8.3f}s  files swept {again['files_swept']}")
+        start = time.perf_counter()
+        verified = await store.verify(processes=0)
+        print(f"{'verify after sweep':24s} {time.perf_counter() - start:8.3f}s  verified {verified['verified']}")
+
+        reset()
+        first = os.path.join(work, sorted(os.listdir(work))[0])
+        baseline = _peak(_load_filter_rewrite, [first], now)
+        reset()
+        streamed = _peak(prune_log_file, first, now)
+        print(f"peak heap, one day        load-filter-rewrite {baseline / 2**20:7.1f} MiB  "
+              f"prune_log_file {streamed / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--due", type=int, default=5)
+    parser.add_argument("--short-share", type=float, default=0.4)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
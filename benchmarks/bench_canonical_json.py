@@ -0,0 +1,99 @@
+"""Benchmark: audit entry serialisation for hashing.
+
+Encodes ``--entries`` synthetic decision records (cycling over
+``--distinct`` pre-built ones, each with a nested ``context`` object) with:
+
+- the AOS writer's ``str(sorted(entry.items()))`` — not canonical: nested
+  dicts keep insertion order and the text follows Python's ``repr`` rules,
+  but the hash chain keeps it to match the stored ``hash`` fields,
+- plain ``json.dumps(sort_keys=True)`` for reference,
+- :func:`canonical_bytes` with its key-type check,
+- :func:`entry_bytes` — canonical bytes without the check (audit entries
+  are JSON-decoded), as used by the Merkle leaves,
+
+then times the full ``sha256`` chain over each of the two encodings.
+
+Usage::
+
+    python benchmarks/bench_canonical_json.py [--entries 1000000] [--distinct 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from business_infinity.workflows._audit import chain_hash, entry_bytes
+from business_infinity.workflows._canonical import canonical_bytes
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _entries(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"decision-{i}",
+            "timestamp": (T0 + timedelta(seconds=5 * i)).isoformat(),
+            "agent_id": ("ceo", "cfo", "cto", "coo")[i % 4],
+            "title": f"Decision {i}",
+            "rationale": "Approved after review of budget, risk and covenant impact.",
+            "confidence": 0.5 + (i % 50) / 100,
+            "context": {"budget": 1250.75 * i, "region": "emea", "tags": ["capex", "q1"], "votes": {"for": 5, "against": 2}},
+        }
+        for i in range(count)
+    ]
+
+
+def _legacy(entry: Dict[str, Any]) -> bytes:
+    return str(sorted({k: v for k, v in entry.items() if k != "hash"}.items())).encode()
+
+
+def _json_dumps(entry: Dict[str, Any]) -> bytes:
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _time(encode: Callable[[Dict[str, Any]], bytes], entries: List[Dict[str, Any]], total: int) -> float:
+    start = time.perf_counter()
+    for i in range(total):
+        encode(entries[i % len(entries)])
+    return time.perf_counter() - start
+
+
+def _time_chain(encode: Callable[[Dict[str, Any]], bytes], entries: List[Dict[str, Any]], total: int) -> float:
+    prev = "0" * 64
+    start = time.perf_counter()
+    for i in range(total):
+        prev = hashlib.sha256(prev.encode() + encode(entries[i % len(entries)])).hexdigest()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=10_000)
+    args = parser.parse_args()
+    entries = _entries(args.distinct)
+    assert chain_hash("0" * 64, entries[0]) == hashlib.sha256(b"0" * 64 + _legacy(entries[0])).hexdigest()
+
+    print(f"entries: {args.entries}  ({args.distinct} distinct, ~{len(canonical_bytes(entries[0]))} bytes each)")
+    baseline = None
+    for label, encode in (
+        ("str(sorted(items))", _legacy),
+        ("json.dumps(sort_keys)", _json_dumps),
+        ("canonical_bytes", canonical_bytes),
+        ("entry_bytes", entry_bytes),
+    ):
+        elapsed = _time(encode, entries, args.entries)
+        baseline = baseline or elapsed
+        print(f"encode  {label:22s} {elapsed:6.2f}s  {args.entries / elapsed:>10,.0f}/s  {baseline / elapsed:4.2f}x")
+    for label, encode in (("str(sorted(items))", _legacy), ("entry_bytes", entry_bytes)):
+        elapsed = _time_chain(encode, entries, args.entries)
+        print(f"chain   {label:22s} {elapsed:6.2f}s  {args.entries / elapsed:>10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
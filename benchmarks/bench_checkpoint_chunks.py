@@ -0,0 +1,147 @@
+"""Benchmark: checkpoint storage with and without content-addressed chunks.
+
+Simulates a fleet of perpetual orchestrations that share the same agenda,
+covenants and C-suite profiles but accumulate their own decisions.  Every
+orchestration is checkpointed repeatedly through ``save_checkpoint`` against
+an in-memory document store, once with chunking disabled and once with the
+default chunk threshold.  The script reports the bytes held by the store
+(checkpoints, pointers and chunks), the number of chunk documents, and checks
+that every orchestration still resumes to its exact state.
+
+Usage::
+
+    python benchmarks/bench_checkpoint_chunks.py [--orchestrations 20] [--iterations 30] \
+        [--full-every 10] [--chunk-threshold 2048]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import random
+from typing import Any, Dict
+
+from bench_checkpoint_deltas import _advance
+
+from business_infinity.workflows import _checkpoints as cp
+
+
+_WORDS = (
+    "board strategy risk capital market covenant growth margin compliance "
+    "talent supplier revenue forecast approve review quarter budget policy "
+    "customer product regulatory audit investment liquidity governance ethics"
+).split()
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _shared_context() -> Dict[str, Any]:
+    """Agenda, covenants and C-suite profiles common to every orchestration.
+
+    Generated from a fixed seed with non-repeating prose, so that it
+    compresses like real documents rather than like repeated sentences.
+    """
+    rng = random.Random(42)
+    return {
+        "agenda": [_prose(rng, 12) for _ in range(12)],
+        "covenants": [
+            {"covenant_id": f"cov-{i}", "text": _prose(rng, 150)} for i in range(5)
+        ],
+        "c_suite": {
+            role: {"agent_id": role, "profile": _prose(rng, 200)}
+            for role in ("ceo", "cfo", "cmo", "coo", "cto", "cso", "chro")
+        },
+    }
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {
+        "phase": "strategic-review",
+        "iteration": 0,
+        **_shared_context(),
+        "kpis": {"revenue": 1_000_000.0, "burn": 250_000.0, "nps": 42},
+        "decisions": [],
+        "minutes": [],
+    }
+
+
+class _Store:
+    """Minimal in-memory stand-in for the knowledge-base document API."""
+
+    def __init__(self) -> None:
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count()
+
+    async def create_document(self, body: Dict[str, Any]) -> Any:
+        doc_id = body.get("document_id") or f"doc-{next(self._ids)}"
+        self.docs[doc_id] = {"document_id": doc_id, **copy.deepcopy(body)}
+        return type("Doc", (), {"document_id": doc_id})()
+
+    async def update_document(self, doc_id: str, fields: Dict[str, Any]) -> None:
+        self.docs[doc_id].update(fields)
+
+    async def get_document(self, doc_id: str) -> Dict[str, Any]:
+        return self.docs[doc_id]
+
+    def size(self) -> int:
+        return sum(len(json.dumps(doc)) for doc in self.docs.values())
+
+
+async def _run(
+    orchestrations: int,
+    iterations: int,
+    full_every: int,
+    chunk_threshold: int,
+) -> Dict[str, Any]:
+    cp._CHECKPOINT_STATE.clear()
+    cp._LATEST_CHECKPOINTS.clear()
+    cp._CHUNK_CACHE.clear()
+    store = _Store()
+    rng = random.Random(7)
+    states = {f"orch-{i}": _initial_state() for i in range(orchestrations)}
+    for _ in range(iterations):
+        for orch_id, state in states.items():
+            _advance(state, rng)
+            await cp.save_checkpoint(
+                store, orch_id, state,
+                full_snapshot_every=full_every,
+                chunk_threshold=chunk_threshold,
+            )
+
+    cp._CHUNK_CACHE.clear()
+    for orch_id, state in states.items():
+        latest = await cp.get_latest_checkpoint(store, orch_id)
+        rebuilt = await cp.load_checkpoint_data(store, latest)
+        assert rebuilt == json.loads(json.dumps(state)), f"{orch_id} resumed to a different state"
+    chunks = sum(1 for d in store.docs.values() if d["doc_type"] == cp.CHECKPOINT_CHUNK_DOC_TYPE)
+    return {"bytes": store.size(), "chunks": chunks}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orchestrations", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--full-every", type=int, default=cp.DEFAULT_FULL_SNAPSHOT_EVERY)
+    parser.add_argument("--chunk-threshold", type=int, default=cp.DEFAULT_CHUNK_THRESHOLD)
+    args = parser.parse_args()
+
+    plain = asyncio.run(_run(args.orchestrations, args.iterations, args.full_every, 0))
+    chunked = asyncio.run(_run(
+        args.orchestrations, args.iterations, args.full_every, args.chunk_threshold,
+    ))
+
+    print(f"orchestrations x checkpoints: {args.orchestrations} x {args.iterations} "
+          f"(full snapshot every {args.full_every} deltas)")
+    print(f"stored bytes, no chunking:    {plain['bytes'] / 1024 / 1024:.2f} MiB")
+    print(f"stored bytes, chunked:        {chunked['bytes'] / 1024 / 1024:.2f} MiB "
+          f"({chunked['chunks']} chunk documents)")
+    print(f"storage reduction:            {100 * (1 - chunked['bytes'] / plain['bytes']):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark: encode/decode latency and stored bytes for checkpoint payload codecs.
+
+Generates boardroom checkpoint states of increasing size (the growth profile
+from ``bench_checkpoint_deltas.py``) and measures, for each payload size,
+the stored size and encode/decode time of raw JSON, zlib and LZMA, plus the
+codec :func:`encode_payload` picks automatically.
+
+Usage::
+
+    python benchmarks/bench_checkpoint_codecs.py [--repeats 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+import time
+
+from bench_checkpoint_deltas import _advance, _initial_state
+
+from business_infinity.workflows import _checkpoints as cp
+
+
+def _time(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    state = _initial_state()
+    print(f"{'payload':>10} {'codec':>6} {'stored':>10} {'ratio':>6} {'enc ms':>8} {'dec ms':>8}")
+    for iterations in (0, 10, 100, 1000, 4000):
+        while state["iteration"] < iterations:
+            _advance(state, rng)
+        raw = json.dumps(state, separators=(",", ":")).encode()
+        for codec, (compress, decompress) in cp._CODECS.items():
+            framed = base64.b64encode(compress(raw))
+            enc = _time(lambda: base64.b64encode(compress(raw)), args.repeats)
+            dec = _time(lambda: json.loads(decompress(base64.b64decode(framed))), args.repeats)
+            print(f"{len(raw):>10} {codec:>6} {len(framed):>10} "
+                  f"{len(raw) / len(framed):>6.1f} {enc:>8.2f} {dec:>8.2f}")
+        stored, encoding = cp.encode_payload(state)
+        auto = _time(lambda: cp.encode_payload(state), args.repeats)
+        size = len(stored) if isinstance(stored, str) else len(raw)
+        print(f"{len(raw):>10} {'auto':>6} {size:>10} {len(raw) / size:>6.1f} {auto:>8.2f}"
+              f"{'':>9} -> {encoding}")
+
+
+if __name__ == "__main__":
+    main()
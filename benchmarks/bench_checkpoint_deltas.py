@@ -0,0 +1,99 @@
+"""Benchmark: bytes written by full vs. delta checkpoints for a growing boardroom state.
+
+Simulates a perpetual boardroom orchestration checkpointed once per iteration.
+Each iteration appends decisions and minutes, updates KPIs and occasionally
+changes the agenda, while the C-suite profiles and covenants stay unchanged.
+The script compares the serialized size of the checkpoint documents written
+with and without delta checkpoints, and checks that replaying the deltas
+reproduces the final state.
+
+Usage::
+
+    python benchmarks/bench_checkpoint_deltas.py [--iterations 500] [--full-every 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+from typing import Any, Dict
+
+from business_infinity.workflows import _checkpoints as cp
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {
+        "phase": "strategic-review",
+        "iteration": 0,
+        "agenda": [f"Agenda item {i}: review of initiative {i}" for i in range(12)],
+        "covenants": [
+            {"covenant_id": f"cov-{i}", "text": "Parties commit to ethical conduct. " * 20}
+            for i in range(5)
+        ],
+        "c_suite": {
+            role: {"agent_id": role, "profile": f"{role.upper()} operating profile. " * 30}
+            for role in ("ceo", "cfo", "cmo", "coo", "cto", "cso", "chro")
+        },
+        "kpis": {"revenue": 1_000_000.0, "burn": 250_000.0, "nps": 42},
+        "decisions": [],
+        "minutes": [],
+    }
+
+
+def _advance(state: Dict[str, Any], rng: random.Random) -> None:
+    state["iteration"] += 1
+    for _ in range(rng.randint(1, 3)):
+        state["decisions"].append({
+            "id": f"dec-{state['iteration']}-{len(state['decisions'])}",
+            "title": "Approve initiative",
+            "votes": {r: rng.random() for r in state["c_suite"]},
+            "rationale": "Consensus reached after review of supporting analysis. " * 3,
+        })
+    state["minutes"].append(f"Iteration {state['iteration']}: discussion summary. " * 5)
+    state["kpis"]["revenue"] *= 1.01
+    state["kpis"]["nps"] = rng.randint(30, 60)
+    if state["iteration"] % 25 == 0:
+        state["agenda"][rng.randrange(len(state["agenda"]))] = f"Revised item {state['iteration']}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--full-every", type=int, default=cp.DEFAULT_FULL_SNAPSHOT_EVERY)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    state = _initial_state()
+    docs: Dict[str, Dict[str, Any]] = {}
+    full_bytes = delta_bytes = 0
+    cp._CHECKPOINT_STATE.clear()
+
+    for i in range(args.iterations):
+        _advance(state, rng)
+        full_bytes += len(json.dumps({"checkpoint_data": state}))
+        body = cp.build_checkpoint_document(
+            "orch-bench", state, "now", args.full_every, chunk_threshold=0,
+        )
+        delta_bytes += len(json.dumps(body))
+        docs[f"cp-{i}"] = copy.deepcopy(body)
+        cp.record_checkpoint("orch-bench", f"cp-{i}", body, state)
+
+    class _Client:
+        async def get_document(self, document_id: str) -> Dict[str, Any]:
+            return docs[document_id]
+
+    rebuilt = asyncio.run(cp.load_checkpoint_data(_Client(), docs[f"cp-{args.iterations - 1}"]))
+    assert rebuilt == json.loads(json.dumps(state)), "replayed state differs from final state"
+
+    print(f"checkpoints written:      {args.iterations} (full snapshot every {args.full_every} deltas)")
+    print(f"final state size:         {len(json.dumps(state)) / 1024:.1f} KiB")
+    print(f"full-snapshot bytes:      {full_bytes / 1024 / 1024:.2f} MiB")
+    print(f"delta-checkpoint bytes:   {delta_bytes / 1024 / 1024:.2f} MiB")
+    print(f"write-size reduction:     {100 * (1 - delta_bytes / full_bytes):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: duplicate-decision checks against history versus Bloom filters.
+
+Records ``--history`` request idempotency keys for the day, then checks
+``--checks`` incoming decisions of which ``--duplicate-share`` are retried
+requests.  Reports the
+cost per check of:
+
+- scanning the day's recorded keys (what confirming a decision is new took
+  without an index),
+- :meth:`RecentKeys.add_if_new` — the day's Bloom filter first, its key
+  sidecar read only on a probable hit — cold (sidecar not yet read) and
+  warm,
+
+plus how often the sidecar was consulted, the measured false-positive rate
+and the size of the saved filter next to the sidecar.
+
+Usage::
+
+    python benchmarks/bench_decision_dedup.py [--history 200000] [--checks 20000] [--duplicate-share 0.01]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+
+from business_infinity.workflows._decision_log import decision_key
+from business_infinity.workflows._dedup import RecentKeys
+
+DAY = date(2026, 1, 1)
+
+
+def _request_key(i: int) -> str:
+    return f"req-{i:08x}-sign-agreement"
+
+
+def _incoming(args: argparse.Namespace) -> list:
+    every = max(1, round(1 / args.duplicate_share)) if args.duplicate_share else 0
+    return [
+        decision_key(_request_key(i % args.history if every and i % every == 0 else args.history + i))
+        for i in range(args.checks)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=200_000)
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument("--duplicate-share", type=float, default=0.01)
+    args = parser.parse_args()
+    history = [decision_key(_request_key(i)) for i in range(args.history)]
+    incoming = _incoming(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        keys = RecentKeys(directory, "seen")
+        for key in history:
+            keys.add_if_new(key, DAY)
+        keys.close()
+        sidecar = os.path.join(directory, f"seen_{DAY.isoformat()}.keys")
+        size = os.path.getsize(sidecar)
+        bloom = os.path.getsize(os.path.join(directory, f"seen_{DAY.isoformat()}.bloom"))
+        print(f"{args.history} keys recorded: sidecar {size / 2**20:.1f} MiB, filter {bloom / 2**20:.2f} MiB")
+
+        scans = incoming[:max(1, args.checks // 100)]
+        start = time.perf_counter()
+        for key in scans:
+            with open(sidecar, "rb") as handle:
+                key.encode() in handle.read().splitlines()
+        per_scan = (time.perf_counter() - start) / len(scans)
+        print(f"{'scan history':24s} {per_scan * 1e6:10.1f} us/check")
+
+        for label in ("bloom first, cold", "bloom first, warm"):
+            run = os.path.join(directory, label.replace(" ", "").replace(",", "-"))
+            shutil.copytree(directory, run, ignore=lambda _, names: [n for n in names if not n.startswith("seen_")])
+            keys = RecentKeys(run, "seen")
+            if label.endswith("warm"):
+                keys.add_if_new(history[0], DAY)  # reads the sidecar once
+                keys.stats = dict.fromkeys(keys.stats, 0)
+            start = time.perf_counter()
+            duplicates = sum(not keys.add_if_new(key, DAY) for key in incoming)
+            per_check = (time.perf_counter() - start) / len(incoming)
+            stats = keys.stats
+            false_positives = stats["probable"] - stats["duplicates"]
+            print(f"{label:24s} {per_check * 1e6:10.1f} us/check  duplicates {duplicates}  "
+                  f"sidecar reads {stats['sidecar_reads']}  "
+                  f"false positives {false_positives / (len(incoming) - duplicates):.4%}")
+            keys.close()
+
+
+if __name__ == "__main__":
+    main()
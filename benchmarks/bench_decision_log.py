@@ -0,0 +1,93 @@
+"""Benchmark: inline ``log_decision`` versus the write-behind decision queue.
+
+Simulates ``--requests`` workflow requests arriving ``--concurrency`` at a
+time against an AOS client whose ``log_decision`` takes ``--latency-ms``.
+Reports the request-path latency of each variant:
+
+- awaiting ``client.log_decision`` inline (the previous behaviour),
+- :meth:`DecisionLog.submit` with the journal flushed to the OS,
+- :meth:`DecisionLog.submit` with ``durable=True`` (one ``fsync`` per group
+  of concurrent submissions),
+
+and for the queue, the time until every decision was committed to AOS.
+
+Usage::
+
+    python benchmarks/bench_decision_log.py [--requests 2000] [--concurrency 50] [--latency-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import List
+
+from business_infinity.workflows._decision_log import DecisionLog
+
+
+class _Client:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.logged = 0
+
+    async def log_decision(self, decision: dict) -> None:
+        await asyncio.sleep(self.latency)
+        self.logged += 1
+
+
+async def _run(requests: int, concurrency: int, submit) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await submit({"title": f"Agreement agr-{i} signed", "rationale": "Network agreement signature",
+                          "agent_id": "ceo"})
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    return latencies
+
+
+def _report(label: str, latencies: List[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{label:22s} p50 {statistics.median(ordered) * 1000:8.3f}ms  p99 {p99 * 1000:8.3f}ms  "
+          f"requests done in {elapsed:6.2f}s")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    latency = args.latency_ms / 1000
+    client = _Client(latency)
+    start = time.perf_counter()
+    latencies = await _run(args.requests, args.concurrency, client.log_decision)
+    _report("inline", latencies, time.perf_counter() - start)
+
+    for label, durable in (("write-behind", False), ("write-behind, durable", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            client = _Client(latency)
+            log = DecisionLog(directory, durable=durable)
+            start = time.perf_counter()
+            latencies = await _run(args.requests, args.concurrency, lambda d: log.submit(client, d))
+            _report(label, latencies, time.perf_counter() - start)
+            await log.close()
+            committed = time.perf_counter() - start
+            assert client.logged == args.requests
+            print(f"{'':22s} all committed in {committed:6.2f}s  groups {log.stats['groups']}  "
+                  f"fsyncs {log.stats['syncs']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
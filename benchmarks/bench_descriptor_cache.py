@@ -0,0 +1,72 @@
+"""Benchmark: CPU per ``find-agents`` / ``mentor-list-agents`` call with and without
+the descriptor serialization cache.
+
+Builds a large synthetic catalog of pydantic agent descriptors (the shape the
+AOS SDK returns) and times serializing it per request via plain
+``model_dump(mode="json")`` versus :data:`descriptor_cache`.
+
+Usage::
+
+    python benchmarks/bench_descriptor_cache.py [--agents 5000] [--requests 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from business_infinity.workflows._app import DescriptorCache, catalog_version
+
+
+class _Descriptor(BaseModel):
+    agent_id: str
+    agent_type: str
+    purpose: str
+    capabilities: List[str]
+    config: Dict[str, Any]
+
+
+def _catalog(size: int) -> List[_Descriptor]:
+    return [
+        _Descriptor(
+            agent_id=f"agent-{i}",
+            agent_type="LeadershipAgent" if i % 7 else "CMOAgent",
+            purpose=f"Purpose statement for agent {i} " * 4,
+            capabilities=[f"capability-{(i + j) % 97}" for j in range(8)],
+            config={"model": "gpt", "temperature": 0.2, "tags": [str(i), "boardroom"]},
+        )
+        for i in range(size)
+    ]
+
+
+def _cpu(fn, repeats: int) -> float:
+    start = time.process_time()
+    for _ in range(repeats):
+        fn()
+    return (time.process_time() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    agents = _catalog(args.agents)
+    cache = DescriptorCache()
+
+    uncached = _cpu(lambda: [a.model_dump(mode="json") for a in agents], args.requests)
+    cache.dump_all(agents)  # first request populates the cache
+    cached = _cpu(lambda: cache.dump_all(agents, catalog_version(agents)), args.requests)
+
+    print(f"catalog size:         {args.agents} agents")
+    print(f"uncached CPU/request: {uncached * 1000:.2f} ms")
+    print(f"cached CPU/request:   {cached * 1000:.2f} ms (incl. catalog_version)")
+    print(f"speed-up:             {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: outbound webhook requests with and without coalescing windows.
+
+Simulates orchestration updates from many orchestrations arriving at a high
+rate (paced bursts), delivered to a local stand-in server (see
+``bench_webhook_delivery.py``) in four configurations:
+
+- no coalescing, one event per request,
+- no coalescing, batched JSON arrays,
+- ``key`` coalescing per ``orchestration_id`` (one event per request),
+- ``key`` coalescing plus batched arrays.
+
+Each run checks that the final update of every orchestration was delivered.
+
+Usage::
+
+    python benchmarks/bench_webhook_coalescing.py [--updates 20000] [--orchestrations 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from bench_webhook_delivery import StandInServer
+
+from business_infinity.workflows._delivery import WebhookDeliveryEngine
+
+
+async def _run(updates: int, orchestrations: int, coalesce: Optional[Dict[str, Any]], batches: bool) -> Dict[str, Any]:
+    last_seq: Dict[str, int] = {}
+
+    def record(body: Any) -> None:
+        for event in body if isinstance(body, list) else [body]:
+            orch = event["orchestration_id"]
+            last_seq[orch] = max(last_seq.get(orch, -1), event["seq"])
+
+    server = StandInServer(on_body=record)
+    url = await server.start()
+    engine = WebhookDeliveryEngine(max_concurrency=32, workers_per_endpoint=8, batch_window=0.005)
+    engine.register_endpoint(
+        "bench", url, accepts_batches=batches, max_batch_size=100,
+        queue_size=updates, coalesce=coalesce,
+    )
+    start = time.perf_counter()
+    for i in range(updates):
+        await engine.enqueue("bench", {
+            "orchestration_id": f"orch-{i % orchestrations}", "seq": i, "output": "x" * 64,
+        })
+        if i % 200 == 199:
+            await asyncio.sleep(0.01)  # ~20k updates/s in bursts
+    await engine.close()
+    elapsed = time.perf_counter() - start
+    await server.stop()
+    expected_last = {f"orch-{o}": max(range(o, updates, orchestrations)) for o in range(orchestrations)}
+    return {
+        "requests": server.requests,
+        "events": server.events,
+        "elapsed": elapsed,
+        "final_state": last_seq == expected_last,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--orchestrations", type=int, default=50)
+    parser.add_argument("--window-ms", type=float, default=250)
+    args = parser.parse_args()
+    window = {"window_ms": args.window_ms, "mode": "key", "key": "orchestration_id"}
+
+    print(f"updates: {args.updates}  orchestrations: {args.orchestrations}  window: {args.window_ms} ms")
+    baseline = None
+    for label, coalesce, batches in (
+        ("no coalescing", None, False),
+        ("no coalescing, batched", None, True),
+        ("coalesced by key", window, False),
+        ("coalesced by key, batched", window, True),
+    ):
+        result = asyncio.run(_run(args.updates, args.orchestrations, coalesce, batches))
+        baseline = baseline or result["requests"]
+        print(
+            f"{label:26s} {result['requests']:>6} requests ({baseline / result['requests']:>6.1f}x fewer)  "
+            f"{result['events']:>6} events  {result['elapsed']:.2f}s  "
+            f"final state {'ok' if result['final_state'] else 'LOST'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: webhook deliveries per second against a local HTTP stand-in server.
+
+Starts a minimal keep-alive HTTP/1.1 server on 127.0.0.1 that acknowledges
+every POST with ``200 OK`` (optionally after a fixed delay, to mimic a remote
+endpoint), then pushes events through :class:`WebhookDeliveryEngine` in
+three configurations:
+
+- one event per request on a new connection each time (no reuse, no batching),
+- one event per request over pooled keep-alive connections,
+- batched JSON arrays over pooled keep-alive connections.
+
+Usage::
+
+    python benchmarks/bench_webhook_delivery.py [--events 5000] [--latency-ms 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+from business_infinity.workflows._delivery import WebhookDeliveryEngine
+
+
+class StandInServer:
+    """Keep-alive HTTP server that counts requests, connections and events."""
+
+    def __init__(self, latency: float = 0.0, on_body: Optional[Callable[[Any], None]] = None) -> None:
+        self.latency = latency
+        self.on_body = on_body
+        self.requests = self.connections = self.events = 0
+        self._server: Any = None
+        self._handlers: set = set()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/hook"
+
+    async def stop(self) -> None:
+        """Stop accepting and wait for open connections to be closed by the client."""
+        self._server.close()
+        await asyncio.wait_for(asyncio.gather(*self._handlers), timeout=5)
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+                body = json.loads(await reader.readexactly(int(headers["content-length"])))
+                self.requests += 1
+                self.events += len(body) if isinstance(body, list) else 1
+                if self.on_body is not None:
+                    self.on_body(body)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                close = headers.get("connection") == "close"
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n"
+                    + (b"Connection: close\r\n" if close else b"") + b"\r\n"
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self._handlers.discard(task)
+
+
+async def _run(events: int, latency: float, keep_alive: bool, batches: bool) -> Dict[str, float]:
+    server = StandInServer(latency)
+    url = await server.start()
+    engine = WebhookDeliveryEngine(max_concurrency=32, workers_per_endpoint=8, batch_window=0.005)
+    engine.register_endpoint(
+        "bench", url, accepts_batches=batches, max_batch_size=100,
+        queue_size=2000, keep_alive=keep_alive,
+    )
+    start = time.perf_counter()
+    for i in range(events):
+        await engine.enqueue("bench", {"event_id": i, "type": "order.created", "amount": i * 1.5})
+    await engine.close()
+    elapsed = time.perf_counter() - start
+    await server.stop()
+    assert server.events == events == engine.stats["delivered"], "events lost"
+    return {"rate": events / elapsed, "requests": server.requests, "connections": server.connections}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    print(f"events: {args.events}  server latency: {args.latency_ms} ms  (8 workers, 32 in flight)")
+    for label, keep_alive, batches in (
+        ("new connection per event", False, False),
+        ("keep-alive, one per request", True, False),
+        ("keep-alive, batched arrays", True, True),
+    ):
+        result = asyncio.run(_run(args.events, latency, keep_alive, batches))
+        print(
+            f"{label:28s} {result['rate']:>9,.0f} events/s  "
+            f"{result['requests']:>5} requests  {result['connections']:>5} connections"
+        )
+
+
+if __name__ == "__main__":
+    main()
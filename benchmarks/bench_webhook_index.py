@@ -0,0 +1,113 @@
+"""Benchmark: routing events to matching webhooks, linear scan vs. WebhookIndex.
+
+Registers a large population of tenant webhooks (default 50,000) with a mix
+of filter shapes:
+
+- 70% ``tenant_id eq <tenant>`` combined with an amount threshold,
+- 10% ``priority in [...] and tenant_id eq <tenant>`` (the index must pick
+  the selective tenant conjunct over the broad priority one),
+- 15% pure range filters (``amount gt <threshold>``, rarely satisfied),
+- 5% filters with a top-level ``or`` that cannot be indexed.
+
+Each event is routed once by evaluating every compiled predicate (the linear
+baseline) and once through :class:`WebhookIndex`; the script checks that both
+produce the same webhook set and reports events routed per second.
+
+Usage::
+
+    python benchmarks/bench_webhook_index.py [--filters 50000] [--events 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from business_infinity.workflows._webhooks import WebhookIndex, compile_filter
+
+EVENT_TYPES = ["decision.created", "order.created", "risk.flagged", "budget.changed"]
+
+
+def _filters(count: int, tenants: int, rng: random.Random) -> List[Tuple[str, List[str], Dict[str, Any]]]:
+    filters = []
+    for i in range(count):
+        events = [rng.choice(EVENT_TYPES)]
+        roll = rng.random()
+        if roll < 0.70:
+            rule: Dict[str, Any] = {"and": [
+                {"field": "tenant_id", "op": "eq", "value": f"t{rng.randrange(tenants)}"},
+                {"field": "details.amount", "op": "gte", "value": rng.choice([0, 1e3, 1e5])},
+            ]}
+        elif roll < 0.80:
+            rule = {"and": [
+                {"field": "priority", "op": "in",
+                 "value": rng.sample(["low", "medium", "high", "critical"], 2)},
+                {"field": "tenant_id", "op": "eq", "value": f"t{rng.randrange(tenants)}"},
+            ]}
+        elif roll < 0.95:
+            rule = {"field": "details.amount", "op": "gt", "value": rng.uniform(9.9e6, 1e7)}
+        else:
+            rule = {"or": [
+                {"field": "source", "op": "matches", "value": f"erp-{i}"},
+                {"field": "details.flags.escalate", "op": "eq", "value": True},
+            ]}
+        filters.append((f"wh-{i}", events, rule))
+    return filters
+
+
+def _events(count: int, tenants: int, rng: random.Random) -> List[Tuple[str, Dict[str, Any]]]:
+    return [
+        (rng.choice(EVENT_TYPES), {
+            "tenant_id": f"t{rng.randrange(tenants)}",
+            "priority": rng.choice(["low", "medium", "high", "critical"]),
+            "source": "erp",
+            "details": {"amount": rng.uniform(0, 1e7), "flags": {"escalate": rng.random() < 0.01}},
+        })
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filters", type=int, default=50_000)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--tenants", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    filters = _filters(args.filters, args.tenants, rng)
+    events = _events(args.events, args.tenants, rng)
+
+    start = time.perf_counter()
+    index = WebhookIndex()
+    compiled = []
+    for webhook_id, event_types, rule in filters:
+        predicate = compile_filter(rule)
+        index.add(webhook_id, event_types, rule, predicate)
+        compiled.append((webhook_id, set(event_types), predicate))
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear = [
+        sorted(w for w, types, p in compiled if event_type in types and p(event))
+        for event_type, event in events
+    ]
+    linear_rate = len(events) / (time.perf_counter() - start)
+
+    index.match(*events[0])  # sort pending range bounds outside the timed loop
+    start = time.perf_counter()
+    indexed = [index.match(event_type, event) for event_type, event in events]
+    indexed_rate = len(events) / (time.perf_counter() - start)
+
+    assert indexed == linear, "index and linear scan disagree"
+    matches = sum(len(m) for m in linear) / len(events)
+    print(f"filters: {args.filters}  events: {args.events}  mean matches/event: {matches:.1f}")
+    print(f"index build:  {build:.2f} s (including filter compilation)")
+    print(f"linear scan:  {linear_rate:,.0f} events/s")
+    print(f"indexed:      {indexed_rate:,.0f} events/s ({indexed_rate / linear_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
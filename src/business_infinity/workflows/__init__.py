@@ -16,6 +16,20 @@ Service Bus triggers, authentication, health endpoints).
 
     workflows/
       _app.py            — AOSApp singleton + shared utilities
+      _capability_index.py — hashed n-gram semantic capability index
+      _canonical.py      — canonical JSON encoding for content hashing
+      _checkpoints.py    — checkpoint storage, chunks, pointers, scheduler, retention
+      _audit.py          — streaming audit hash-chain verification, trusted anchors,
+                           daily Merkle roots and inclusion proofs
+      _audit_logs.py     — local audit-log files: checksum verification, sidecar
+                           indexes, indexed and time-range queries, compaction,
+                           retention sweeps
+      _columnar.py       — compressed columnar segments (compacted audit days)
+      _webhooks.py       — compiled webhook filters, fan-out index, batch evaluation
+      _delivery.py       — asyncio webhook delivery engine, coalescing windows
+      _spool.py          — persistent pending / dead-letter webhook spool
+      _decision_log.py   — journaled write-behind queue for client.log_decision
+      _dedup.py          — scalable Bloom filters over recent keys, per-day sidecars
       orchestrations.py  — primary boardroom + 7 specialised perpetual orchestrations
       enterprise.py      — enterprise SDK capabilities + event handlers
       beyond_sdk.py      — 10 beyond-SDK enhancement workflows
@@ -39,14 +53,19 @@ from ._app import (
     C_SUITE_AGENT_IDS,
     C_SUITE_TYPES,
     WORKFLOW_DEPENDENCIES,
+    DescriptorCache,
     _MIDDLEWARE,
     _ORCHESTRATION_GROUPS,
     _WEBHOOK_FILTERS,
     app,
     c_suite_orchestration,
+    catalog_version,
     decrypt_sensitive_fields,
     default_rate_limiter,
+    descriptor_cache,
+    descriptor_id,
     encrypt_sensitive_fields,
+    local_state_dir,
     logger,
     select_c_suite_agents,
     use_middleware,
@@ -71,7 +90,66 @@ from . import (  # noqa: E402, F401
 # ── Per-domain public symbols ────────────────────────────────────────────────
 # Re-export constants that tests import directly from `business_infinity.workflows`.
 
-from .beyond_sdk import evaluate_webhook_filter
+from ._capability_index import CapabilityIndex, get_capability_index, hash_ngrams
+from ._checkpoints import (
+    CHECKPOINT_CHUNK_DOC_TYPE,
+    CHECKPOINT_DOC_TYPE,
+    CHECKPOINT_POINTER_DOC_TYPE,
+    CheckpointRetentionPolicy,
+    CheckpointScheduler,
+    _CHECKPOINT_STATE,
+    _LATEST_CHECKPOINTS,
+    apply_patch,
+    checkpoint_scheduler,
+    compact_checkpoints,
+    decode_payload,
+    encode_payload,
+    get_latest_checkpoint,
+    json_diff,
+    list_checkpoints,
+    pointer_document_id,
+    resolve_chunks,
+    save_checkpoint,
+    split_chunks,
+)
+from ._webhooks import (
+    FILTER_OPS,
+    WebhookIndex,
+    compile_filter,
+    compile_vector_filter,
+    evaluate_webhook_filter,
+    evaluate_webhook_filters_batch,
+    get_compiled_filter,
+    webhook_index,
+)
+from ._delivery import (
+    DEFAULT_COALESCE,
+    Coalescer,
+    WebhookDeliveryEngine,
+    WebhookEndpoint,
+    delivery_engine,
+    dispatch_event,
+)
+from ._spool import SegmentLog, WebhookSpool, claim_slot, release_slot
+from ._decision_log import DecisionLog, decision_key, decision_log
+from ._dedup import RecentKeys, ScalableBloomFilter
+from ._canonical import canonical_bytes, canonical_json
+from ._audit import (
+    ANCHOR_DOC_TYPE,
+    ChainVerifier,
+    chain_hash,
+    iter_audit_pages,
+    load_anchor,
+    merkle_proof,
+    merkle_root,
+    prove_entry,
+    save_anchor,
+    verify_audit_chain,
+    verify_inclusion,
+    verify_merkle_roots,
+)
+from ._audit_logs import AuditLogStore, audit_log_store, compact_log_file, event_checksum, prune_log_file
+from ._columnar import ColumnarSegment, write_segment
 from .conversations import _CONVERSATION_DOC_TYPE
 from .mentor import _TRAINING_JOB_DOC_TYPE
 from .network import _NEGOTIATION_DOC_TYPE
@@ -86,19 +164,95 @@ __all__ = [
     "C_SUITE_TYPES",
     "select_c_suite_agents",
     "c_suite_orchestration",
+    "catalog_version",
+    # Descriptor serialization cache
+    "DescriptorCache",
+    "descriptor_cache",
+    "descriptor_id",
+    # Semantic capability matching
+    "CapabilityIndex",
+    "get_capability_index",
+    "hash_ngrams",
     # Rate limiting
     "RateLimiter",
     "default_rate_limiter",
     # Encryption
     "encrypt_sensitive_fields",
     "decrypt_sensitive_fields",
+    # Instance-local state
+    "local_state_dir",
     # Workflow dependency chains
     "WORKFLOW_DEPENDENCIES",
     # Bulk orchestration groups
     "_ORCHESTRATION_GROUPS",
+    # Orchestration checkpointing
+    "CHECKPOINT_DOC_TYPE",
+    "CHECKPOINT_POINTER_DOC_TYPE",
+    "_CHECKPOINT_STATE",
+    "_LATEST_CHECKPOINTS",
+    "get_latest_checkpoint",
+    "pointer_document_id",
+    "save_checkpoint",
+    "CheckpointScheduler",
+    "checkpoint_scheduler",
+    "CheckpointRetentionPolicy",
+    "compact_checkpoints",
+    "list_checkpoints",
+    "CHECKPOINT_CHUNK_DOC_TYPE",
+    "split_chunks",
+    "resolve_chunks",
+    "json_diff",
+    "apply_patch",
+    "encode_payload",
+    "decode_payload",
     # Conditional webhooks
     "_WEBHOOK_FILTERS",
     "evaluate_webhook_filter",
+    "FILTER_OPS",
+    "compile_filter",
+    "get_compiled_filter",
+    "WebhookIndex",
+    "webhook_index",
+    "compile_vector_filter",
+    "evaluate_webhook_filters_batch",
+    # Webhook delivery
+    "DEFAULT_COALESCE",
+    "Coalescer",
+    "WebhookDeliveryEngine",
+    "WebhookEndpoint",
+    "delivery_engine",
+    "dispatch_event",
+    "SegmentLog",
+    "WebhookSpool",
+    "claim_slot",
+    "release_slot",
+    "DecisionLog",
+    "decision_log",
+    "decision_key",
+    "RecentKeys",
+    "ScalableBloomFilter",
+    # Audit verification
+    "canonical_json",
+    "canonical_bytes",
+    "ChainVerifier",
+    "chain_hash",
+    "iter_audit_pages",
+    "verify_audit_chain",
+    "ANCHOR_DOC_TYPE",
+    "load_anchor",
+    "save_anchor",
+    "merkle_root",
+    "merkle_proof",
+    "verify_inclusion",
+    "verify_merkle_roots",
+    "prove_entry",
+    "AuditLogStore",
+    "audit_log_store",
+    "event_checksum",
+    "compact_log_file",
+    "prune_log_file",
+    "ColumnarSegment",
+    "write_segment",
     # Middleware
     "_MIDDLEWARE",
     "use_middleware",
@@ -10,8 +10,11 @@ that are shared across multiple workflow domains:
 - :data:`_ORCHESTRATION_GROUPS` — in-memory orchestration group registry
 - :data:`_WEBHOOK_FILTERS` — per-webhook conditional filter rules
 - :data:`_MIDDLEWARE` / :func:`use_middleware` — lightweight middleware list
+- :func:`local_state_dir` — configurable directory for instance-local state
 - :data:`C_SUITE_TYPES` / :data:`C_SUITE_AGENT_IDS` — C-suite agent constants
 - :func:`select_c_suite_agents` — catalog lookup helper
+- :func:`catalog_version` — catalog fingerprint for catalog-derived caches
+- :class:`DescriptorCache` / :data:`descriptor_cache` — cached descriptor serialization
 - :func:`c_suite_orchestration` — reusable orchestration template
 """
 
@@ -19,10 +22,15 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import hashlib  # noqa: F401 — re-exported for beyond_sdk.py audit hashing
+import copy
 import logging
+import marshal
+import os
+import pickle
+import tempfile
 import time
 import uuid  # noqa: F401 — re-exported for submodules
+from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Optional
 
 from aos_client import (
@@ -201,6 +209,24 @@ def use_middleware(middleware_fn: Callable) -> None:
     _MIDDLEWARE.append(middleware_fn)
 
 
+# ── Instance-Local State ─────────────────────────────────────────────────────
+
+
+def local_state_dir(name: str, env_var: str) -> Optional[str]:
+    """Return the directory for the on-disk state *name*, or ``None`` if disabled.
+
+    The environment variable *env_var* overrides the location; setting it to
+    an empty string disables the state.  By default it lives under the
+    system temp directory, which on Azure Functions is local to the instance
+    (the app directory may be read-only and is shared by scaled-out
+    instances).
+    """
+    configured = os.environ.get(env_var)
+    if configured is not None:
+        return configured or None
+    return os.path.join(tempfile.gettempdir(), "business-infinity", name)
+
+
 # ── C-Suite Agent Selection ──────────────────────────────────────────────────
 
 #: Agent types considered part of the C-suite
@@ -230,6 +256,116 @@ async def select_c_suite_agents(client: AOSClient) -> List[AgentDescriptor]:
     return selected
 
 
+def descriptor_id(descriptor: Any) -> Optional[str]:
+    """Return the identity of an agent or peer descriptor, or ``None``."""
+    fields = descriptor if isinstance(descriptor, dict) else getattr(descriptor, "__dict__", {})
+    for attr in ("agent_id", "node_id", "id"):
+        value = fields.get(attr)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def catalog_version(agents: List[Any]) -> str:
+    """Return a stable fingerprint for the current RealmOfAgents catalog.
+
+    The SDK does not expose a catalog version, so one is derived from every
+    field of every descriptor — what ``model_dump`` would serialize, read
+    from ``__dict__`` and encoded with :mod:`marshal` (or :mod:`pickle` when
+    a field holds a nested model), which costs a fraction of the dump itself.
+    Any agent added, removed or re-described, down to its purpose or
+    description, yields a new version, which invalidates catalog-derived
+    caches.  The fingerprint uses the builtin (per-process salted) hash, so
+    it is only meaningful within one process — which is all in-memory caches
+    need.
+    """
+    # Read fields from __dict__ where possible: pydantic models resolve
+    # missing attributes through a slow __getattr__ path.
+    fields = [agent if isinstance(agent, dict) else getattr(agent, "__dict__", {}) for agent in agents]
+    try:
+        # Version 2 writes no back-references, so equal content encodes equally.
+        encoded = marshal.dumps(fields, 2)
+    except ValueError:
+        try:
+            encoded = pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            encoded = repr(fields).encode()
+    return f"{hash(encoded) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+# ── Descriptor Serialization Cache ───────────────────────────────────────────
+
+
+class DescriptorCache:
+    """Cache of ``model_dump(mode="json")`` output keyed by descriptor id and catalog version.
+
+    ``find-agents``, ``mentor-list-agents`` and ``discover-boardrooms`` serialize
+    the same descriptors on every call.  Entries are grouped per catalog
+    version and only the *max_versions* most recent versions are kept, so a
+    catalog change naturally evicts stale serializations.
+
+    Serializations are kept :mod:`marshal`-encoded and every call returns a
+    fresh dict decoded from them, so a caller or middleware mutating a
+    result cannot corrupt the cache for later requests.
+
+    Args:
+        max_versions: Number of catalog versions to keep cached.
+    """
+
+    def __init__(self, max_versions: int = 2) -> None:
+        self.max_versions = max_versions
+        self._versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def dump(self, descriptor: Any, version: str) -> Dict[str, Any]:
+        """Return the JSON-mode dict for *descriptor* within catalog *version*."""
+        key = descriptor_id(descriptor)
+        entries = self._entries(version)
+        if key is not None and key in entries:
+            self.hits += 1
+            cached = entries[key]
+            return marshal.loads(cached) if isinstance(cached, bytes) else copy.deepcopy(cached)
+        self.misses += 1
+        if hasattr(descriptor, "model_dump"):
+            dumped = descriptor.model_dump(mode="json")
+        elif isinstance(descriptor, dict):
+            dumped = dict(descriptor)
+        else:
+            dumped = {"agent_id": key}
+        if key is not None:
+            try:
+                entries[key] = marshal.dumps(dumped)
+            except ValueError:  # a dict descriptor holding non-JSON values
+                entries[key] = copy.deepcopy(dumped)
+        return dumped
+
+    def dump_all(self, descriptors: List[Any], version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Serialize *descriptors*, computing their :func:`catalog_version` if not given."""
+        version = version or catalog_version(descriptors)
+        return [self.dump(d, version) for d in descriptors]
+
+    def _entries(self, version: str) -> Dict[str, Any]:
+        entries = self._versions.get(version)
+        if entries is None:
+            entries = self._versions[version] = {}
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+        else:
+            self._versions.move_to_end(version)
+        return entries
+
+    def clear(self) -> None:
+        """Drop all cached serializations and reset the hit counters."""
+        self._versions.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+#: Shared application-level descriptor serialization cache.
+descriptor_cache = DescriptorCache()
+
+
 # ── Workflow Template (Enhancement #11) ──────────────────────────────────────
 
 
@@ -0,0 +1,684 @@
+"""Audit trail verification helpers.
+
+``verify-audit-integrity`` recomputes the SHA-256 hash chain over the
+decision records returned by ``generate_compliance_report``.  This module
+keeps the chain mechanics out of the workflow function:
+
+- :func:`chain_hash` — one link of the chain, over the writer's entry
+  encoding (:func:`chain_bytes`)
+- :func:`iter_audit_pages` — streams entries over adaptively sized time
+  slices, so only one page is held in memory at a time
+- :class:`ChainVerifier` — running chain state: current hash, counts and a
+  bounded anomaly list
+- :func:`verify_audit_chain` — the complete streaming verification used by
+  the workflow, with an optional progress callback
+- :func:`load_anchor` / :func:`save_anchor` — the trusted anchor (last
+  verified timestamp, entry id and chain hash) persisted as a
+  knowledge-base document, from which later runs resume
+- :func:`merkle_root` / :func:`merkle_proof` / :func:`verify_inclusion` —
+  binary Merkle trees over entry hashes
+- :func:`iter_daily_roots` / :func:`verify_merkle_roots` — per-day
+  root-of-roots over fixed-size chunks hashed in a process pool, sealed as
+  knowledge-base documents
+- :func:`prove_entry` — O(log n) inclusion proof of one entry in its day's root
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from ._app import logger
+from ._canonical import CANONICAL_ENCODING, canonical_bytes
+from ._checkpoints import doc_field, is_not_found, upsert_document
+
+#: Hash preceding the first entry of a chain.
+GENESIS_HASH = "0" * 64
+
+#: Initial length of a time slice requested from the SDK.
+DEFAULT_SLICE = timedelta(days=1)
+
+#: Bounds for adaptive slice sizing.
+MIN_SLICE = timedelta(minutes=1)
+MAX_SLICE = timedelta(days=366)
+
+#: Target number of entries per fetched page; slices grow while pages are
+#: smaller than a quarter of this and shrink when they are larger.
+DEFAULT_PAGE_ENTRIES = 5000
+
+#: Anomalies kept in a verification result (the total is always counted).
+DEFAULT_MAX_ANOMALIES = 100
+
+#: Knowledge-base document type (and id) of the trusted verification anchor.
+ANCHOR_DOC_TYPE = "audit-verification-anchor"
+ANCHOR_DOCUMENT_ID = "audit-verification-anchor"
+
+#: Entry encoding of the hash chain (see :func:`chain_bytes`), recorded on
+#: anchors so that a chain hash is only continued under the same encoding.
+CHAIN_ENCODING = "python-sorted-items"
+
+#: Knowledge-base document type of a sealed daily Merkle root.
+MERKLE_ROOT_DOC_TYPE = "audit-merkle-day-root"
+
+#: Entries per Merkle chunk (a power of two, so a day's root-of-roots equals
+#: the Merkle root over all of the day's entries).
+DEFAULT_MERKLE_CHUNK = 1024
+
+#: Called after every page with the verifier's progress snapshot.
+ProgressCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+def entry_to_dict(entry: Any) -> Dict[str, Any]:
+    """Return an audit entry (SDK model or mapping) as a JSON-compatible dict."""
+    return entry.model_dump(mode="json") if hasattr(entry, "model_dump") else dict(entry)
+
+
+def chain_bytes(entry: Dict[str, Any]) -> bytes:
+    """Serialise *entry* (minus its stored ``hash`` field) for the hash chain.
+
+    Reproduces the AOS writer's ``str(sorted(items))`` rather than
+    :func:`~._canonical.canonical_bytes`, since the stored ``hash`` fields
+    were computed that way.
+    """
+    entry_for_hash = {k: v for k, v in entry.items() if k != "hash"}
+    return str(sorted(entry_for_hash.items())).encode()
+
+
+def entry_bytes(entry: Dict[str, Any]) -> bytes:
+    """Serialise *entry* (minus its stored ``hash`` field) as canonical JSON.
+
+    Used for the Merkle leaves this package seals itself.  Entries come from
+    the SDK as JSON, so their keys are strings and the encoder's key check
+    is skipped.
+    """
+    return canonical_bytes({k: v for k, v in entry.items() if k != "hash"}, str_keys=True)
+
+
+def chain_hash(prev_hash: str, entry: Dict[str, Any]) -> str:
+    """Hash *entry* (minus its stored ``hash`` field) onto *prev_hash*."""
+    return hashlib.sha256(prev_hash.encode() + chain_bytes(entry)).hexdigest()
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def entry_time(entry: Dict[str, Any]) -> Optional[datetime]:
+    """Return an entry's ``timestamp`` (or ``created_at``) as an aware datetime."""
+    value = entry.get("timestamp", entry.get("created_at"))
+    if isinstance(value, datetime):
+        return as_utc(value)
+    if isinstance(value, str):
+        try:
+            return as_utc(datetime.fromisoformat(value))
+        except ValueError:
+            return None
+    return None
+
+
+async def iter_audit_pages(
+    client: Any,
+    start_time: datetime,
+    end_time: datetime,
+    slice_size: timedelta = DEFAULT_SLICE,
+    page_entries: int = DEFAULT_PAGE_ENTRIES,
+) -> AsyncIterator[Tuple[datetime, List[Dict[str, Any]]]]:
+    """Yield ``(slice_end, entries)`` pages between *start_time* and *end_time*.
+
+    The range is fetched as consecutive ``generate_compliance_report`` calls
+    over half-open time slices ``[a, b)`` (the last one closed).  A slice
+    doubles after a page smaller than ``page_entries / 4`` and halves after
+    one larger than ``page_entries``, so sparse history is crossed in a few
+    calls while dense periods stay near the target page size.  Entries whose
+    timestamp falls outside the slice are dropped, so an entry on a slice
+    boundary is returned once.  Only the current page is held in memory.
+    """
+    start, end = as_utc(start_time), as_utc(end_time)
+    step = max(MIN_SLICE, min(slice_size, MAX_SLICE))
+    cursor = start
+    while cursor <= end:
+        upper = min(cursor + step, end)
+        last = upper >= end
+        report = await client.generate_compliance_report(
+            start_time=cursor, end_time=upper, report_type="decisions",
+        )
+        raw = report.entries if hasattr(report, "entries") else (
+            report.get("entries", []) if isinstance(report, dict) else []
+        )
+        size = len(raw)
+        page = []
+        for item in raw:
+            entry = entry_to_dict(item)
+            when = entry_time(entry)
+            if when is None or (cursor <= when and (when <= upper if last else when < upper)):
+                page.append(entry)
+        del raw, report
+        yield upper, page
+        if last:
+            break
+        cursor = upper
+        if size > page_entries:
+            step = max(MIN_SLICE, step / 2)
+        elif size < page_entries / 4:
+            step = min(MAX_SLICE, step * 2)
+
+
+class ChainVerifier:
+    """Running state of a hash-chain verification.
+
+    Holds the current chain hash, the number of entries checked, the id and
+    timestamp of the last entry, and at most *max_anomalies* anomalies —
+    memory does not grow with the number of entries.  When *anchor* is
+    given, passing its entry with a different chain hash is an
+    ``anchor_mismatch`` anomaly (history before the anchor was rewritten);
+    :attr:`anchor_seen` records whether the entry was passed at all.
+    """
+
+    def __init__(
+        self,
+        prev_hash: str = GENESIS_HASH,
+        max_anomalies: int = DEFAULT_MAX_ANOMALIES,
+        anchor: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.prev_hash = prev_hash
+        self.max_anomalies = max_anomalies
+        self.anchor = anchor
+        self.anchor_seen = False
+        self.entries_checked = 0
+        self.anomaly_count = 0
+        self.anomalies: List[Dict[str, Any]] = []
+        self.last_entry_id: Optional[str] = None
+        self.last_timestamp: Optional[datetime] = None
+
+    def flag(self, entry_id: Optional[str], reason: str) -> None:
+        """Record an anomaly at the current position."""
+        self.anomaly_count += 1
+        if len(self.anomalies) < self.max_anomalies:
+            self.anomalies.append({"index": self.entries_checked, "entry_id": entry_id, "reason": reason})
+
+    def feed(self, entry: Dict[str, Any]) -> None:
+        current_hash = chain_hash(self.prev_hash, entry)
+        stored_hash = entry.get("hash")
+        if stored_hash and stored_hash != current_hash:
+            self.flag(entry.get("id"), "hash_mismatch")
+        if self.anchor is not None and entry.get("id") == self.anchor["entry_id"]:
+            self.anchor_seen = True
+            if current_hash != self.anchor["chain_hash"]:
+                self.flag(entry.get("id"), "anchor_mismatch")
+        self.prev_hash = current_hash
+        self.entries_checked += 1
+        self.last_entry_id = entry.get("id", self.last_entry_id)
+        self.last_timestamp = entry_time(entry) or self.last_timestamp
+
+    def to_anchor(self) -> Optional[Dict[str, Any]]:
+        """Return the position reached as an anchor, or ``None`` before any entry."""
+        if self.last_entry_id is None or self.last_timestamp is None:
+            return None
+        return {
+            "timestamp": self.last_timestamp.isoformat(),
+            "entry_id": self.last_entry_id,
+            "chain_hash": self.prev_hash,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "entries_checked": self.entries_checked,
+            "anomaly_count": self.anomaly_count,
+            "integrity_hash": self.prev_hash,
+        }
+
+
+async def verify_audit_chain(
+    client: Any,
+    start_time: datetime,
+    end_time: datetime,
+    verifier: Optional[ChainVerifier] = None,
+    slice_size: timedelta = DEFAULT_SLICE,
+    page_entries: int = DEFAULT_PAGE_ENTRIES,
+    progress: Optional[ProgressCallback] = None,
+    resume_after: Optional[Dict[str, Any]] = None,
+) -> Tuple[ChainVerifier, int]:
+    """Stream the audit trail through *verifier*; returns it and the page count.
+
+    *progress* (sync or async) receives ``{"entries_checked", "anomaly_count",
+    "integrity_hash", "slice_end", "pages"}`` after every page.
+
+    With *resume_after* (an anchor) the stream should start at the anchor's
+    timestamp and *verifier* at its chain hash: entries up to and including
+    the anchored entry are skipped, and an ``anchor_missing`` anomaly is
+    recorded if that entry is no longer there.  The same anomaly is recorded
+    when *verifier* checks against an anchor whose timestamp lies in the
+    range but whose entry never came by (it was deleted and the later
+    hashes recomputed).
+    """
+    verifier = verifier or ChainVerifier()
+    skipping = resume_after is not None
+    anchor_time = entry_time(resume_after) if resume_after is not None else None
+    pages = 0
+    async for slice_end, page in iter_audit_pages(client, start_time, end_time, slice_size, page_entries):
+        for entry in page:
+            if skipping:
+                when = entry_time(entry)
+                if when is None or anchor_time is None or when <= anchor_time:
+                    skipping = entry.get("id") != resume_after["entry_id"]
+                    continue
+                verifier.flag(resume_after["entry_id"], "anchor_missing")
+                skipping = False
+            verifier.feed(entry)
+        pages += 1
+        if progress is not None:
+            outcome = progress({**verifier.snapshot(), "slice_end": slice_end.isoformat(), "pages": pages})
+            if asyncio.iscoroutine(outcome):
+                await outcome
+    if skipping:
+        verifier.flag(resume_after["entry_id"], "anchor_missing")
+    anchor = verifier.anchor
+    if anchor is not None and not verifier.anchor_seen:
+        anchored_at = entry_time(anchor)
+        if anchored_at is not None and as_utc(start_time) <= anchored_at <= as_utc(end_time):
+            verifier.flag(anchor["entry_id"], "anchor_missing")
+    return verifier, pages
+
+
+# ── Trusted anchor ───────────────────────────────────────────────────────────
+
+
+async def load_anchor(client: Any) -> Optional[Dict[str, Any]]:
+    """Return the persisted verification anchor, or ``None`` if there is none.
+
+    An anchor saved under a different chain encoding is ignored, since its
+    chain hash cannot be continued; anchors without one predate the field
+    and used :data:`CHAIN_ENCODING`.  Read errors other than not-found
+    propagate: running unanchored would replace the trusted anchor.
+    """
+    try:
+        doc = await client.get_document(ANCHOR_DOCUMENT_ID)
+    except Exception as exc:
+        if not is_not_found(exc):
+            raise
+        return None  # no anchor document yet
+    if not doc or doc_field(doc, "chain_hash") is None:
+        return None
+    if doc_field(doc, "encoding") not in (None, CHAIN_ENCODING):
+        return None
+    return {
+        name: doc_field(doc, name)
+        for name in ("timestamp", "entry_id", "chain_hash", "verified_at", "full_verified_at")
+    }
+
+
+async def save_anchor(client: Any, anchor: Dict[str, Any]) -> None:
+    """Persist *anchor*, creating the anchor document on first use."""
+    anchor = {**anchor, "encoding": CHAIN_ENCODING}
+    await upsert_document(
+        client,
+        ANCHOR_DOCUMENT_ID,
+        anchor,
+        doc_type=ANCHOR_DOC_TYPE,
+        title="Audit trail verification anchor",
+    )
+
+
+# ── Merkle mode ──────────────────────────────────────────────────────────────
+#
+# Leaves are ``sha256(0x00 || entry)`` and inner nodes ``sha256(0x01 || left
+# || right)`` (RFC 6962 domain separation); an odd node at the end of a level
+# is promoted unchanged.  A day's entries are split into chunks whose roots
+# are computed in worker processes, and the day root is the Merkle root over
+# the chunk roots.
+
+
+def leaf_hash(payload: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + payload).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def merkle_root(hashes: List[bytes]) -> bytes:
+    """Return the Merkle root over *hashes* (``sha256(b"")`` when empty)."""
+    if not hashes:
+        return hashlib.sha256(b"").digest()
+    level = list(hashes)
+    while len(level) > 1:
+        paired = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def merkle_proof(hashes: List[bytes], index: int) -> List[Dict[str, str]]:
+    """Return the sibling path of ``hashes[index]`` as ``[{"hash", "side"}]``.
+
+    ``side`` is the side the sibling sits on; promoted levels contribute no
+    step, so the proof has at most ``ceil(log2(len(hashes)))`` steps.
+    """
+    proof = []
+    level = list(hashes)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"hash": level[sibling].hex(), "side": "left" if sibling < index else "right"})
+        paired = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+        index //= 2
+    return proof
+
+
+def verify_inclusion(leaf: str, proof: List[Dict[str, str]], root: str) -> bool:
+    """Check that hex *leaf* hashes up to hex *root* along *proof*."""
+    current = bytes.fromhex(leaf)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        current = _node_hash(sibling, current) if step["side"] == "left" else _node_hash(current, sibling)
+    return current.hex() == root
+
+
+def chunk_root(payloads: List[bytes]) -> bytes:
+    """Merkle root over the leaves of serialised entries (runs in worker processes)."""
+    return merkle_root([leaf_hash(payload) for payload in payloads])
+
+
+#: The one process pool shared by every caller of :func:`get_process_pool`.
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool(processes: Any = None) -> Optional[Executor]:
+    """Return the shared process pool, or ``None`` to work inline.
+
+    *processes* usually comes from a request body: it is cast to ``int`` and
+    clamped to ``os.cpu_count()``, and ``0`` (or less) means no pool.  Every
+    other value, ``None`` included, gets the same pool of one worker per CPU,
+    created on first use and kept for the life of the process, so requests
+    can never start more worker processes than the host has CPUs.
+
+    Raises:
+        ValueError: If *processes* is not an integer.
+    """
+    global _PROCESS_POOL
+    cpus = os.cpu_count() or 1
+    if processes is not None:
+        try:
+            workers = min(int(processes), cpus)
+        except (TypeError, ValueError):
+            raise ValueError(f"processes must be an integer, got {processes!r}") from None
+        if workers <= 0:
+            return None
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=cpus)
+    return _PROCESS_POOL
+
+
+def _day_of(entry: Dict[str, Any]) -> str:
+    when = entry_time(entry)
+    return when.astimezone(timezone.utc).date().isoformat() if when is not None else "undated"
+
+
+async def iter_daily_roots(
+    client: Any,
+    start_time: datetime,
+    end_time: datetime,
+    chunk_size: int = DEFAULT_MERKLE_CHUNK,
+    executor: Optional[Executor] = None,
+    slice_size: timedelta = DEFAULT_SLICE,
+    page_entries: int = DEFAULT_PAGE_ENTRIES,
+) -> AsyncIterator[Tuple[str, str, int]]:
+    """Yield ``(day, root_hex, entry_count)`` for every UTC day with entries.
+
+    Entries are streamed with :func:`iter_audit_pages`; each full chunk is
+    handed to *executor* (inline when ``None``) as soon as it fills, with at
+    most two chunks per worker outstanding, so memory stays bounded however
+    many entries a day holds.
+    """
+    if chunk_size < 1 or chunk_size & (chunk_size - 1):
+        raise ValueError("Merkle chunk_size must be a power of two")
+    loop = asyncio.get_running_loop()
+    max_pending = 2 * getattr(executor, "_max_workers", 1)
+    day: Optional[str] = None
+    chunk: List[bytes] = []
+    pending: Deque[Any] = deque()
+    roots: List[bytes] = []
+    count = 0
+
+    async def submit(payloads: List[bytes]) -> None:
+        if executor is None:
+            roots.append(chunk_root(payloads))
+            return
+        pending.append(loop.run_in_executor(executor, chunk_root, payloads))
+        if len(pending) >= max_pending:
+            roots.append(await pending.popleft())
+
+    async def close_day() -> Tuple[str, str, int]:
+        if chunk:
+            await submit(chunk)
+        while pending:
+            roots.append(await pending.popleft())
+        return day, merkle_root(roots).hex(), count
+
+    async for _, page in iter_audit_pages(client, start_time, end_time, slice_size, page_entries):
+        for entry in page:
+            entry_day = _day_of(entry)
+            if entry_day != day:
+                if day is not None:
+                    yield await close_day()
+                day, chunk, roots, count = entry_day, [], [], 0
+            chunk.append(entry_bytes(entry))
+            count += 1
+            if len(chunk) == chunk_size:
+                await submit(chunk)
+                chunk = []
+    if day is not None:
+        yield await close_day()
+
+
+def day_root_document_id(day: str) -> str:
+    return f"audit-merkle-root-{day}"
+
+
+async def load_day_root(client: Any, day: str) -> Optional[str]:
+    """Return the sealed Merkle root of *day*, or ``None``.
+
+    Roots sealed under a different entry encoding count as unsealed.  Read
+    errors other than not-found propagate, so a sealed root is never taken
+    for a missing one (and re-sealed over).
+    """
+    try:
+        doc = await client.get_document(day_root_document_id(day))
+    except Exception as exc:
+        if not is_not_found(exc):
+            raise
+        return None  # day not sealed yet
+    if not doc or doc_field(doc, "encoding") != CANONICAL_ENCODING:
+        return None
+    return doc_field(doc, "root")
+
+
+async def seal_day_root(client: Any, day: str, root: str, entry_count: int) -> None:
+    """Persist the root of *day*, replacing one sealed under an older encoding."""
+    fields = {
+        "day": day,
+        "root": root,
+        "entry_count": entry_count,
+        "encoding": CANONICAL_ENCODING,
+        "sealed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    await upsert_document(
+        client,
+        day_root_document_id(day),
+        fields,
+        doc_type=MERKLE_ROOT_DOC_TYPE,
+        title=f"Audit Merkle root for {day}",
+    )
+
+
+def _covers_day(start: datetime, end: datetime, day: str) -> bool:
+    """Whether the closed range ``[start, end]`` holds all of UTC *day*."""
+    day_start = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+    return start <= day_start and day_start + timedelta(days=1) - timedelta(microseconds=1) <= end
+
+
+async def verify_merkle_roots(
+    client: Any,
+    start_time: datetime,
+    end_time: datetime,
+    chunk_size: int = DEFAULT_MERKLE_CHUNK,
+    processes: Optional[int] = None,
+    max_anomalies: int = DEFAULT_MAX_ANOMALIES,
+    progress: Optional[ProgressCallback] = None,
+    slice_size: timedelta = DEFAULT_SLICE,
+    page_entries: int = DEFAULT_PAGE_ENTRIES,
+) -> Dict[str, Any]:
+    """Recompute daily Merkle roots and compare them with the sealed ones.
+
+    Days with a sealed root must match it (``merkle_root_mismatch``
+    otherwise); complete days (before today, UTC) without one are sealed.
+    Only days the range covers entirely are compared or sealed: the root of
+    a partly covered day is over a subset of its entries, so those days are
+    counted as ``days_partial`` and skipped.  A day whose sealed root cannot
+    be read is neither compared nor sealed; it is counted in
+    ``days_unverified`` and the run does not verify.  *progress* receives
+    ``{"day", "entries_checked", "anomaly_count"}`` after each day.
+    """
+    today = datetime.now(timezone.utc).date().isoformat()
+    start, end = as_utc(start_time), as_utc(end_time)
+    executor = get_process_pool(processes)
+    anomalies: List[Dict[str, Any]] = []
+    anomaly_count = entries = days = sealed = partial = unverified = 0
+    async for day, root, count in iter_daily_roots(
+        client, start_time, end_time, chunk_size, executor, slice_size, page_entries,
+    ):
+        days += 1
+        entries += count
+        covered = day == "undated" or _covers_day(start, end, day)
+        try:
+            stored = await load_day_root(client, day) if covered else None
+        except Exception as exc:  # noqa: BLE001 — counted; later days still stream
+            logger.warning("Merkle root for %s unreadable; day not verified: %s", day, exc)
+            unverified += 1
+        else:
+            if not covered:
+                partial += 1
+            elif stored is None:
+                if day < today and day != "undated":
+                    try:
+                        await seal_day_root(client, day, root, count)
+                        sealed += 1
+                    except Exception as exc:  # noqa: BLE001 — sealed by a later run
+                        logger.warning("Merkle root for %s not sealed: %s", day, exc)
+            elif stored != root:
+                anomaly_count += 1
+                if len(anomalies) < max_anomalies:
+                    anomalies.append({"day": day, "entry_id": None, "reason": "merkle_root_mismatch"})
+        if progress is not None:
+            outcome = progress({"day": day, "entries_checked": entries, "anomaly_count": anomaly_count})
+            if asyncio.iscoroutine(outcome):
+                await outcome
+    return {
+        "verified": anomaly_count == 0 and unverified == 0,
+        "mode": "merkle",
+        "entries_checked": entries,
+        "days_checked": days,
+        "days_sealed": sealed,
+        "days_partial": partial,
+        "days_unverified": unverified,
+        "anomalies": anomalies,
+        "anomaly_count": anomaly_count,
+    }
+
+
+async def prove_entry(
+    client: Any,
+    entry_id: str,
+    timestamp: datetime,
+    chunk_size: int = DEFAULT_MERKLE_CHUNK,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """Build the inclusion proof of *entry_id* in the Merkle root of its day.
+
+    Streams the day's entries, keeping the leaves of the entry's own chunk
+    and only the roots of the others, with at most two chunks per worker
+    outstanding as in :func:`iter_daily_roots`.  The proof is the path inside that
+    chunk followed by the path of the chunk among the day's chunk roots.
+    ``verified`` is ``None`` while the day has no sealed root, since there
+    is then nothing independent to check the proof against.
+    Raises ``ValueError`` when the entry is not found on that day.
+    """
+    if chunk_size < 1 or chunk_size & (chunk_size - 1):
+        raise ValueError("Merkle chunk_size must be a power of two")
+    moment = as_utc(timestamp).astimezone(timezone.utc)
+    day_start = datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+    day = day_start.date().isoformat()
+    loop = asyncio.get_running_loop()
+    max_pending = 2 * getattr(executor, "_max_workers", 1)
+
+    roots: List[bytes] = []
+    pending: Deque[Any] = deque()
+    chunk: List[bytes] = []
+    target: Optional[Tuple[int, int, List[bytes]]] = None  # (chunk index, position, leaves)
+    found_at: Optional[int] = None
+    position = 0
+
+    async def close_chunk(payloads: List[bytes]) -> Optional[Tuple[int, int, List[bytes]]]:
+        """Root one chunk; returns the target tuple if it holds the entry."""
+        first = position - len(payloads)
+        if found_at is not None and target is None and found_at >= first:
+            while pending:
+                roots.append(await pending.popleft())
+            leaves = [leaf_hash(payload) for payload in payloads]
+            roots.append(merkle_root(leaves))
+            return len(roots) - 1, found_at - first, leaves
+        if executor is None:
+            roots.append(chunk_root(payloads))
+        else:
+            pending.append(loop.run_in_executor(executor, chunk_root, payloads))
+            if len(pending) >= max_pending:
+                roots.append(await pending.popleft())
+        return None
+
+    async for _, page in iter_audit_pages(
+        client, day_start, day_start + timedelta(days=1) - timedelta(microseconds=1),
+    ):
+        for entry in page:
+            if _day_of(entry) != day:
+                continue
+            if entry.get("id") == entry_id and found_at is None:
+                found_at = position
+            chunk.append(entry_bytes(entry))
+            position += 1
+            if len(chunk) == chunk_size:
+                target = await close_chunk(chunk) or target
+                chunk = []
+    if chunk:
+        target = await close_chunk(chunk) or target
+    while pending:
+        roots.append(await pending.popleft())
+    if target is None:
+        raise ValueError(f"Audit entry '{entry_id}' not found on {day}")
+
+    chunk_index, index_in_chunk, leaves = target
+    proof = merkle_proof(leaves, index_in_chunk) + merkle_proof(roots, chunk_index)
+    root = merkle_root(roots).hex()
+    sealed = await load_day_root(client, day)
+    return {
+        "entry_id": entry_id,
+        "day": day,
+        "entry_index": found_at,
+        "entry_count": position,
+        "leaf_hash": leaves[index_in_chunk].hex(),
+        "proof": proof,
+        "day_root": root,
+        "sealed_root": sealed,
+        "verified": None if sealed is None else (
+            sealed == root and verify_inclusion(leaves[index_in_chunk].hex(), proof, sealed)
+        ),
+    }
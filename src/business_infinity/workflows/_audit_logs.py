@@ -0,0 +1,1097 @@
+"""Local audit-log files: checksum verification, sidecar indexes and queries.
+
+The audit trail manager writes one JSON event per line to
+``audit_logs/audit_log_YYYY-MM-DD.jsonl``; every event carries a SHA-256
+``checksum`` over its other fields.  This module reads those files without
+loading them whole:
+
+- :func:`event_checksum` — recomputes an event's checksum exactly as the
+  writer computed it
+- :func:`verify_log_file` — checks every line of one file through
+  :mod:`mmap`, writing the file's sidecar indexes from the same pass
+- :func:`build_log_index` / :func:`load_log_index` — the sidecar index
+  ``<file>.idx.json``: byte offsets of the lines for each ``event_type``,
+  ``subject_id`` and ``severity`` value, plus the file's first and last
+  timestamps; an index is extended incrementally as the file grows
+- :func:`build_time_index` / :func:`range_offsets` — the sparse timestamp
+  index ``<file>.ts.json`` (the byte offset and timestamp of every Nth
+  line), binary-searched to turn a time window into a byte range
+- :func:`compact_log_file` / :func:`verify_segment_file` — a closed day's
+  file rewritten as a compressed columnar segment
+  ``audit_log_YYYY-MM-DD.col`` (see :mod:`._columnar`), and its checksums
+  verified from the segment
+- :func:`prune_log_file` — a day's events past their ``retention_until``
+  streamed out of its file or segment, with the day's Merkle root kept in
+  a retention manifest ``audit_log_YYYY-MM-DD.retention.json`` so the
+  remaining events still verify
+- :class:`AuditLogStore` / :data:`audit_log_store` — the directory of daily
+  files and segments: parallel verification, compaction and retention
+  sweeps driven by a min-heap of expiry times (one file per worker
+  process) and queries that seek straight to the matching lines, or
+  decode only the filtered columns of a segment
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain, islice, zip_longest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ._audit import DEFAULT_MAX_ANOMALIES, DEFAULT_MERKLE_CHUNK, as_utc, get_process_pool, leaf_hash, merkle_root
+from ._canonical import CANONICAL_ENCODING, canonical_bytes
+from ._columnar import CODECS, DEFAULT_ROW_GROUP_ROWS, ColumnarSegment, to_micros, write_segment
+
+#: Directory holding the daily audit-log files.
+DEFAULT_AUDIT_LOG_DIR = "audit_logs"
+
+#: Daily audit-log file names; the group is the day.
+AUDIT_LOG_FILE = re.compile(r"^audit_log_(\d{4}-\d{2}-\d{2})\.jsonl$")
+
+#: Compacted daily segment names; the group is the day.
+AUDIT_SEGMENT_FILE = re.compile(r"^audit_log_(\d{4}-\d{2}-\d{2})\.col$")
+
+#: Days a file stays open after its own day before it may be compacted.
+DEFAULT_COMPACT_GRACE_DAYS = 1
+
+#: Suffix of the sidecar index written beside each file.
+INDEX_SUFFIX = ".idx.json"
+
+#: Bumped whenever the sidecar layout changes (older sidecars are rebuilt);
+#: version 2 added ``first_expiry``.
+INDEX_VERSION = 2
+
+#: Event fields with a posting list (value → byte offsets) in the sidecar.
+INDEXED_FIELDS = ("event_type", "subject_id", "severity")
+
+#: Suffix of the sparse timestamp index written beside each file.
+TIME_INDEX_SUFFIX = ".ts.json"
+
+#: Timestamped lines per block of the sparse timestamp index; a range read
+#: parses at most this many lines before its window.
+DEFAULT_BLOCK_LINES = 1024
+
+#: Suffix of the per-day retention manifest (``audit_log_YYYY-MM-DD`` + suffix).
+RETENTION_SUFFIX = ".retention.json"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# The writer hashed ``json.dumps(asdict(event), sort_keys=True, default=str)``
+# of the live dataclass, where these fields were enums and datetimes.
+_ENUM_FIELDS = {"event_type": "AuditEventType", "severity": "AuditSeverity"}
+_DATETIME_FIELDS = ("timestamp", "retention_until")
+
+
+def event_checksum(event: Dict[str, Any]) -> str:
+    """Recompute the SHA-256 ``checksum`` of a logged audit event.
+
+    Reproduces the writer's serialisation rather than
+    :func:`~._canonical.canonical_bytes`, since the stored checksums were
+    computed that way: enum fields as ``AuditEventType.NAME`` and datetimes
+    in ``str()`` form (space-separated).
+    """
+    data = {k: v for k, v in event.items() if k not in ("checksum", "signature")}
+    for name, enum in _ENUM_FIELDS.items():
+        if isinstance(data.get(name), str):
+            data[name] = f"{enum}.{data[name].upper()}"
+    for name in _DATETIME_FIELDS:
+        if isinstance(data.get(name), str):
+            data[name] = data[name].replace("T", " ", 1)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def event_time(event: Dict[str, Any]) -> Optional[datetime]:
+    """Return an event's ``timestamp`` as an aware datetime (naive taken as UTC)."""
+    value = event.get("timestamp")
+    if not isinstance(value, str):
+        return None
+    try:
+        return as_utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _micros(value: datetime) -> int:
+    return (as_utc(value) - _EPOCH) // _MICROSECOND
+
+
+# ── Reading lines ────────────────────────────────────────────────────────────
+
+
+def _open_view(path: str) -> Optional[mmap.mmap]:
+    """Map *path* read-only (``None`` for an empty file)."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_lines(view: mmap.mmap, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` for the newline-terminated lines in ``[start, end)``.
+
+    A trailing line without its newline (a write in progress) is not yielded.
+    """
+    end = len(view) if end is None else end
+    offset = start
+    while offset < end:
+        newline = view.find(b"\n", offset, end)
+        if newline < 0:
+            return
+        yield offset, view[offset:newline]
+        offset = newline + 1
+
+
+def read_line(view: mmap.mmap, offset: int) -> bytes:
+    """Return the line starting at byte *offset*."""
+    newline = view.find(b"\n", offset)
+    return view[offset:newline if newline >= 0 else len(view)]
+
+
+# ── Sidecar index ────────────────────────────────────────────────────────────
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _new_index(path: str) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(path),
+        "indexed_bytes": 0,
+        "lines": 0,
+        "last_line_offset": None,
+        "last_line_crc": None,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "first_expiry": None,
+        "fields": {name: {} for name in INDEXED_FIELDS},
+    }
+
+
+def _index_event(index: Dict[str, Any], offset: int, line: bytes, event: Dict[str, Any]) -> None:
+    for name in INDEXED_FIELDS:
+        value = event.get(name)
+        if isinstance(value, str):
+            index["fields"][name].setdefault(value, []).append(offset)
+    when = event.get("timestamp")
+    if isinstance(when, str):
+        if index["first_timestamp"] is None or when < index["first_timestamp"]:
+            index["first_timestamp"] = when
+        if index["last_timestamp"] is None or when > index["last_timestamp"]:
+            index["last_timestamp"] = when
+    expiry = to_micros(event.get("retention_until"))
+    if expiry is not None and (index["first_expiry"] is None or expiry < index["first_expiry"]):
+        index["first_expiry"] = expiry
+    index["lines"] += 1
+    _advance(index, offset, line)
+
+
+def _advance(index: Dict[str, Any], offset: int, line: bytes) -> None:
+    """Record *line* as the last one covered by *index*."""
+    index["last_line_offset"] = offset
+    index["last_line_crc"] = zlib.crc32(line)
+    index["indexed_bytes"] = offset + len(line) + 1
+
+
+def _write_json(target: str, index: Dict[str, Any]) -> None:
+    with open(target + ".tmp", "w", encoding="utf-8") as handle:
+        json.dump(index, handle, separators=(",", ":"))
+    os.replace(target + ".tmp", target)
+
+
+def _read_json(target: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(target, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _index_is_current_prefix(view: Optional[mmap.mmap], index: Dict[str, Any]) -> bool:
+    """``True`` if *index* (either sidecar) still describes a prefix of the mapped file."""
+    if index.get("version") != INDEX_VERSION:
+        return False
+    size = len(view) if view is not None else 0
+    if index["indexed_bytes"] > size:
+        return False
+    if index["last_line_offset"] is None:
+        return True
+    return zlib.crc32(read_line(view, index["last_line_offset"])) == index["last_line_crc"]
+
+
+def load_log_index(path: str) -> Optional[Dict[str, Any]]:
+    """Return the sidecar index of *path* as written, or ``None`` if absent or unreadable."""
+    return _read_json(index_path(path))
+
+
+def build_log_index(path: str) -> Dict[str, Any]:
+    """Bring the sidecar index of *path* up to date and return it.
+
+    Lines appended since the index was written are parsed and added; an
+    index that no longer matches the file (rewritten, truncated or from an
+    older layout) is rebuilt from the start.  Unparseable lines are skipped
+    (:func:`verify_log_file` reports them).
+    """
+    view = _open_view(path)
+    try:
+        index = load_log_index(path)
+        if index is None or not _index_is_current_prefix(view, index):
+            index = _new_index(path)
+        size = len(view) if view is not None else 0
+        if index["indexed_bytes"] == size and os.path.exists(index_path(path)):
+            return index
+        if view is not None:
+            for offset, line in iter_lines(view, index["indexed_bytes"]):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict):
+                    _index_event(index, offset, line, event)
+        _write_json(index_path(path), index)
+        return index
+    finally:
+        if view is not None:
+            view.close()
+
+
+# ── Sparse timestamp index ───────────────────────────────────────────────────
+#
+# Block k starts at the (k * block_lines)-th timestamped line.  Per block the
+# index keeps its byte offset, its first timestamp and the running maximum
+# timestamp up to and including the block (epoch microseconds).  While the
+# file's timestamps never decrease (``sorted``), a window maps to the blocks
+# between two binary searches over first timestamps; otherwise the running
+# maximum still bounds the start, and the read continues to end of file.
+
+
+def time_index_path(path: str) -> str:
+    return path + TIME_INDEX_SUFFIX
+
+
+def _new_time_index(path: str, block_lines: int) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(path),
+        "block_lines": block_lines,
+        "indexed_bytes": 0,
+        "last_line_offset": None,
+        "last_line_crc": None,
+        "timed_lines": 0,
+        "sorted": True,
+        "last_time": None,
+        "offsets": [],
+        "first_times": [],
+        "max_times": [],
+    }
+
+
+def _time_index_event(index: Dict[str, Any], offset: int, line: bytes, event: Dict[str, Any]) -> None:
+    when = event_time(event)
+    if when is not None:
+        micros = _micros(when)
+        if index["timed_lines"] % index["block_lines"] == 0:
+            index["offsets"].append(offset)
+            index["first_times"].append(micros)
+            index["max_times"].append(max(micros, index["max_times"][-1]) if index["max_times"] else micros)
+        elif micros > index["max_times"][-1]:
+            index["max_times"][-1] = micros
+        if index["last_time"] is not None and micros < index["last_time"]:
+            index["sorted"] = False
+        index["last_time"] = micros
+        index["timed_lines"] += 1
+    _advance(index, offset, line)
+
+
+def load_time_index(path: str) -> Optional[Dict[str, Any]]:
+    """Return the sparse timestamp index of *path* as written, or ``None``."""
+    return _read_json(time_index_path(path))
+
+
+def build_time_index(path: str, block_lines: int = DEFAULT_BLOCK_LINES) -> Dict[str, Any]:
+    """Bring the sparse timestamp index of *path* up to date and return it.
+
+    Extended with the lines appended since it was written; rebuilt if the
+    file no longer matches it or *block_lines* changed.
+    """
+    view = _open_view(path)
+    try:
+        index = load_time_index(path)
+        if (
+            index is None
+            or index.get("block_lines") != block_lines
+            or not _index_is_current_prefix(view, index)
+        ):
+            index = _new_time_index(path, block_lines)
+        size = len(view) if view is not None else 0
+        if index["indexed_bytes"] == size and os.path.exists(time_index_path(path)):
+            return index
+        if view is not None:
+            for offset, line in iter_lines(view, index["indexed_bytes"]):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict):
+                    _time_index_event(index, offset, line, event)
+        _write_json(time_index_path(path), index)
+        return index
+    finally:
+        if view is not None:
+            view.close()
+
+
+def range_offsets(
+    index: Dict[str, Any],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+) -> Optional[Tuple[int, Optional[int]]]:
+    """Return the byte range ``[lo, hi)`` holding every line in the window.
+
+    ``hi`` is ``None`` for end of file; ``None`` is returned when no
+    timestamped line can fall in the window.  O(log blocks).
+    """
+    offsets, first_times, max_times = index["offsets"], index["first_times"], index["max_times"]
+    if not offsets:
+        return None
+    start = _micros(start_time) if start_time is not None else None
+    end = _micros(end_time) if end_time is not None else None
+    if index["sorted"]:
+        if end is not None and first_times[0] > end:
+            return None
+        if start is not None and index["last_time"] < start:
+            return None
+        # The block before the first one starting at *start* may end with it too
+        first = max(bisect_left(first_times, start) - 1, 0) if start is not None else 0
+        after = bisect_right(first_times, end) if end is not None else len(offsets)
+        return offsets[first], offsets[after] if after < len(offsets) else None
+    first = bisect_left(max_times, start) if start is not None else 0
+    if first == len(offsets):
+        return None
+    return offsets[first], None
+
+
+# ── Verification ─────────────────────────────────────────────────────────────
+
+
+def verify_log_file(
+    path: str,
+    max_anomalies: int = DEFAULT_MAX_ANOMALIES,
+    block_lines: int = DEFAULT_BLOCK_LINES,
+) -> Dict[str, Any]:
+    """Verify the checksum of every event in *path* and rewrite both its indexes.
+
+    Runs in a worker process (see :meth:`AuditLogStore.verify`).  Anomaly
+    reasons are ``checksum_mismatch``, ``missing_checksum`` and
+    ``unparseable``, each naming the line number and byte offset, and for a
+    pruned day ``retention_root_mismatch`` (see :func:`prune_log_file`).
+    """
+    name = os.path.basename(path)
+    anomalies: List[Dict[str, Any]] = []
+    anomaly_count = events = 0
+    index = _new_index(path)
+    time_index = _new_time_index(path, block_lines)
+    manifest = load_retention_manifest(path)
+    retention = _RetainedTree(manifest) if manifest is not None else None
+
+    def flag(line_no: int, offset: int, event_id: Optional[str], reason: str) -> None:
+        nonlocal anomaly_count
+        anomaly_count += 1
+        if len(anomalies) < max_anomalies:
+            anomalies.append({"file": name, "line": line_no, "offset": offset, "event_id": event_id, "reason": reason})
+
+    view = _open_view(path)
+    try:
+        for line_no, (offset, line) in enumerate(iter_lines(view) if view is not None else (), start=1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                flag(line_no, offset, None, "unparseable")
+                continue
+            events += 1
+            _index_event(index, offset, line, event)
+            _time_index_event(time_index, offset, line, event)
+            if retention is not None:
+                retention.feed(event)
+            stored = event.get("checksum")
+            if not stored:
+                flag(line_no, offset, event.get("event_id"), "missing_checksum")
+            elif stored != event_checksum(event):
+                flag(line_no, offset, event.get("event_id"), "checksum_mismatch")
+    finally:
+        if view is not None:
+            view.close()
+    reason = retention.anomaly() if retention is not None else None
+    if reason is not None:
+        anomaly_count += 1
+        if len(anomalies) < max_anomalies:
+            anomalies.append(_retention_anomaly(name, reason))
+    _write_json(index_path(path), index)
+    _write_json(time_index_path(path), time_index)
+    return {
+        "file": name,
+        "verified": anomaly_count == 0,
+        "events_checked": events,
+        "anomalies": anomalies,
+        "anomaly_count": anomaly_count,
+    }
+
+
+# ── Columnar compaction ──────────────────────────────────────────────────────
+
+
+def segment_path(path: str) -> str:
+    """Return the columnar segment path for the daily file *path*."""
+    return path[:-len(".jsonl")] + ".col" if path.endswith(".jsonl") else path + ".col"
+
+
+def _file_lines(path: str) -> Iterator[Tuple[int, Any, bytes]]:
+    """Yield ``(line_no, event, line)`` for the non-blank lines of *path* (``event`` is ``None`` if unparseable)."""
+    view = _open_view(path)
+    if view is None:
+        return
+    try:
+        for line_no, (_, line) in enumerate(iter_lines(view), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line), line
+            except ValueError:
+                yield line_no, None, line
+    finally:
+        view.close()
+
+
+def _file_events(path: str) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line_no, event)`` for the non-blank lines of *path* (``None`` if unparseable)."""
+    return ((line_no, event) for line_no, event, _ in _file_lines(path))
+
+
+class _UnparseableLine(Exception):
+    """Stops :func:`compact_log_file` at a line that is not a JSON object."""
+
+
+def compact_log_file(
+    path: str,
+    codec: str = "zlib",
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    keep_source: bool = False,
+) -> Dict[str, Any]:
+    """Rewrite the closed daily file *path* as a columnar segment beside it.
+
+    The segment is read back and compared with the file event by event
+    before it replaces any previous segment and the file and its sidecar
+    indexes are removed (kept with *keep_source*).  When the day was
+    compacted before (a late write recreated its file), the file's events
+    are appended to the existing segment's rows; a file the segment already
+    ends with (kept by *keep_source*) is skipped as ``already_compacted``.
+    A file with an unparseable line is left alone — :func:`verify_log_file`
+    reports it.  Runs in a worker process (see :meth:`AuditLogStore.compact`).
+    """
+    name = os.path.basename(path)
+    target = segment_path(path)
+    staging = target + ".new"
+    source_bytes = os.path.getsize(path)
+    previous = ColumnarSegment(target) if os.path.exists(target) else None
+    merged = previous.rows if previous is not None else 0
+    if previous is not None:
+        lines = sum(1 for _ in _file_events(path))
+        if lines <= merged and all(
+            expected == actual for expected, actual in zip_longest(
+                (event for _, event in _file_events(path)), islice(previous.scan(), merged - lines, None),
+            )
+        ):
+            return {"file": name, "compacted": False, "reason": "already_compacted"}
+
+    def events() -> Iterator[Dict[str, Any]]:
+        if previous is not None:
+            yield from previous.scan()
+        for line_no, event in _file_events(path):
+            if not isinstance(event, dict):
+                raise _UnparseableLine(line_no)
+            yield event
+
+    try:
+        written = write_segment(
+            events(),
+            staging,
+            codec=codec,
+            row_group_rows=row_group_rows,
+            timestamp_columns=_DATETIME_FIELDS,
+            source=name,
+        )
+    except _UnparseableLine as error:
+        return {"file": name, "compacted": False, "reason": f"unparseable line {error.args[0]}"}
+    originals = chain(
+        previous.scan() if previous is not None else (),
+        (event for _, event in _file_events(path)),
+    )
+    for expected, actual in zip_longest(originals, ColumnarSegment(staging).scan()):
+        if expected != actual:
+            os.remove(staging)
+            return {"file": name, "compacted": False, "reason": "round_trip_mismatch"}
+    os.replace(staging, target)
+
+    if not keep_source:
+        for leftover in (path, index_path(path), time_index_path(path)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return {
+        "file": name,
+        "compacted": True,
+        "segment": os.path.basename(target),
+        "events": written["rows"] - merged,
+        "merged_events": merged,
+        "source_bytes": source_bytes,
+        "segment_bytes": written["bytes"],
+        "ratio": round(source_bytes / written["bytes"], 2) if written["bytes"] and not merged else None,
+    }
+
+
+def verify_segment_file(path: str, max_anomalies: int = DEFAULT_MAX_ANOMALIES) -> Dict[str, Any]:
+    """Verify the checksum of every event in the columnar segment *path*.
+
+    Same result shape as :func:`verify_log_file`; ``line`` is the event's
+    row number in the segment (its line in the original file when nothing
+    was blank) and ``offset`` is ``None``.
+    """
+    name = os.path.basename(path)
+    anomalies: List[Dict[str, Any]] = []
+    anomaly_count = events = 0
+    manifest = load_retention_manifest(path)
+    retention = _RetainedTree(manifest) if manifest is not None else None
+    for row, event in enumerate(ColumnarSegment(path).scan(), start=1):
+        events += 1
+        if retention is not None:
+            retention.feed(event)
+        stored = event.get("checksum")
+        reason = "missing_checksum" if not stored else "checksum_mismatch" if stored != event_checksum(event) else None
+        if reason is not None:
+            anomaly_count += 1
+            if len(anomalies) < max_anomalies:
+                anomalies.append({"file": name, "line": row, "offset": None, "event_id": event.get("event_id"), "reason": reason})
+    reason = retention.anomaly() if retention is not None else None
+    if reason is not None:
+        anomaly_count += 1
+        if len(anomalies) < max_anomalies:
+            anomalies.append(_retention_anomaly(name, reason))
+    return {
+        "file": name,
+        "verified": anomaly_count == 0,
+        "events_checked": events,
+        "anomalies": anomalies,
+        "anomaly_count": anomaly_count,
+    }
+
+
+# ── Retention ────────────────────────────────────────────────────────────────
+#
+# Pruning anchors the day first.  Its manifest ``<day>.retention.json`` keeps
+# the Merkle root over the leaves ``leaf_hash(canonical_bytes(event))`` of
+# every event the day ever held, in file order, and the leaves of the pruned
+# events by position (a chunk of DEFAULT_MERKLE_CHUNK pruned leaves collapses
+# to its chunk root).  The remaining events fill the other positions in
+# order, so the root is recomputed — and checked — after any number of
+# sweeps.  The AOS hash chain and the sealed day roots are not affected.
+
+
+def retention_manifest_path(path: str) -> str:
+    """Return the retention manifest path for a daily file or segment."""
+    return os.path.splitext(path)[0] + RETENTION_SUFFIX
+
+
+def load_retention_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Return the retention manifest of the day of *path*, or ``None`` if it was never pruned."""
+    return _read_json(retention_manifest_path(path))
+
+
+class _DayTree:
+    """Merkle root over leaves added in order, holding only the chunk roots."""
+
+    def __init__(self) -> None:
+        self.roots: List[bytes] = []
+        self.chunk: List[bytes] = []
+
+    def add(self, leaf: bytes) -> Optional[bytes]:
+        """Add *leaf*; returns the chunk root when it completes a chunk."""
+        self.chunk.append(leaf)
+        if len(self.chunk) < DEFAULT_MERKLE_CHUNK:
+            return None
+        root = merkle_root(self.chunk)
+        self.roots.append(root)
+        self.chunk = []
+        return root
+
+    def root(self) -> str:
+        # Chunks hold a power of two leaves, so the root over the chunk
+        # roots is the root over every leaf.
+        tail = [merkle_root(self.chunk)] if self.chunk else []
+        return merkle_root(self.roots + tail).hex()
+
+
+class _RetainedTree:
+    """Replays the positions of a day: pruned ones from its manifest, the rest as fed.
+
+    ``anchored`` covers the positions the manifest was written over (to
+    check it against), ``full`` every position (the next manifest's root).
+    """
+
+    def __init__(self, manifest: Optional[Dict[str, Any]]) -> None:
+        self.manifest = manifest
+        manifest = manifest or {}
+        self.leaves = {int(k): bytes.fromhex(v) for k, v in manifest.get("pruned", {}).items()}
+        self.chunks = {int(k): bytes.fromhex(v) for k, v in manifest.get("pruned_chunks", {}).items()}
+        self.covered: int = manifest.get("leaves", 0)
+        self.anchored = _DayTree()
+        self.full = _DayTree()
+        self.position = 0
+        self._pruned_in_chunk = 0
+
+    def _add(self, leaf: bytes, pruned: bool) -> None:
+        if self.position < self.covered:
+            self.anchored.add(leaf)
+        root = self.full.add(leaf)
+        self._pruned_in_chunk += pruned
+        self.position += 1
+        if root is None:
+            return
+        if self._pruned_in_chunk == DEFAULT_MERKLE_CHUNK:
+            chunk = self.position // DEFAULT_MERKLE_CHUNK - 1
+            for position in range(chunk * DEFAULT_MERKLE_CHUNK, self.position):
+                del self.leaves[position]
+            self.chunks[chunk] = root
+        self._pruned_in_chunk = 0
+
+    def _replay_pruned(self) -> None:
+        while True:
+            if self.position % DEFAULT_MERKLE_CHUNK == 0:
+                chunk = self.chunks.get(self.position // DEFAULT_MERKLE_CHUNK)
+                if chunk is not None:
+                    # Collapsed chunks all lie within the covered positions.
+                    self.anchored.roots.append(chunk)
+                    self.full.roots.append(chunk)
+                    self.position += DEFAULT_MERKLE_CHUNK
+                    continue
+            leaf = self.leaves.get(self.position)
+            if leaf is None:
+                return
+            self._add(leaf, pruned=True)
+
+    def feed(self, event: Dict[str, Any], prune: bool = False) -> None:
+        """Place the next remaining *event*, recording it as pruned if *prune*."""
+        self._replay_pruned()
+        leaf = leaf_hash(canonical_bytes(event, str_keys=True))
+        if prune:
+            self.leaves[self.position] = leaf
+        self._add(leaf, pruned=prune)
+
+    def anomaly(self) -> Optional[str]:
+        """Finish the replay; return why it does not match the manifest, or ``None``.
+
+        Events appended after the manifest was written are not covered.
+        """
+        self._replay_pruned()
+        if self.manifest is None:
+            return None
+        if self.manifest.get("encoding") != CANONICAL_ENCODING:
+            return "retention_encoding_changed"
+        if self.position < self.covered or self.anchored.root() != self.manifest["root"]:
+            return "retention_root_mismatch"
+        return None
+
+    def to_manifest(self) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "encoding": CANONICAL_ENCODING,
+            "root": self.full.root(),
+            "leaves": self.position,
+            "pruned": {str(position): leaf.hex() for position, leaf in sorted(self.leaves.items())},
+            "pruned_chunks": {str(chunk): root.hex() for chunk, root in sorted(self.chunks.items())},
+            "swept_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+def _retention_anomaly(name: str, reason: str) -> Dict[str, Any]:
+    return {"file": name, "line": None, "offset": None, "event_id": None, "reason": reason}
+
+
+def prune_log_file(path: str, now: int) -> Dict[str, Any]:
+    """Drop the events of *path* whose ``retention_until`` is at or before *now*.
+
+    *path* is a daily file or a segment; *now* is in epoch microseconds.
+    The remaining events are streamed into a new file (lines kept byte for
+    byte) or segment that replaces the old one, and a day left empty is
+    removed.  The day's manifest is checked before it is re-anchored; a day
+    that fails the check, or has an unparseable line, is left alone.
+    ``next_expiry`` is the earliest ``retention_until`` still held.  Runs in
+    a worker process (see :meth:`AuditLogStore.sweep`).
+    """
+    name = os.path.basename(path)
+    tree = _RetainedTree(load_retention_manifest(path))
+    counts = {"kept": 0, "pruned": 0}
+    next_expiry: Optional[int] = None
+
+    def retained(items: Iterator[Tuple[int, Any, Any]]) -> Iterator[Any]:
+        nonlocal next_expiry
+        for line_no, event, payload in items:
+            if not isinstance(event, dict):
+                raise _UnparseableLine(line_no)
+            expiry = to_micros(event.get("retention_until"))
+            expired = expiry is not None and expiry <= now
+            tree.feed(event, prune=expired)
+            if expired:
+                counts["pruned"] += 1
+                continue
+            if expiry is not None and (next_expiry is None or expiry < next_expiry):
+                next_expiry = expiry
+            counts["kept"] += 1
+            yield payload
+
+    source_bytes = os.path.getsize(path)
+    rewritten = path + ".swept"
+    try:
+        if path.endswith(".col"):
+            segment = ColumnarSegment(path)
+            write_segment(
+                retained((row, event, event) for row, event in enumerate(segment.scan(), start=1)),
+                rewritten,
+                codec=segment.footer["codec"],
+                timestamp_columns=_DATETIME_FIELDS,
+                source=segment.footer.get("source"),
+            )
+        else:
+            with open(rewritten, "wb") as handle:
+                for line in retained(_file_lines(path)):
+                    handle.write(line + b"\n")
+    except _UnparseableLine as error:
+        if os.path.exists(rewritten):
+            os.remove(rewritten)
+        return {"file": name, "swept": False, "reason": f"unparseable line {error.args[0]}"}
+
+    reason = tree.anomaly()
+    if reason is not None or not counts["pruned"]:
+        os.remove(rewritten)
+        if reason is not None:
+            return {"file": name, "swept": False, "reason": reason}
+        return {"file": name, "swept": True, "pruned": 0, "kept": counts["kept"], "removed": False,
+                "source_bytes": source_bytes, "remaining_bytes": source_bytes, "next_expiry": next_expiry}
+
+    _write_json(retention_manifest_path(path), tree.to_manifest())
+    for sidecar in (index_path(path), time_index_path(path)):
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+    if counts["kept"]:
+        os.replace(rewritten, path)
+    else:
+        os.remove(rewritten)
+        os.remove(path)
+    return {
+        "file": name,
+        "swept": True,
+        "pruned": counts["pruned"],
+        "kept": counts["kept"],
+        "removed": not counts["kept"],
+        "source_bytes": source_bytes,
+        "remaining_bytes": os.path.getsize(path) if counts["kept"] else 0,
+        "next_expiry": next_expiry,
+    }
+
+
+# ── Directory of daily files ─────────────────────────────────────────────────
+
+
+class AuditLogStore:
+    """The daily ``audit_log_YYYY-MM-DD.jsonl`` files in one directory.
+
+    Closed days compacted by :meth:`compact` are kept as
+    ``audit_log_YYYY-MM-DD.col`` columnar segments, which :meth:`verify` and
+    :meth:`query` read alongside the files.
+
+    Args:
+        directory:   Directory holding the files and their sidecar indexes.
+        block_lines: Timestamped lines per block of the sparse timestamp index.
+    """
+
+    def __init__(self, directory: str = DEFAULT_AUDIT_LOG_DIR, block_lines: int = DEFAULT_BLOCK_LINES) -> None:
+        self.directory = directory
+        self.block_lines = block_lines
+        # path -> ((mtime_ns, size), first expiry) for :meth:`expiry_heap`.
+        self._expiries: Dict[str, Tuple[Tuple[int, int], Optional[int]]] = {}
+
+    def _listing(self, pattern: re.Pattern) -> List[Tuple[str, str]]:
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for filename in os.listdir(self.directory):
+            match = pattern.match(filename)
+            if match:
+                found.append((match.group(1), os.path.join(self.directory, filename)))
+        return sorted(found)
+
+    def files(self) -> List[Tuple[str, str]]:
+        """Return ``(day, path)`` for every daily file, oldest first."""
+        return self._listing(AUDIT_LOG_FILE)
+
+    def segments(self) -> List[Tuple[str, str]]:
+        """Return ``(day, path)`` for every compacted segment whose file is gone, oldest first.
+
+        A day still present as a file (compacted with ``keep_source``) is
+        read from the file.
+        """
+        days = {day for day, _ in self.files()}
+        return [(day, path) for day, path in self._listing(AUDIT_SEGMENT_FILE) if day not in days]
+
+    async def compact(
+        self,
+        grace_days: int = DEFAULT_COMPACT_GRACE_DAYS,
+        codec: str = "zlib",
+        processes: Optional[int] = None,
+        keep_source: bool = False,
+        today: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Compact every closed daily file into a columnar segment.
+
+        A file is closed once more than *grace_days* days have passed since
+        its day (UTC).  One file per worker process; ``processes=0`` runs on
+        a thread.  See :func:`compact_log_file`.
+        """
+        if grace_days < 0:
+            raise ValueError("grace_days must not be negative")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown segment codec {codec!r}; expected one of {sorted(CODECS)}")
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = (today - timedelta(days=grace_days)).isoformat()
+        loop = asyncio.get_running_loop()
+        executor = get_process_pool(processes)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, compact_log_file, path, codec, DEFAULT_ROW_GROUP_ROWS, keep_source)
+            for day, path in self.files()
+            if day < cutoff
+        ))
+        compacted = [result for result in results if result["compacted"]]
+        source_bytes = sum(result["source_bytes"] for result in compacted)
+        segment_bytes = sum(result["segment_bytes"] for result in compacted)
+        # Merged segments also hold earlier rows, so they are left out of the ratio
+        fresh = [result for result in compacted if not result["merged_events"]]
+        fresh_bytes = sum(result["segment_bytes"] for result in fresh)
+        return {
+            "files_compacted": len(compacted),
+            "files_skipped": len(results) - len(compacted),
+            "events": sum(result["events"] for result in compacted),
+            "source_bytes": source_bytes,
+            "segment_bytes": segment_bytes,
+            "ratio": round(sum(result["source_bytes"] for result in fresh) / fresh_bytes, 2) if fresh_bytes else None,
+            "files": results,
+        }
+
+    def expiry_heap(self, today: Optional[date] = None) -> List[Tuple[int, str, str]]:
+        """Return a min-heap of ``(first_expiry, day, path)`` over the closed days.
+
+        A file's earliest ``retention_until`` (epoch microseconds) comes from
+        its sidecar index, a segment's from its footer.  Days without an
+        expiry are left out, and so is today's file, which is still being
+        written.  Expiries are cached per file until it changes.
+        """
+        today = (today or datetime.now(timezone.utc).date()).isoformat()
+        heap = []
+        sources = ([(day, path, False) for day, path in self.files() if day < today]
+                   + [(day, path, True) for day, path in self.segments()])
+        for day, path, compacted in sources:
+            stat = os.stat(path)
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._expiries.get(path)
+            if cached is None or cached[0] != key:
+                expiry = (ColumnarSegment(path).minimum("retention_until") if compacted
+                          else build_log_index(path)["first_expiry"])
+                cached = self._expiries[path] = (key, expiry)
+            if cached[1] is not None:
+                heap.append((cached[1], day, path))
+        heapq.heapify(heap)
+        return heap
+
+    async def sweep(
+        self,
+        now: Optional[datetime] = None,
+        processes: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Prune the events whose ``retention_until`` has passed.
+
+        Only the days at the top of :meth:`expiry_heap` whose first expiry is
+        at or before *now* are rewritten, one per worker process
+        (``processes=0`` runs on a thread); see :func:`prune_log_file`.
+        ``next_expiry`` is when the next sweep has work to do.
+        """
+        now_micros = _micros(now if now is not None else datetime.now(timezone.utc))
+        heap = self.expiry_heap(today)
+        due = []
+        while heap and heap[0][0] <= now_micros:
+            due.append(heapq.heappop(heap))
+        loop = asyncio.get_running_loop()
+        executor = get_process_pool(processes)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, prune_log_file, path, now_micros) for _, _, path in due
+        ))
+        for (_, day, path), result in zip(due, results):
+            if result["swept"] and not result["removed"]:
+                stat = os.stat(path)
+                self._expiries[path] = ((stat.st_mtime_ns, stat.st_size), result["next_expiry"])
+            if result.get("next_expiry") is not None:
+                heapq.heappush(heap, (result["next_expiry"], day, path))
+        swept = [result for result in results if result["swept"]]
+        return {
+            "files_swept": len(swept),
+            "files_skipped": len(results) - len(swept),
+            "files_removed": sum(result["removed"] for result in swept),
+            "events_pruned": sum(result["pruned"] for result in swept),
+            "bytes_reclaimed": sum(result["source_bytes"] - result["remaining_bytes"] for result in swept),
+            "next_expiry": (_EPOCH + heap[0][0] * _MICROSECOND).isoformat() if heap else None,
+            "files": results,
+        }
+
+    async def verify(
+        self,
+        processes: Optional[int] = None,
+        max_anomalies: int = DEFAULT_MAX_ANOMALIES,
+    ) -> Dict[str, Any]:
+        """Verify every file's and segment's checksums, one per worker process.
+
+        ``processes=0`` verifies on a thread instead.  Sidecar indexes of
+        the files are rewritten as a by-product.
+        """
+        loop = asyncio.get_running_loop()
+        executor = get_process_pool(processes)
+        sources = sorted(
+            [(day, path, verify_log_file, (max_anomalies, self.block_lines)) for day, path in self.files()]
+            + [(day, path, verify_segment_file, (max_anomalies,)) for day, path in self.segments()]
+        )
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, verify, path, *args) for _, path, verify, args in sources
+        ))
+        anomalies = [anomaly for result in results for anomaly in result["anomalies"]][:max_anomalies]
+        anomaly_count = sum(result["anomaly_count"] for result in results)
+        return {
+            "verified": anomaly_count == 0,
+            "files_checked": len(results),
+            "events_checked": sum(result["events_checked"] for result in results),
+            "anomalies": anomalies,
+            "anomaly_count": anomaly_count,
+            "files": [{k: v for k, v in result.items() if k != "anomalies"} for result in results],
+        }
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        subject_id: Optional[str] = None,
+        severity: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the events matching every given filter, in file order.
+
+        A time window is mapped to a byte range of each file through its
+        sparse timestamp index (files outside the window are skipped).  With
+        a field filter only the lines in the intersection of the posting
+        lists, within that range, are read; otherwise the range is streamed,
+        stopping at the first line past ``end_time`` in a time-ordered file.
+        A compacted day decodes its filter and ``timestamp`` columns first
+        and the remaining columns only for matching rows (counted as
+        ``lines_read``).  *stats*, if given, accumulates ``files_scanned``
+        and ``lines_read``.
+        """
+        filters = {
+            name: value
+            for name, value in zip(INDEXED_FIELDS, (event_type, subject_id, severity))
+            if value is not None
+        }
+        start = as_utc(start_time) if start_time is not None else None
+        end = as_utc(end_time) if end_time is not None else None
+        stats = stats if stats is not None else {}
+        stats.setdefault("files_scanned", 0)
+        stats.setdefault("lines_read", 0)
+
+        timed = start is not None or end is not None
+        sources = sorted([(day, path, False) for day, path in self.files()]
+                         + [(day, path, True) for day, path in self.segments()])
+        for _, path, compacted in sources:
+            if compacted:
+                stats["files_scanned"] += 1
+                for event in ColumnarSegment(path).select(
+                    equals=filters,
+                    time_column="timestamp" if timed else None,
+                    start=_micros(start) if start is not None else None,
+                    end=_micros(end) if end is not None else None,
+                ):
+                    stats["lines_read"] += 1
+                    yield event
+                continue
+            lo, hi, ordered = 0, None, False
+            if timed:
+                time_index = build_time_index(path, self.block_lines)
+                bounds = range_offsets(time_index, start, end)
+                if bounds is None:
+                    continue
+                (lo, hi), ordered = bounds, time_index["sorted"]
+            offsets: Optional[List[int]] = None
+            if filters:
+                index = build_log_index(path)
+                for name, value in filters.items():
+                    postings = index["fields"][name].get(value, [])
+                    offsets = postings if offsets is None else sorted(set(offsets).intersection(postings))
+                    if not offsets:
+                        break
+                if offsets and timed:
+                    offsets = offsets[bisect_left(offsets, lo):bisect_left(offsets, hi) if hi is not None else None]
+                if not offsets:
+                    continue
+
+            stats["files_scanned"] += 1
+            view = _open_view(path)
+            if view is None:
+                continue
+            try:
+                lines = (
+                    ((offset, read_line(view, offset)) for offset in offsets)
+                    if offsets is not None
+                    else iter_lines(view, lo, hi)
+                )
+                for _, line in lines:
+                    stats["lines_read"] += 1
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    if any(event.get(name) != value for name, value in filters.items()):
+                        continue
+                    if timed:
+                        when = event_time(event)
+                        if when is None or (start is not None and when < start):
+                            continue
+                        if end is not None and when > end:
+                            if ordered:
+                                break
+                            continue
+                    yield event
+            finally:
+                view.close()
+
+
+#: Application-wide audit-log store (configurable at start-up).
+audit_log_store = AuditLogStore()
@@ -0,0 +1,150 @@
+"""Canonical JSON encoding for content hashing.
+
+Hashes this package computes over structured data (audit Merkle leaves,
+content-addressed checkpoint chunks) must not depend on dict insertion
+order, the Python version or how a value happened to be typed.  Hashes
+written by AOS itself, such as the audit chain, keep their writer's
+encoding.
+:func:`canonical_bytes` produces one byte string per value:
+
+- objects with keys sorted by code point, no insignificant whitespace;
+- strings as UTF-8, escaping only what JSON requires;
+- integers in decimal; floats as the shortest repr that round-trips
+  (``0.1``, ``1e+16``), with NaN and infinities rejected;
+- ``datetime`` as UTC ``YYYY-MM-DDTHH:MM:SS.ffffffZ`` (naive values are
+  taken as UTC), ``date`` as ``YYYY-MM-DD``;
+- ``Decimal`` and ``UUID`` as strings, ``Enum`` as its value, ``bytes``
+  as base64, sets as arrays sorted by their elements' encoding, tuples as
+  arrays and SDK models as their JSON dump.
+
+The fast path hands the value straight to a cached C JSON encoder, which
+calls back into Python only for the non-JSON types above.  Mappings with
+non-string keys (which the C encoder would order numerically) take a slow
+path that converts the keys first; callers hashing JSON-decoded data, whose
+keys are strings by construction, skip that check with ``str_keys=True``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from json.encoder import c_make_encoder, encode_basestring
+from typing import Any
+from uuid import UUID
+
+#: Identifies the encoding on persisted hash state (sealed Merkle roots,
+#: audit-log retention manifests), so state written under another encoding is ignored.
+CANONICAL_ENCODING = "canonical-json-v1"
+
+_CONTAINERS = frozenset((dict, list, tuple))
+_STR_KEYS = frozenset((str,))
+
+
+def _coerce(value: Any) -> Any:
+    """``default`` hook: map a non-JSON value to its canonical JSON form."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec="microseconds") + "Z"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=canonical_json)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} values have no canonical JSON form")
+
+
+_ENCODER = json.JSONEncoder(
+    ensure_ascii=False,
+    check_circular=False,
+    allow_nan=False,
+    sort_keys=True,
+    separators=(",", ":"),
+    default=_coerce,
+)
+
+# ``JSONEncoder.encode`` builds a new C encoder on every call; reusing one
+# saves roughly 15% of the cost for a typical audit entry.
+_C_ENCODE = (
+    c_make_encoder(None, _coerce, encode_basestring, None, ":", ",", True, False, False)
+    if c_make_encoder is not None
+    else None
+)
+
+
+def _encode(value: Any) -> str:
+    if _C_ENCODE is None:  # interpreter without the _json accelerator
+        return _ENCODER.encode(value)
+    return "".join(_C_ENCODE(value, 0))
+
+
+def _has_str_keys(node: Any) -> bool:
+    """Return ``True`` if every dict inside *node* has only string keys."""
+    if type(node) is dict:
+        if not _STR_KEYS.issuperset(map(type, node)):
+            return False
+        children = node.values()
+    elif type(node) in _CONTAINERS:
+        children = node
+    else:
+        return True
+    if _CONTAINERS.isdisjoint(map(type, children)):
+        return True
+    return all(_has_str_keys(child) for child in children if type(child) in _CONTAINERS)
+
+
+def _key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, bool):
+        return json.dumps(key)
+    if isinstance(key, (int, float)):
+        return _encode(key)
+    coerced = _coerce(key)
+    if isinstance(coerced, str):
+        return coerced
+    raise TypeError(f"{type(key).__name__} keys have no canonical JSON form")
+
+
+def _string_keys(node: Any) -> Any:
+    """Copy *node* with every dict key converted to its string form."""
+    if isinstance(node, dict):
+        converted = {_key(key): _string_keys(child) for key, child in node.items()}
+        if len(converted) != len(node):
+            raise ValueError("mapping keys collide once converted to strings")
+        return converted
+    if isinstance(node, (list, tuple)):
+        return [_string_keys(child) for child in node]
+    return node
+
+
+def canonical_json(value: Any, str_keys: bool = False) -> str:
+    """Return the canonical JSON text of *value*.
+
+    Args:
+        value:    Value to encode.
+        str_keys: Promise that every mapping key is already a string (true
+                  of anything decoded from JSON), skipping the key check.
+
+    Raises:
+        TypeError:  A value (or key) has no canonical form.
+        ValueError: A float is NaN or infinite, or converted keys collide.
+    """
+    if not str_keys and not _has_str_keys(value):
+        value = _string_keys(value)
+    return _encode(value)
+
+
+def canonical_bytes(value: Any, str_keys: bool = False) -> bytes:
+    """Return the canonical JSON of *value* encoded as UTF-8."""
+    return canonical_json(value, str_keys).encode("utf-8")
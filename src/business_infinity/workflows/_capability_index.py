@@ -0,0 +1,146 @@
+"""Offline semantic capability matching for ``find-agents``.
+
+Capability strings in the RealmOfAgents catalog rarely match requests
+verbatim (``"risk-analysis"`` vs ``"risk assessment"``).  This module
+provides fuzzy matching that needs no network access or embedding model:
+
+- every capability string and agent description is turned into a hashed
+  character n-gram vector (:func:`hash_ngrams`);
+- the vectors for a catalog are stacked once into a NumPy matrix
+  (:class:`CapabilityIndex`) and cached per :func:`~._app.catalog_version`;
+- queries are answered by cosine similarity with a top-k selection.
+
+Scores are in ``[0, 1]`` so they can be blended linearly with the exact-match
+score computed by ``find-agents``.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ._app import catalog_version
+
+#: Dimensionality of the hashed n-gram space.
+NGRAM_DIM = 1024
+
+#: Character n-gram sizes combined into each vector.
+NGRAM_SIZES = (2, 3, 4)
+
+#: Extra weight given to whole-word features, so shared words dominate
+#: incidental n-gram overlap between unrelated words.
+WORD_WEIGHT = 3.0
+
+_SEPARATORS = re.compile(r"[\s\-_/.,;:]+")
+
+
+def _normalise(text: str) -> str:
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def hash_ngrams(text: str, dim: int = NGRAM_DIM) -> np.ndarray:
+    """Return the L2-normalised hashed character n-gram vector for *text*.
+
+    Each word contributes a whole-word feature plus its n-grams, padded with
+    boundary markers so that prefixes and suffixes carry weight (``"risk"`` →
+    ``"<ri"``, ``"ris"``, ``"isk"``, ``"sk>"``, ...).
+    ``zlib.crc32`` is used as the hash so vectors are stable across processes
+    (the builtin :func:`hash` is salted per interpreter).
+    """
+    vec = np.zeros(dim, dtype=np.float32)
+    for word in _normalise(text).split():
+        padded = f"<{word}>"
+        vec[zlib.crc32(padded.encode()) % dim] += WORD_WEIGHT
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                vec[zlib.crc32(padded[i:i + n].encode()) % dim] += 1.0
+    norm = float(np.linalg.norm(vec))
+    if norm:
+        vec /= norm
+    return vec
+
+
+class CapabilityIndex:
+    """Hashed n-gram matrix over the capabilities and descriptions of a catalog.
+
+    Each agent contributes one row per capability plus one row for its
+    description (when it has one).  An agent's similarity to a query term is
+    the best cosine similarity over its rows.
+
+    Args:
+        agents:  Agent descriptors from ``client.list_agents()``.
+        version: Catalog version the index was built for.
+    """
+
+    def __init__(self, agents: List[Any], version: str = "") -> None:
+        self.version = version
+        self.agent_ids: List[str] = []
+        texts: List[str] = []
+        owners: List[int] = []
+        for position, agent in enumerate(agents):
+            self.agent_ids.append(getattr(agent, "agent_id", str(position)))
+            for text in self._agent_texts(agent):
+                texts.append(text)
+                owners.append(position)
+
+        self._owners = np.asarray(owners, dtype=np.intp)
+        self._matrix = (
+            np.vstack([hash_ngrams(t) for t in texts])
+            if texts else np.zeros((0, NGRAM_DIM), dtype=np.float32)
+        )
+        # Rows are grouped per agent, so per-agent maxima reduce over slices.
+        self._starts = np.searchsorted(self._owners, np.arange(len(self.agent_ids)))
+        self._has_rows = np.bincount(self._owners, minlength=len(self.agent_ids)) > 0
+
+    @staticmethod
+    def _agent_texts(agent: Any) -> Iterable[str]:
+        for cap in getattr(agent, "capabilities", None) or []:
+            if cap:
+                yield str(cap)
+        description = getattr(agent, "description", None)
+        if description:
+            yield str(description)
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    def similarity(self, terms: List[str]) -> np.ndarray:
+        """Return a ``(len(terms), len(agents))`` matrix of best cosine scores."""
+        scores = np.zeros((len(terms), len(self.agent_ids)), dtype=np.float32)
+        if not terms or not self._matrix.shape[0]:
+            return scores
+        queries = np.vstack([hash_ngrams(t) for t in terms])
+        row_scores = queries @ self._matrix.T
+        populated = np.flatnonzero(self._has_rows)
+        scores[:, populated] = np.maximum.reduceat(
+            row_scores, self._starts[populated], axis=1,
+        )
+        return np.clip(scores, 0.0, 1.0)
+
+    def top_k(self, terms: List[str], k: int = 10) -> List[Tuple[str, float]]:
+        """Return the *k* agents with the highest mean similarity to *terms*."""
+        if not terms or not self.agent_ids:
+            return []
+        mean = self.similarity(terms).mean(axis=0)
+        k = min(k, len(mean))
+        best = np.argpartition(-mean, k - 1)[:k]
+        best = best[np.argsort(-mean[best], kind="stable")]
+        return [(self.agent_ids[i], float(mean[i])) for i in best]
+
+
+#: Most recently built index, replaced whenever the catalog version changes.
+_INDEX_CACHE: Dict[str, CapabilityIndex] = {}
+
+
+def get_capability_index(agents: List[Any], version: Optional[str] = None) -> CapabilityIndex:
+    """Return the :class:`CapabilityIndex` for *agents*, building it at most once per version."""
+    version = version or catalog_version(agents)
+    index = _INDEX_CACHE.get(version)
+    if index is None:
+        index = CapabilityIndex(agents, version=version)
+        _INDEX_CACHE.clear()
+        _INDEX_CACHE[version] = index
+    return index
@@ -0,0 +1,1033 @@
+"""Checkpoint storage helpers for perpetual orchestrations.
+
+``checkpoint-orchestration`` and ``resume-orchestration`` persist orchestration
+state as knowledge-base documents of type :data:`CHECKPOINT_DOC_TYPE`.  This
+module keeps the storage format concerns out of the workflow functions:
+
+- :func:`json_diff` / :func:`apply_patch` — minimal RFC 6902 JSON-patch
+  support used for delta checkpoints
+- :func:`build_checkpoint_document` — decides between a full snapshot and a
+  delta against the previous checkpoint of the same orchestration
+- :func:`load_checkpoint_data` — rebuilds state by replaying deltas from the
+  most recent full snapshot
+- :func:`encode_payload` / :func:`decode_payload` — size-aware zlib / LZMA
+  compression of checkpoint payloads with base64 framing
+- :func:`split_chunks` / :func:`store_chunks` / :func:`resolve_chunks` —
+  content-addressed, reference-counted storage of large sub-trees, shared
+  across checkpoints and orchestrations
+- :func:`upsert_document` — update-or-create of documents with deterministic
+  ids, creating only when the update reports the document missing
+- :func:`update_latest_pointer` / :func:`get_latest_checkpoint` — O(1)
+  latest-checkpoint lookup through a per-orchestration pointer document
+- :func:`save_checkpoint` — the complete write path used by
+  ``checkpoint-orchestration`` and the scheduler
+- :class:`CheckpointScheduler` / :data:`checkpoint_scheduler` — periodic,
+  coalescing, jittered checkpoints for the perpetual orchestrations
+- :class:`CheckpointRetentionPolicy` / :func:`compact_checkpoints` —
+  retention and rate-capped garbage collection of superseded checkpoints
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import lzma
+import random
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ._app import RateLimiter, logger
+from ._canonical import canonical_bytes
+
+#: Knowledge-base document type for orchestration checkpoints.
+CHECKPOINT_DOC_TYPE = "orchestration-checkpoint"
+
+#: Knowledge-base document type for latest-checkpoint pointer documents.
+CHECKPOINT_POINTER_DOC_TYPE = "orchestration-checkpoint-pointer"
+
+#: Write a full snapshot after this many consecutive delta checkpoints.
+DEFAULT_FULL_SNAPSHOT_EVERY = 10
+
+#: Payloads whose JSON encoding is smaller than this many bytes are stored as-is.
+DEFAULT_COMPRESS_THRESHOLD = 4 * 1024
+
+#: Sub-trees whose canonical JSON is at least this many bytes are stored once
+#: as content-addressed chunks instead of inline (``0`` disables chunking).
+DEFAULT_CHUNK_THRESHOLD = 2 * 1024
+
+#: Knowledge-base document type for content-addressed checkpoint chunks.
+CHECKPOINT_CHUNK_DOC_TYPE = "orchestration-checkpoint-chunk"
+
+#: Key of the reference object that replaces a chunked sub-tree in a payload.
+CHUNK_REF_KEY = "$chunk"
+
+#: Payloads at least this large use LZMA, which compresses better than zlib
+#: but costs more CPU per byte.
+LZMA_THRESHOLD = 1024 * 1024
+
+#: Orchestration statuses after which an orchestration is no longer
+#: checkpointed (see :meth:`CheckpointScheduler.untrack`).
+TERMINAL_ORCHESTRATION_STATUSES = frozenset({"completed", "failed", "cancelled", "terminated", "stopped"})
+
+#: In-process cache of the latest checkpoint id per orchestration id, kept in
+#: step with the pointer documents written by :func:`update_latest_pointer`.
+_LATEST_CHECKPOINTS: Dict[str, str] = {}
+
+#: In-process cache of chunk contents by digest.  Chunks are immutable, so
+#: entries never go stale; the cache is simply cleared when it grows too large.
+_CHUNK_CACHE: Dict[str, Any] = {}
+_CHUNK_CACHE_SIZE = 1024
+
+#: Serialises chunk reference-count updates within this process.  The
+#: knowledge-base API has no compare-and-swap, so counts are only exact when
+#: a single instance writes checkpoints (as with the scheduler singleton).
+_CHUNK_LOCK = asyncio.Lock()
+
+#: In-process record of the last checkpoint written per orchestration id:
+#: ``{"checkpoint_id", "sequence", "deltas_since_full", "state"}``.
+_CHECKPOINT_STATE: Dict[str, Dict[str, Any]] = {}
+
+
+def doc_field(doc: Any, name: str, default: Any = None) -> Any:
+    """Read *name* from a knowledge-base document returned by the SDK.
+
+    Documents may come back as plain dicts or as model objects, and model
+    objects may carry the stored body under ``content``.
+    """
+    if isinstance(doc, dict):
+        if name in doc:
+            return doc[name]
+        content = doc.get("content")
+    else:
+        value = getattr(doc, name, None)
+        if value is not None:
+            return value
+        content = getattr(doc, "content", None)
+    if isinstance(content, dict) and name in content:
+        return content[name]
+    return default
+
+
+def is_not_found(exc: BaseException) -> bool:
+    """Return whether *exc* reports a missing knowledge-base document.
+
+    The SDK surfaces a missing document as a lookup error, an HTTP 404
+    (``status``/``status_code``) or a ``*NotFound*`` exception type; anything
+    else — throttling, timeouts, server errors — is treated as transient.
+    """
+    if isinstance(exc, (LookupError, FileNotFoundError)):
+        return True
+    for attr in ("status_code", "status"):
+        if getattr(exc, attr, None) == 404:
+            return True
+    return "notfound" in type(exc).__name__.lower()
+
+
+async def upsert_document(client: Any, document_id: str, fields: Dict[str, Any], **create: Any) -> None:
+    """Update *document_id* with *fields*, creating it (with *create* fields) if missing.
+
+    Only a not-found error (see :func:`is_not_found`) falls back to
+    ``create_document``; other errors propagate, so a transient failure never
+    creates a second document under the same id.
+    """
+    try:
+        await client.update_document(document_id, fields)
+    except Exception as exc:
+        if not is_not_found(exc):
+            raise
+        await client.create_document({"document_id": document_id, **create, **fields})
+
+
+# ── JSON patch (RFC 6902 subset: add / remove / replace) ─────────────────────
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Return JSON-patch operations that turn *old* into *new*.
+
+    Dicts are diffed key by key.  Lists that only grew (or shrank) at the end
+    produce append / trailing-remove operations, and equal-length lists are
+    diffed element-wise; any other list change replaces the list.  This keeps
+    the patch for append-mostly orchestration state (decision logs, minutes)
+    proportional to what changed rather than to the total state size.
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        if old == new:
+            return []
+        common = min(len(old), len(new))
+        if old[:common] == new[:common]:
+            if len(new) > len(old):
+                return [{"op": "add", "path": f"{path}/-", "value": v} for v in new[common:]]
+            return [
+                {"op": "remove", "path": f"{path}/{i}"}
+                for i in range(len(old) - 1, common - 1, -1)
+            ]
+        if len(old) == len(new):
+            ops = []
+            for i, (a, b) in enumerate(zip(old, new)):
+                if a != b:
+                    ops.extend(json_diff(a, b, f"{path}/{i}"))
+            return ops
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Return a copy of *doc* with the JSON-patch *patch* applied."""
+    result = copy.deepcopy(doc)
+    for operation in patch:
+        op = operation["op"]
+        path = operation["path"]
+        value = copy.deepcopy(operation.get("value"))
+        if path == "":
+            if op == "remove":
+                result = None
+            else:
+                result = value
+            continue
+
+        tokens = [_unescape(t) for t in path.split("/")[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+
+        if isinstance(parent, list):
+            if op == "add":
+                if last == "-":
+                    parent.append(value)
+                else:
+                    parent.insert(int(last), value)
+            elif op == "remove":
+                del parent[int(last)]
+            elif op == "replace":
+                parent[int(last)] = value
+            else:
+                raise ValueError(f"Unsupported JSON-patch op '{op}'")
+        else:
+            if op in ("add", "replace"):
+                parent[last] = value
+            elif op == "remove":
+                del parent[last]
+            else:
+                raise ValueError(f"Unsupported JSON-patch op '{op}'")
+    return result
+
+
+# ── Payload compression ──────────────────────────────────────────────────────
+
+#: Encoding marker → (compress, decompress) over UTF-8 JSON bytes.
+_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda raw: zlib.compress(raw, 6), zlib.decompress),
+    "lzma": (lambda raw: lzma.compress(raw, preset=1), lzma.decompress),
+}
+
+
+def encode_payload(
+    value: Any,
+    threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+) -> Tuple[Any, str]:
+    """Return ``(stored_value, encoding)`` for a checkpoint payload.
+
+    Payloads below *threshold* bytes of JSON are returned unchanged with
+    encoding ``"json"``.  Larger payloads are compressed with zlib (LZMA from
+    :data:`LZMA_THRESHOLD` bytes) and base64-framed into a string; the
+    compressed form is only kept when it is actually smaller.
+    """
+    raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    if len(raw) < threshold:
+        return value, "json"
+    encoding = "lzma" if len(raw) >= LZMA_THRESHOLD else "zlib"
+    framed = base64.b64encode(_CODECS[encoding][0](raw)).decode("ascii")
+    if len(framed) >= len(raw):
+        return value, "json"
+    return framed, encoding
+
+
+def decode_payload(stored: Any, encoding: Optional[str]) -> Any:
+    """Reverse :func:`encode_payload` using the stored *encoding* marker."""
+    if not encoding or encoding == "json":
+        return stored
+    if encoding not in _CODECS:
+        raise ValueError(f"Unknown checkpoint payload encoding '{encoding}'")
+    return json.loads(_CODECS[encoding][1](base64.b64decode(stored)))
+
+
+def _payload(doc: Any, name: str, default: Any) -> Any:
+    stored = doc_field(doc, name)
+    if stored is None:
+        return default
+    return decode_payload(stored, doc_field(doc, "payload_encoding"))
+
+
+# ── Content-addressed chunks ─────────────────────────────────────────────────
+
+
+def chunk_document_id(digest: str) -> str:
+    """Return the document id of the chunk with SHA-256 *digest*."""
+    return f"checkpoint-chunk-{digest}"
+
+
+def _chunk_refs(value: Any) -> List[str]:
+    """Return the chunk digests referenced directly by *value* (not by its chunks)."""
+    if isinstance(value, dict):
+        if len(value) == 1 and CHUNK_REF_KEY in value:
+            return [value[CHUNK_REF_KEY]]
+        return [ref for child in value.values() for ref in _chunk_refs(child)]
+    if isinstance(value, list):
+        return [ref for child in value for ref in _chunk_refs(child)]
+    return []
+
+
+def split_chunks(
+    value: Any,
+    threshold: int = DEFAULT_CHUNK_THRESHOLD,
+) -> Tuple[Any, Dict[str, Any]]:
+    """Replace large sub-trees of *value* with content-addressed references.
+
+    Works bottom-up: children are chunked first, then any non-root dict or
+    list whose canonical JSON (with its chunked children already replaced)
+    is at least *threshold* bytes becomes ``{"$chunk": "<sha256>"}``.  A
+    sub-tree that recurs — within one payload, across checkpoints or across
+    orchestrations — therefore always maps to the same digest.
+
+    Returns ``(value_with_refs, chunks)`` where *chunks* maps each digest to
+    its (possibly reference-bearing) content.
+    """
+    chunks: Dict[str, Any] = {}
+    if threshold <= 0:
+        return value, chunks
+
+    def _walk(node: Any, is_root: bool) -> Any:
+        if isinstance(node, dict):
+            node = {key: _walk(child, False) for key, child in node.items()}
+        elif isinstance(node, list):
+            node = [_walk(child, False) for child in node]
+        else:
+            return node
+        if is_root:
+            return node
+        raw = canonical_bytes(node)
+        if len(raw) < threshold:
+            return node
+        digest = hashlib.sha256(raw).hexdigest()
+        chunks[digest] = node
+        return {CHUNK_REF_KEY: digest}
+
+    return _walk(value, True), chunks
+
+
+async def store_chunks(
+    client: Any,
+    refs: List[str],
+    chunks: Dict[str, Any],
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+) -> int:
+    """Take one reference on each chunk in *refs*, creating chunks as needed.
+
+    A chunk that already exists only has its ``ref_count`` incremented; its
+    content is not written again.  A new chunk is created with
+    ``ref_count: 1`` and in turn takes a reference on the chunks it contains.
+    Returns the number of chunk documents created.
+    """
+    created = 0
+    for digest in refs:
+        doc_id = chunk_document_id(digest)
+        try:
+            existing = await client.get_document(doc_id)
+        except Exception as exc:
+            # Only a missing chunk is created; recreating an existing one
+            # would reset the ref_count other checkpoints rely on.
+            if not is_not_found(exc):
+                raise
+            existing = None
+        if existing is not None:
+            await client.update_document(
+                doc_id, {"ref_count": int(doc_field(existing, "ref_count", 0)) + 1},
+            )
+            continue
+        content = chunks[digest]
+        children = _chunk_refs(content)
+        stored, encoding = encode_payload(content, compress_threshold)
+        await client.create_document({
+            "document_id": doc_id,
+            "doc_type": CHECKPOINT_CHUNK_DOC_TYPE,
+            "title": f"Checkpoint chunk {digest[:12]}",
+            "content_digest": digest,
+            "chunk_data": stored,
+            "payload_encoding": encoding,
+            "chunk_refs": children,
+            "ref_count": 1,
+        })
+        created += 1 + await store_chunks(client, children, chunks, compress_threshold)
+    return created
+
+
+async def release_chunks(client: Any, refs: List[str]) -> int:
+    """Drop one reference on each chunk in *refs*; returns chunks deleted.
+
+    Chunks whose ``ref_count`` reaches zero are deleted and release the
+    chunks they reference in turn.
+    """
+    deleted = 0
+    for digest in refs:
+        doc_id = chunk_document_id(digest)
+        try:
+            doc = await client.get_document(doc_id)
+        except Exception as exc:
+            if not is_not_found(exc):
+                raise
+            continue  # already collected
+        remaining = int(doc_field(doc, "ref_count", 1)) - 1
+        if remaining > 0:
+            await client.update_document(doc_id, {"ref_count": remaining})
+            continue
+        await client.delete_document(doc_id)
+        _CHUNK_CACHE.pop(digest, None)
+        deleted += 1 + await release_chunks(client, doc_field(doc, "chunk_refs", []) or [])
+    return deleted
+
+
+async def resolve_chunks(client: Any, value: Any) -> Any:
+    """Return *value* with every chunk reference replaced by its content."""
+    if isinstance(value, dict):
+        if len(value) == 1 and CHUNK_REF_KEY in value:
+            digest = value[CHUNK_REF_KEY]
+            content = _CHUNK_CACHE.get(digest)
+            if content is None:
+                doc = await client.get_document(chunk_document_id(digest))
+                content = await resolve_chunks(
+                    client,
+                    decode_payload(doc_field(doc, "chunk_data"), doc_field(doc, "payload_encoding")),
+                )
+                if len(_CHUNK_CACHE) >= _CHUNK_CACHE_SIZE:
+                    _CHUNK_CACHE.clear()
+                _CHUNK_CACHE[digest] = content
+            return copy.deepcopy(content)
+        return {key: await resolve_chunks(client, child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [await resolve_chunks(client, child) for child in value]
+    return value
+
+
+# ── Full / delta checkpoint documents ────────────────────────────────────────
+
+
+def build_checkpoint_document(
+    orchestration_id: str,
+    checkpoint_data: Dict[str, Any],
+    created_at: str,
+    full_snapshot_every: int = DEFAULT_FULL_SNAPSHOT_EVERY,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    chunks: Optional[Dict[str, Any]] = None,
+    chunk_threshold: int = DEFAULT_CHUNK_THRESHOLD,
+) -> Dict[str, Any]:
+    """Return the knowledge-base document body for a new checkpoint.
+
+    A delta document (``checkpoint_kind: "delta"``) holding a JSON patch
+    against the previous checkpoint is produced when this process wrote the
+    previous checkpoint and fewer than *full_snapshot_every* deltas have been
+    written since the last full snapshot.  Otherwise — including after a cold
+    start — a full snapshot is written.
+
+    Large sub-trees of the payload (``checkpoint_data`` or ``patch``) are
+    replaced with chunk references by :func:`split_chunks`; the chunk
+    contents are added to *chunks* for the caller to store and the direct
+    references are listed in ``chunk_refs``.  The payload is then passed
+    through :func:`encode_payload`; the chosen codec is recorded in
+    ``payload_encoding``.
+    """
+    previous = _CHECKPOINT_STATE.get(orchestration_id)
+    doc_body: Dict[str, Any] = {
+        "doc_type": CHECKPOINT_DOC_TYPE,
+        "title": f"Checkpoint for {orchestration_id}",
+        "orchestration_id": orchestration_id,
+        "created_at": created_at,
+    }
+    if previous is not None and previous["deltas_since_full"] < full_snapshot_every:
+        payload_field = "patch"
+        payload: Any = json_diff(previous["state"], checkpoint_data)
+        doc_body.update({
+            "checkpoint_kind": "delta",
+            "sequence": previous["sequence"] + 1,
+            "base_checkpoint_id": previous["checkpoint_id"],
+        })
+    else:
+        payload_field = "checkpoint_data"
+        payload = checkpoint_data
+        doc_body.update({
+            "checkpoint_kind": "full",
+            "sequence": previous["sequence"] + 1 if previous else 0,
+        })
+    payload, payload_chunks = split_chunks(payload, chunk_threshold)
+    if chunks is not None:
+        chunks.update(payload_chunks)
+    doc_body["chunk_refs"] = _chunk_refs(payload)
+    doc_body[payload_field], doc_body["payload_encoding"] = encode_payload(
+        payload, compress_threshold,
+    )
+    return doc_body
+
+
+def record_checkpoint(
+    orchestration_id: str,
+    checkpoint_id: str,
+    doc_body: Dict[str, Any],
+    checkpoint_data: Dict[str, Any],
+) -> None:
+    """Remember the checkpoint just written so the next one can be a delta."""
+    previous = _CHECKPOINT_STATE.get(orchestration_id)
+    is_delta = doc_body.get("checkpoint_kind") == "delta"
+    _CHECKPOINT_STATE[orchestration_id] = {
+        "checkpoint_id": checkpoint_id,
+        "sequence": doc_body.get("sequence", 0),
+        "deltas_since_full": previous["deltas_since_full"] + 1 if is_delta and previous else 0,
+        "state": copy.deepcopy(checkpoint_data),
+    }
+
+
+async def load_checkpoint_data(client: Any, checkpoint_doc: Any) -> Dict[str, Any]:
+    """Return the orchestration state captured by *checkpoint_doc*.
+
+    Full snapshots are returned directly.  For delta checkpoints the chain of
+    ``base_checkpoint_id`` links is followed back to the nearest full snapshot
+    via ``client.get_document`` and the patches are replayed forward.
+    Compressed payloads are decoded according to their ``payload_encoding``
+    and chunk references are resolved with :func:`resolve_chunks`.
+    """
+    chain: List[Any] = [checkpoint_doc]
+    while doc_field(chain[-1], "checkpoint_kind", "full") == "delta":
+        base_id: Optional[str] = doc_field(chain[-1], "base_checkpoint_id")
+        if not base_id:
+            raise ValueError("Delta checkpoint is missing its base_checkpoint_id")
+        chain.append(await client.get_document(base_id))
+
+    state = await resolve_chunks(client, _payload(chain[-1], "checkpoint_data", {}) or {})
+    for delta in reversed(chain[:-1]):
+        state = apply_patch(state, await resolve_chunks(client, _payload(delta, "patch", [])))
+    if len(chain) > 1:
+        logger.info("Checkpoint state rebuilt by replaying %d delta(s)", len(chain) - 1)
+    return state
+
+
+# ── Latest-checkpoint pointer ────────────────────────────────────────────────
+
+
+def pointer_document_id(orchestration_id: str) -> str:
+    """Return the deterministic document id of an orchestration's pointer document."""
+    return f"checkpoint-pointer-{orchestration_id}"
+
+
+async def update_latest_pointer(
+    client: Any,
+    orchestration_id: str,
+    checkpoint_id: str,
+    sequence: int,
+    updated_at: str,
+) -> None:
+    """Point the orchestration's pointer document at *checkpoint_id*.
+
+    The pointer is a small document with a deterministic id (see
+    :func:`pointer_document_id`), so readers can fetch it with a single
+    ``get_document`` instead of searching.  The first write from a process
+    that finds no pointer creates it (see :func:`upsert_document`).
+    """
+    pointer_id = pointer_document_id(orchestration_id)
+    fields = {
+        "latest_checkpoint_id": checkpoint_id,
+        "sequence": sequence,
+        "updated_at": updated_at,
+    }
+    await upsert_document(
+        client,
+        pointer_id,
+        fields,
+        doc_type=CHECKPOINT_POINTER_DOC_TYPE,
+        title=f"Latest checkpoint for {orchestration_id}",
+        orchestration_id=orchestration_id,
+    )
+    _LATEST_CHECKPOINTS[orchestration_id] = checkpoint_id
+
+
+async def _pointer_target(client: Any, orchestration_id: str) -> Optional[str]:
+    """Return the checkpoint id the pointer references (cached in process), or ``None``."""
+    checkpoint_id = _LATEST_CHECKPOINTS.get(orchestration_id)
+    if checkpoint_id is None:
+        try:
+            pointer = await client.get_document(pointer_document_id(orchestration_id))
+        except Exception as exc:
+            if not is_not_found(exc):
+                raise
+            pointer = None  # no pointer document
+        checkpoint_id = doc_field(pointer, "latest_checkpoint_id") if pointer else None
+        if checkpoint_id is not None:
+            _LATEST_CHECKPOINTS[orchestration_id] = checkpoint_id
+    return checkpoint_id
+
+
+async def get_latest_checkpoint(client: Any, orchestration_id: str) -> Optional[Any]:
+    """Return the latest checkpoint document for *orchestration_id*, or ``None``.
+
+    Resolves the checkpoint id from the in-process cache, or else from the
+    pointer document, then fetches the checkpoint with a direct
+    ``get_document`` call.  Returns ``None`` when no pointer exists (for
+    example, orchestrations checkpointed before pointers were introduced).
+    """
+    checkpoint_id = await _pointer_target(client, orchestration_id)
+    if checkpoint_id is None:
+        return None
+    return await client.get_document(checkpoint_id)
+
+
+# ── Checkpoint write path ────────────────────────────────────────────────────
+
+
+async def save_checkpoint(
+    client: Any,
+    orchestration_id: str,
+    checkpoint_data: Dict[str, Any],
+    full_snapshot_every: int = DEFAULT_FULL_SNAPSHOT_EVERY,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    chunk_threshold: int = DEFAULT_CHUNK_THRESHOLD,
+) -> Dict[str, Any]:
+    """Write a checkpoint document and advance the orchestration's pointer.
+
+    Chunks referenced by the checkpoint are stored (or have their reference
+    count incremented) before the checkpoint itself is written, so a
+    checkpoint never points at a missing chunk.
+
+    Returns the ``checkpoint-orchestration`` response body.
+    """
+    created_at = datetime.now(timezone.utc).isoformat()
+    chunks: Dict[str, Any] = {}
+    doc_body = build_checkpoint_document(
+        orchestration_id,
+        checkpoint_data,
+        created_at=created_at,
+        full_snapshot_every=full_snapshot_every,
+        compress_threshold=compress_threshold,
+        chunks=chunks,
+        chunk_threshold=chunk_threshold,
+    )
+    async with _CHUNK_LOCK:
+        chunks_created = await store_chunks(
+            client, doc_body["chunk_refs"], chunks, compress_threshold,
+        )
+    doc = await client.create_document(doc_body)
+    checkpoint_id = doc.document_id if hasattr(doc, "document_id") else str(uuid.uuid4())
+    record_checkpoint(orchestration_id, checkpoint_id, doc_body, checkpoint_data)
+    try:
+        await update_latest_pointer(
+            client, orchestration_id, checkpoint_id, doc_body["sequence"], created_at,
+        )
+    except Exception as exc:  # noqa: BLE001 — the checkpoint itself is saved
+        # Readers fall back to the previous checkpoint until the next save
+        # moves the pointer; this process already knows the latest one.
+        _LATEST_CHECKPOINTS[orchestration_id] = checkpoint_id
+        logger.warning("Checkpoint pointer for %s not updated: %s", orchestration_id, exc)
+    logger.info(
+        "Checkpoint %s (%s) saved for orchestration %s",
+        checkpoint_id,
+        doc_body["checkpoint_kind"],
+        orchestration_id,
+    )
+    return {
+        "checkpoint_id": checkpoint_id,
+        "orchestration_id": orchestration_id,
+        "checkpoint_kind": doc_body["checkpoint_kind"],
+        "payload_encoding": doc_body["payload_encoding"],
+        "sequence": doc_body["sequence"],
+        "chunks_referenced": len(doc_body["chunk_refs"]),
+        "chunks_created": chunks_created,
+        "status": "saved",
+    }
+
+
+# ── Periodic checkpoint scheduler ────────────────────────────────────────────
+
+
+class CheckpointScheduler:
+    """Periodically checkpoint tracked perpetual orchestrations.
+
+    Orchestrations are registered with :meth:`track` when one of the perpetual
+    orchestration workflows starts them, and their state is updated from
+    orchestration-update events via :meth:`record_update`.  Updates only
+    change the in-memory state; each orchestration is written at most once
+    per interval, and only if it changed, so bursts of updates coalesce into
+    a single checkpoint.  Each orchestration's schedule starts at a random
+    offset within the first interval and every period is jittered, so the
+    orchestrations do not all write at the same moment.  Superseded checkpoints
+    of the tracked orchestrations are garbage-collected by a background
+    :func:`compact_checkpoints` job started with the first tracked
+    orchestration.
+
+    Args:
+        interval_seconds:            Target time between checkpoints of one
+                                     orchestration.
+        jitter:                      Fractional jitter applied to every period
+                                     (0.1 = ±10%).
+        enabled:                     When ``False``, :meth:`track` records state
+                                     but does not start background tasks.
+        compaction_interval_seconds: Time between compaction runs; ``0``
+                                     disables background compaction.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 300.0,
+        jitter: float = 0.1,
+        enabled: bool = True,
+        compaction_interval_seconds: float = 3600.0,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.jitter = jitter
+        self.enabled = enabled
+        self.compaction_interval_seconds = compaction_interval_seconds
+        self.updates_received = 0
+        self.checkpoints_written = 0
+        self._tracked: Dict[str, Dict[str, Any]] = {}
+        self._compaction_task: Optional[asyncio.Task] = None
+
+    def track(
+        self,
+        client: Any,
+        orchestration_id: str,
+        workflow_name: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Start periodically checkpointing *orchestration_id*.
+
+        Tracking an id again (a restarted orchestration) replaces its state
+        and cancels the previous schedule, so only one task writes it.
+        """
+        previous = self._tracked.get(orchestration_id)
+        if previous is not None and previous["task"] is not None:
+            previous["task"].cancel()
+        entry = {
+            "client": client,
+            "dirty": True,
+            "task": None,
+            "state": {
+                "workflow": workflow_name,
+                "context": _json_safe(context or {}),
+                "agent_outputs": {},
+                "updates_seen": 0,
+            },
+        }
+        self._tracked[orchestration_id] = entry
+        if self.enabled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            entry["task"] = loop.create_task(self._run(orchestration_id))
+            if self.compaction_interval_seconds:
+                self.start_compaction(client, self.compaction_interval_seconds)
+
+    def record_update(self, orchestration_id: str, agent_id: str, output: Any) -> bool:
+        """Fold an orchestration update into the pending state.
+
+        Returns ``False`` when *orchestration_id* is not tracked.
+        """
+        entry = self._tracked.get(orchestration_id)
+        if entry is None:
+            return False
+        state = entry["state"]
+        state["agent_outputs"][agent_id] = _json_safe(output)
+        state["updates_seen"] += 1
+        state["last_update_at"] = datetime.now(timezone.utc).isoformat()
+        entry["dirty"] = True
+        self.updates_received += 1
+        return True
+
+    def is_tracked(self, orchestration_id: str) -> bool:
+        """Return ``True`` if *orchestration_id* is being checkpointed."""
+        return orchestration_id in self._tracked
+
+    async def checkpoint_now(self, orchestration_id: str) -> Optional[Dict[str, Any]]:
+        """Write a checkpoint for *orchestration_id* if its state changed."""
+        entry = self._tracked.get(orchestration_id)
+        if entry is None or not entry["dirty"]:
+            return None
+        entry["dirty"] = False
+        # Snapshot first: updates may arrive while the write is in flight.
+        snapshot = copy.deepcopy(entry["state"])
+        try:
+            result = await save_checkpoint(entry["client"], orchestration_id, snapshot)
+        except Exception:
+            entry["dirty"] = True
+            raise
+        self.checkpoints_written += 1
+        return result
+
+    async def flush(self) -> int:
+        """Checkpoint every changed orchestration now; return the number written."""
+        written = 0
+        for orchestration_id in list(self._tracked):
+            if await self.checkpoint_now(orchestration_id) is not None:
+                written += 1
+        return written
+
+    async def untrack(self, orchestration_id: str, flush: bool = True) -> None:
+        """Stop checkpointing *orchestration_id*, writing pending state first.
+
+        Called when the orchestration stops or completes.  A failed final
+        write is logged; the orchestration is untracked either way.
+        """
+        if flush:
+            try:
+                await self.checkpoint_now(orchestration_id)
+            except Exception as exc:  # noqa: BLE001 — the earlier checkpoints remain
+                logger.warning("Final checkpoint for orchestration %s failed: %s", orchestration_id, exc)
+        entry = self._tracked.pop(orchestration_id, None)
+        if entry is not None and entry["task"] is not None:
+            entry["task"].cancel()
+
+    def tracked_ids(self) -> List[str]:
+        """Return the ids of all tracked orchestrations."""
+        return list(self._tracked)
+
+    def start_compaction(
+        self,
+        client: Any,
+        interval_seconds: float = 3600.0,
+        policy: Optional["CheckpointRetentionPolicy"] = None,
+    ) -> None:
+        """Run :func:`compact_checkpoints` for tracked orchestrations in the background."""
+        if self._compaction_task is None or self._compaction_task.done():
+            self._compaction_task = asyncio.get_running_loop().create_task(
+                self._run_compaction(client, interval_seconds, policy)
+            )
+
+    async def stop(self) -> None:
+        """Flush pending state and cancel all background tasks."""
+        await self.flush()
+        for orchestration_id in list(self._tracked):
+            await self.untrack(orchestration_id, flush=False)
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
+
+    async def _run_compaction(
+        self,
+        client: Any,
+        interval_seconds: float,
+        policy: Optional["CheckpointRetentionPolicy"],
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds * random.uniform(1 - self.jitter, 1 + self.jitter))
+            try:
+                await compact_checkpoints(client, self.tracked_ids(), policy)
+            except Exception as exc:  # noqa: BLE001 — retry next interval
+                logger.warning("Background checkpoint compaction failed: %s", exc)
+
+    def _next_delay(self) -> float:
+        spread = self.interval_seconds * self.jitter
+        return max(0.0, self.interval_seconds + random.uniform(-spread, spread))
+
+    async def _run(self, orchestration_id: str) -> None:
+        await asyncio.sleep(random.uniform(0, self.interval_seconds))
+        while orchestration_id in self._tracked:
+            try:
+                await self.checkpoint_now(orchestration_id)
+            except Exception as exc:  # noqa: BLE001 — retry next interval
+                logger.warning(
+                    "Scheduled checkpoint for orchestration %s failed: %s",
+                    orchestration_id,
+                    exc,
+                )
+            await asyncio.sleep(self._next_delay())
+
+
+def _json_safe(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json")
+    return json.loads(json.dumps(value, default=str))
+
+
+#: Shared scheduler for the perpetual orchestrations (configurable at start-up).
+checkpoint_scheduler = CheckpointScheduler()
+
+
+# ── Retention and compaction ─────────────────────────────────────────────────
+
+
+class CheckpointRetentionPolicy:
+    """Decide which checkpoints of one orchestration must be kept.
+
+    Keeps the *keep_last* most recent checkpoints plus the latest checkpoint
+    of each UTC day within the last *keep_daily_days* days.  Because a delta
+    checkpoint is useless without its base chain, every checkpoint a retained
+    delta depends on is retained as well.
+
+    Args:
+        keep_last:       Number of most recent checkpoints always kept (≥ 1).
+        keep_daily_days: Number of days for which one checkpoint per day is kept.
+    """
+
+    def __init__(self, keep_last: int = 10, keep_daily_days: int = 30) -> None:
+        self.keep_last = max(1, keep_last)
+        self.keep_daily_days = keep_daily_days
+
+    def select(
+        self,
+        checkpoints: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+        pinned: Iterable[str] = (),
+    ) -> Set[str]:
+        """Return the ids to retain from *checkpoints*.
+
+        Each checkpoint is a dict with ``checkpoint_id``, ``created_at``
+        (ISO-8601) and, for deltas, ``base_checkpoint_id``.  *pinned* ids
+        (such as the pointer's target) are retained with their base chains.
+        """
+        now = now or datetime.now(timezone.utc)
+        ordered = sorted(checkpoints, key=lambda c: (c["created_at"], c.get("sequence", 0)))
+        keep: Set[str] = {c["checkpoint_id"] for c in ordered[-self.keep_last:]}
+        keep.update(pinned)
+
+        cutoff = (now - timedelta(days=self.keep_daily_days)).date().isoformat()
+        latest_per_day: Dict[str, str] = {}
+        for checkpoint in ordered:
+            day = checkpoint["created_at"][:10]
+            if day >= cutoff:
+                latest_per_day[day] = checkpoint["checkpoint_id"]
+        keep.update(latest_per_day.values())
+
+        bases = {c["checkpoint_id"]: c.get("base_checkpoint_id") for c in ordered}
+        for checkpoint_id in list(keep):
+            base = bases.get(checkpoint_id)
+            while base and base not in keep:
+                keep.add(base)
+                base = bases.get(base)
+        return keep
+
+
+async def search_all_documents(client: Any, query: str, doc_type: str, page_size: int = 1000) -> List[Any]:
+    """Return every document ``search_documents`` finds for *query* and *doc_type*.
+
+    The SDK search takes only a *limit* — no offset or cursor — and returns
+    matches in no particular order, so a truncated result is an arbitrary
+    subset.  The search is repeated with the limit doubled until it returns
+    fewer documents than asked for, which proves the result complete.
+    """
+    limit = page_size
+    while True:
+        docs = await client.search_documents(query=query, doc_type=doc_type, limit=limit)
+        if len(docs) < limit:
+            return list(docs)
+        limit *= 2
+
+
+async def list_checkpoints(
+    client: Any,
+    orchestration_id: str,
+    page_size: int = 1000,
+) -> List[Dict[str, Any]]:
+    """Return metadata for every checkpoint of *orchestration_id*, oldest first."""
+    docs = await search_all_documents(client, orchestration_id, CHECKPOINT_DOC_TYPE, page_size)
+    checkpoints = [
+        {
+            "checkpoint_id": doc_field(doc, "document_id"),
+            "created_at": doc_field(doc, "created_at", ""),
+            "checkpoint_kind": doc_field(doc, "checkpoint_kind", "full"),
+            "sequence": doc_field(doc, "sequence", 0),
+            "base_checkpoint_id": doc_field(doc, "base_checkpoint_id"),
+            "chunk_refs": doc_field(doc, "chunk_refs", []) or [],
+        }
+        for doc in docs
+        if doc_field(doc, "orchestration_id") == orchestration_id
+    ]
+    return sorted(
+        (c for c in checkpoints if c["checkpoint_id"]),
+        key=lambda c: (c["created_at"], c["sequence"]),
+    )
+
+
+async def compact_checkpoints(
+    client: Any,
+    orchestration_ids: Iterable[str],
+    policy: Optional[CheckpointRetentionPolicy] = None,
+    batch_size: int = 25,
+    rate_limiter: Optional[RateLimiter] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Delete checkpoints of *orchestration_ids* not retained by *policy*.
+
+    Deletions are issued in batches of *batch_size* concurrent
+    ``delete_document`` calls, each of which first acquires a token from
+    *rate_limiter* so compaction never exceeds its request budget.  The
+    checkpoint the pointer currently references, and the base chain it
+    replays from, are never deleted.
+    """
+    policy = policy or CheckpointRetentionPolicy()
+    limiter = rate_limiter or RateLimiter(requests_per_minute=600, burst_limit=batch_size)
+    summary: Dict[str, Any] = {
+        "scanned": 0, "retained": 0, "deleted": 0, "chunks_deleted": 0, "orchestrations": {},
+    }
+
+    async def _delete(checkpoint_id: str) -> None:
+        await limiter.acquire()
+        await client.delete_document(checkpoint_id)
+
+    for orchestration_id in orchestration_ids:
+        checkpoints = await list_checkpoints(client, orchestration_id)
+        latest = await _pointer_target(client, orchestration_id)
+        keep = policy.select(checkpoints, pinned=[latest] if latest else ())
+        doomed = [c for c in checkpoints if c["checkpoint_id"] not in keep]
+        if not dry_run:
+            for start in range(0, len(doomed), batch_size):
+                batch = doomed[start:start + batch_size]
+                await asyncio.gather(*(_delete(c["checkpoint_id"]) for c in batch))
+                async with _CHUNK_LOCK:
+                    for checkpoint in batch:
+                        summary["chunks_deleted"] += await release_chunks(
+                            client, checkpoint["chunk_refs"],
+                        )
+        summary["scanned"] += len(checkpoints)
+        summary["retained"] += len(checkpoints) - len(doomed)
+        summary["deleted"] += len(doomed)
+        summary["orchestrations"][orchestration_id] = {
+            "scanned": len(checkpoints),
+            "deleted": len(doomed),
+        }
+        logger.info(
+            "Checkpoint compaction for %s: %d scanned, %d %s",
+            orchestration_id,
+            len(checkpoints),
+            len(doomed),
+            "would be deleted" if dry_run else "deleted",
+        )
+    summary["dry_run"] = dry_run
+    return summary
@@ -0,0 +1,541 @@
+"""Compressed columnar segments.
+
+A segment stores rows (JSON objects) column by column in row groups of up
+to ``row_group_rows`` rows, so a reader decompresses only the columns it
+needs.  Each column chunk is encoded according to the shape of its values
+and then compressed on its own:
+
+- ``timestamp`` — naive ISO-8601 strings as delta-encoded int64
+  microseconds (values that would not format back identically are kept
+  verbatim as overrides), with the chunk's ``min`` / ``max`` in the footer;
+- ``dict`` — low-cardinality scalars as a dictionary plus integer codes;
+- ``dict_list`` — lists of scalars (tags) as a dictionary, list lengths
+  and codes;
+- ``hex`` — fixed-width lowercase hex strings (digests) as raw bytes;
+- ``json`` — anything else, one JSON document per row.
+
+Rows lacking a key get a presence bitmap in that column's chunk, so rows
+read back equal the rows written.
+
+File layout: ``magic | column chunks | footer JSON | footer length (u32) |
+magic``; the footer lists the columns and, per row group, each chunk's
+encoding, byte range and part lengths.
+"""
+
+from __future__ import annotations
+
+import json
+import lzma
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+#: Leading and trailing file signature.
+MAGIC = b"BICOLSEG"
+
+#: Written to the footer; version 2 added timestamp chunk ranges.
+FORMAT_VERSION = 2
+
+#: Footer versions this reader understands.
+READABLE_VERSIONS = (1, 2)
+
+#: Rows per row group (the unit of buffering when writing).
+DEFAULT_ROW_GROUP_ROWS = 65_536
+
+#: Chunk compressors and decompressors by codec name.
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+#: Microseconds assigned to rows without a (parseable) timestamp.
+NO_TIME = np.iinfo(np.int64).min
+
+_FOOTER_LENGTH = struct.Struct("<I")
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_SCALARS = (str, int, float, bool, type(None))
+_ABSENT = object()
+
+
+def _codes_dtype(size: int) -> np.dtype:
+    return np.dtype(np.uint8 if size <= 1 << 8 else np.uint16 if size <= 1 << 16 else np.uint32)
+
+
+def _format_micros(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def to_micros(value: Any) -> Optional[int]:
+    """Return an ISO-8601 string as epoch microseconds (naive taken as UTC)."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        return (parsed - _EPOCH_UTC) // _MICROSECOND
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+
+
+def _encode_timestamps(values: List[Any]) -> Optional[Tuple[Dict[str, Any], List[bytes]]]:
+    micros = np.empty(len(values), dtype=np.int64)
+    overrides: Dict[str, Any] = {}
+    override_micros = []
+    previous = 0
+    for i, value in enumerate(values):
+        parsed = to_micros(value) if isinstance(value, str) and "+" not in value[10:] else None
+        if parsed is None or _format_micros(parsed) != value:
+            overrides[str(i)] = value
+            parsed = to_micros(value)
+            if parsed is not None:
+                override_micros.append(parsed)
+            parsed = previous
+        micros[i] = previous = parsed
+    if len(overrides) * 2 > len(values):
+        return None
+    meta: Dict[str, Any] = {"encoding": "timestamp"}
+    # Range of every parseable value, so readers can skip the chunk.
+    timed = np.delete(micros, [int(i) for i in overrides]) if overrides else micros
+    bounds = override_micros + ([int(timed.min()), int(timed.max())] if len(timed) else [])
+    if bounds:
+        meta.update(min=min(bounds), max=max(bounds))
+    deltas = np.diff(micros, prepend=np.int64(0))
+    return meta, [deltas.astype("<i8").tobytes(), json.dumps(overrides).encode()]
+
+
+def _dictionary(values: Iterable[Any], limit: int) -> Optional[Tuple[List[Any], List[int]]]:
+    index: Dict[Tuple[type, Any], int] = {}
+    codes = []
+    for value in values:
+        if not isinstance(value, _SCALARS):
+            return None
+        key = (type(value), value)
+        code = index.get(key)
+        if code is None:
+            if len(index) >= limit:
+                return None
+            code = index[key] = len(index)
+        codes.append(code)
+    return [value for _, value in index], codes
+
+
+def _encode_dict(values: List[Any]) -> Optional[Tuple[Dict[str, Any], List[bytes]]]:
+    found = _dictionary(values, max(256, len(values) // 4))
+    if found is None:
+        return None
+    dictionary, codes = found
+    dtype = _codes_dtype(len(dictionary))
+    return (
+        {"encoding": "dict", "code_bytes": dtype.itemsize},
+        [json.dumps(dictionary).encode(), np.asarray(codes, dtype=dtype).tobytes()],
+    )
+
+
+def _encode_dict_list(values: List[Any]) -> Optional[Tuple[Dict[str, Any], List[bytes]]]:
+    if not all(isinstance(value, list) for value in values):
+        return None
+    found = _dictionary((item for value in values for item in value), 1 << 16)
+    if found is None:
+        return None
+    dictionary, codes = found
+    dtype = _codes_dtype(len(dictionary))
+    lengths = np.fromiter((len(value) for value in values), dtype=np.uint32, count=len(values))
+    return (
+        {"encoding": "dict_list", "code_bytes": dtype.itemsize},
+        [json.dumps(dictionary).encode(), lengths.tobytes(), np.asarray(codes, dtype=dtype).tobytes()],
+    )
+
+
+def _encode_hex(values: List[Any]) -> Optional[Tuple[Dict[str, Any], List[bytes]]]:
+    first = values[0]
+    if not isinstance(first, str) or len(first) < 16 or len(first) % 2:
+        return None
+    width = len(first)
+    raw = []
+    for value in values:
+        if not isinstance(value, str) or len(value) != width:
+            return None
+        try:
+            decoded = bytes.fromhex(value)
+        except ValueError:
+            return None
+        if decoded.hex() != value:
+            return None
+        raw.append(decoded)
+    return {"encoding": "hex", "width": width // 2}, [b"".join(raw)]
+
+
+def _encode_json(values: List[Any]) -> Tuple[Dict[str, Any], List[bytes]]:
+    # Comma-separated, so a whole chunk decodes as one JSON array.
+    encoded = [json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode() for value in values]
+    lengths = np.fromiter((len(item) for item in encoded), dtype=np.uint32, count=len(encoded))
+    return {"encoding": "json"}, [lengths.tobytes(), b",".join(encoded)]
+
+
+def _encode_column(values: List[Any], timestamp: bool) -> Tuple[Dict[str, Any], List[bytes]]:
+    encoders = [_encode_timestamps] if timestamp else []
+    encoders += [_encode_dict_list, _encode_hex, _encode_dict]
+    for encoder in encoders:
+        encoded = encoder(values) if values else None
+        if encoded is not None:
+            return encoded
+    return _encode_json(values)
+
+
+def _write_row_group(
+    handle: Any,
+    batch: List[Dict[str, Any]],
+    columns: List[str],
+    compress: Callable[[bytes], bytes],
+    timestamp_columns: Sequence[str],
+) -> Dict[str, Any]:
+    """Append one row group's column chunks to *handle*; returns its footer entry.
+
+    Columns seen for the first time are appended to *columns*.
+    """
+    names: Dict[str, None] = {}
+    for row in batch:
+        names.update(dict.fromkeys(row))
+    chunks = {}
+    for name in names:
+        if name not in columns:
+            columns.append(name)
+        values = [row[name] for row in batch if name in row]
+        meta, parts = _encode_column(values, name in timestamp_columns)
+        if len(values) < len(batch):
+            present = np.fromiter((name in row for row in batch), dtype=bool, count=len(batch))
+            parts.insert(0, np.packbits(present).tobytes())
+            meta["sparse"] = True
+        blob = compress(b"".join(parts))
+        meta.update(offset=handle.tell(), length=len(blob), parts=[len(part) for part in parts])
+        handle.write(blob)
+        chunks[name] = meta
+    return {"rows": len(batch), "columns": chunks}
+
+
+def write_segment(
+    rows: Iterable[Dict[str, Any]],
+    path: str,
+    codec: str = "zlib",
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    timestamp_columns: Sequence[str] = (),
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Write *rows* to a columnar segment at *path*; returns its size and shape.
+
+    Rows are buffered one row group at a time.  The segment is written to a
+    temporary file and moved into place once complete; the temporary file is
+    removed if *rows* raises.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown segment codec {codec!r}; expected one of {sorted(CODECS)}")
+    if row_group_rows < 1:
+        raise ValueError("row_group_rows must be at least 1")
+    compress = CODECS[codec][0]
+    columns: List[str] = []
+    groups: List[Dict[str, Any]] = []
+    total = 0
+    temporary = path + ".tmp"
+
+    try:
+        with open(temporary, "wb") as handle:
+            handle.write(MAGIC)
+
+            batch: List[Dict[str, Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= row_group_rows:
+                    groups.append(_write_row_group(handle, batch, columns, compress, timestamp_columns))
+                    total += len(batch)
+                    batch = []
+            if batch:
+                groups.append(_write_row_group(handle, batch, columns, compress, timestamp_columns))
+                total += len(batch)
+
+            footer = json.dumps({
+                "version": FORMAT_VERSION,
+                "source": source,
+                "codec": codec,
+                "rows": total,
+                "columns": columns,
+                "row_groups": groups,
+            }).encode()
+            handle.write(footer + _FOOTER_LENGTH.pack(len(footer)) + MAGIC)
+            size = handle.tell()
+    except BaseException:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+    return {"rows": total, "row_groups": len(groups), "columns": len(columns), "bytes": size}
+
+
+# ── Decoding ─────────────────────────────────────────────────────────────────
+
+
+class _Chunk:
+    """One decompressed column chunk of a row group."""
+
+    def __init__(self, meta: Dict[str, Any], payload: bytes, rows: int) -> None:
+        parts, offset = [], 0
+        for length in meta["parts"]:
+            parts.append(payload[offset:offset + length])
+            offset += length
+        self.meta = meta
+        self.rows = rows
+        self.mask: Optional[np.ndarray] = None
+        if meta.get("sparse"):
+            self.mask = np.unpackbits(np.frombuffer(parts.pop(0), dtype=np.uint8), count=rows).astype(bool)
+            self.position = np.cumsum(self.mask) - 1
+        self.parts = parts
+        self._micros: Optional[np.ndarray] = None
+        encoding = meta["encoding"]
+        if encoding in ("dict", "dict_list"):
+            self.dictionary = json.loads(parts[0])
+            self.codes = np.frombuffer(parts[-1], dtype=_codes_dtype(1 << (8 * meta["code_bytes"])))
+            if encoding == "dict_list":
+                lengths = np.frombuffer(parts[1], dtype=np.uint32)
+                self.starts = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        elif encoding == "json":
+            self.lengths = np.frombuffer(parts[0], dtype=np.uint32)
+            self.starts = np.concatenate(([0], np.cumsum(self.lengths.astype(np.int64) + 1)))
+        elif encoding == "timestamp":
+            self.overrides = json.loads(parts[1])
+
+    def _micros_present(self) -> np.ndarray:
+        if self._micros is None:
+            self._micros = np.cumsum(np.frombuffer(self.parts[0], dtype="<i8"))
+        return self._micros
+
+    def _decode(self, positions: Optional[np.ndarray]) -> List[Any]:
+        """Decode the present values at *positions* (all of them if ``None``)."""
+        encoding = self.meta["encoding"]
+        if encoding == "dict":
+            codes = self.codes if positions is None else self.codes[positions]
+            dictionary = self.dictionary
+            return [dictionary[code] for code in codes.tolist()]
+        if encoding == "json":
+            body = self.parts[1]
+            if positions is None:
+                return json.loads(b"[" + body + b"]")
+            starts, lengths = self.starts.tolist(), self.lengths.tolist()
+            return [json.loads(body[starts[i]:starts[i] + lengths[i]]) for i in positions.tolist()]
+        if encoding == "timestamp":
+            micros = self._micros_present()
+            selected = micros if positions is None else micros[positions]
+            values = np.datetime_as_string(selected.astype("datetime64[us]")).tolist()
+            # isoformat() leaves out a zero fraction.
+            for i in np.flatnonzero(selected % 1_000_000 == 0).tolist():
+                values[i] = values[i][:-7]
+            if self.overrides:
+                indexes = range(len(values)) if positions is None else positions.tolist()
+                for i, index in enumerate(indexes):
+                    override = self.overrides.get(str(index), _ABSENT)
+                    if override is not _ABSENT:
+                        values[i] = override
+            return values
+        if encoding == "dict_list":
+            dictionary = self.dictionary
+            flat = [dictionary[code] for code in self.codes.tolist()]
+            starts = self.starts.tolist()
+            indexes = range(len(starts) - 1) if positions is None else positions.tolist()
+            return [flat[starts[i]:starts[i + 1]] for i in indexes]
+        width = 2 * self.meta["width"]
+        digits = self.parts[0].hex()
+        if positions is None:
+            return [digits[i:i + width] for i in range(0, len(digits), width)]
+        return [digits[i * width:(i + 1) * width] for i in positions.tolist()]
+
+    def values(self, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """Return the values at *rows* (all rows by default); absent ones are ``_ABSENT``."""
+        if self.mask is None:
+            return self._decode(rows)
+        rows = np.arange(self.rows) if rows is None else rows
+        present = self.mask[rows]
+        decoded = iter(self._decode(self.position[rows][present]))
+        return [next(decoded) if is_present else _ABSENT for is_present in present.tolist()]
+
+    def equals(self, value: Any) -> np.ndarray:
+        """Return a row mask of ``column == value`` (type-sensitive, like the dictionary)."""
+        if self.meta["encoding"] == "dict":
+            codes = [code for code, item in enumerate(self.dictionary) if type(item) is type(value) and item == value]
+            matches = self.codes == codes[0] if codes else np.zeros(len(self.codes), dtype=bool)
+        else:
+            present = self._decode(None)
+            matches = np.fromiter(
+                (type(item) is type(value) and item == value for item in present), dtype=bool, count=len(present),
+            )
+        if self.mask is None:
+            return matches
+        full = np.zeros(self.rows, dtype=bool)
+        full[self.mask] = matches
+        return full
+
+    def micros(self) -> np.ndarray:
+        """Return every row's value as epoch microseconds (:data:`NO_TIME` if none)."""
+        if self.meta["encoding"] == "timestamp":
+            present = self._micros_present().copy()
+            for index, value in self.overrides.items():
+                parsed = to_micros(value)
+                present[int(index)] = NO_TIME if parsed is None else parsed
+        else:
+            parsed = (to_micros(value) for value in self._decode(None))
+            present = np.fromiter((NO_TIME if value is None else value for value in parsed), dtype=np.int64)
+        if self.mask is None:
+            return present
+        full = np.full(self.rows, NO_TIME, dtype=np.int64)
+        full[self.mask] = present
+        return full
+
+
+class ColumnarSegment:
+    """Reader for a segment written by :func:`write_segment`.
+
+    Only the footer is read on open; each access reads and decompresses just
+    the column chunks it needs.  ``bytes_read`` counts compressed chunk
+    bytes read so far.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            tail = _FOOTER_LENGTH.size + len(MAGIC)
+            if size < len(MAGIC) + tail:
+                raise ValueError(f"{path} is not a columnar segment")
+            handle.seek(size - tail)
+            raw = handle.read(tail)
+            if raw[_FOOTER_LENGTH.size:] != MAGIC:
+                raise ValueError(f"{path} is not a columnar segment")
+            (length,) = _FOOTER_LENGTH.unpack(raw[:_FOOTER_LENGTH.size])
+            handle.seek(size - tail - length)
+            footer = json.loads(handle.read(length))
+        if footer.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"{path} has unsupported segment version {footer.get('version')!r}")
+        self.footer = footer
+        self.columns: List[str] = footer["columns"]
+        self.rows: int = footer["rows"]
+        self._decompress = CODECS[footer["codec"]][1]
+        self.bytes_read = 0
+        self._ranges = footer["version"] >= 2
+
+    def _chunk(self, handle: Any, group: Dict[str, Any], name: str) -> Optional[_Chunk]:
+        meta = group["columns"].get(name)
+        if meta is None:
+            return None
+        handle.seek(meta["offset"])
+        blob = handle.read(meta["length"])
+        self.bytes_read += len(blob)
+        return _Chunk(meta, self._decompress(blob), group["rows"])
+
+    def _may_overlap(self, group: Dict[str, Any], name: str, start: Optional[int], end: Optional[int]) -> bool:
+        """``False`` if the footer shows no value of *name* in the group can fall in ``[start, end]``."""
+        if start is None and end is None:
+            return True
+        meta = group["columns"].get(name)
+        if meta is None:
+            return False
+        if meta["encoding"] != "timestamp" or not self._ranges:
+            return True
+        if "min" not in meta:
+            return False
+        return (start is None or meta["max"] >= start) and (end is None or meta["min"] <= end)
+
+    def minimum(self, name: str) -> Optional[int]:
+        """Return the earliest value of timestamp column *name* in epoch microseconds.
+
+        Read from the footer where the chunks carry their range; ``None``
+        when no row has a parseable value.
+        """
+        lowest: Optional[int] = None
+        with open(self.path, "rb") as handle:
+            for group in self.footer["row_groups"]:
+                meta = group["columns"].get(name)
+                if meta is None:
+                    continue
+                if meta["encoding"] == "timestamp" and self._ranges:
+                    value = meta.get("min")
+                else:
+                    micros = self._chunk(handle, group, name).micros()
+                    micros = micros[micros != NO_TIME]
+                    value = int(micros.min()) if len(micros) else None
+                if value is not None and (lowest is None or value < lowest):
+                    lowest = value
+        return lowest
+
+    def scan(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every row restricted to *columns* (all columns by default)."""
+        return self.select(columns=columns)
+
+    def select(
+        self,
+        equals: Optional[Dict[str, Any]] = None,
+        time_column: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the rows matching every filter, restricted to *columns*.
+
+        Args:
+            equals:      Column → value that must match exactly.
+            time_column: Column compared with ``[start, end]`` (epoch
+                         microseconds, inclusive).
+            columns:     Columns of the yielded rows (all by default).
+
+        Filter columns are decoded first; the other requested columns are
+        only decoded for the matching rows of each row group.
+        """
+        equals = equals or {}
+        names = self.columns if columns is None else [name for name in self.columns if name in set(columns)]
+        with open(self.path, "rb") as handle:
+            for group in self.footer["row_groups"]:
+                rows: Optional[np.ndarray] = None
+                if time_column is not None and not self._may_overlap(group, time_column, start, end):
+                    continue
+                if equals or (time_column is not None and (start is not None or end is not None)):
+                    mask = np.ones(group["rows"], dtype=bool)
+                    for name, value in equals.items():
+                        chunk = self._chunk(handle, group, name)
+                        mask &= chunk.equals(value) if chunk is not None else False
+                        if not mask.any():
+                            break
+                    if mask.any() and time_column is not None and (start is not None or end is not None):
+                        chunk = self._chunk(handle, group, time_column)
+                        micros = chunk.micros() if chunk is not None else np.full(group["rows"], NO_TIME)
+                        mask &= micros != NO_TIME
+                        if start is not None:
+                            mask &= micros >= start
+                        if end is not None:
+                            mask &= micros <= end
+                    rows = np.flatnonzero(mask)
+                    if not len(rows):
+                        continue
+                values, sparse = {}, False
+                for name in names:
+                    chunk = self._chunk(handle, group, name)
+                    if chunk is not None:
+                        values[name] = chunk.values(rows)
+                        sparse = sparse or chunk.mask is not None
+                present = list(values)
+                count = group["rows"] if rows is None else len(rows)
+                if not values:
+                    yield from ({} for _ in range(count))
+                elif not sparse:
+                    yield from (dict(zip(present, row)) for row in zip(*values.values()))
+                else:
+                    for row in zip(*values.values()):
+                        yield {name: value for name, value in zip(present, row) if value is not _ABSENT}
+
+    def column(self, name: str) -> List[Any]:
+        """Return every row's value of *name* (``None`` where absent)."""
+        return [row.get(name) for row in self.scan([name])]
@@ -0,0 +1,403 @@
+"""Write-behind queue for audit-trail decisions.
+
+Workflows on the request path used to await ``client.log_decision`` inline,
+adding an AOS round trip to every response.  :class:`DecisionLog` takes the
+decision instead, appends it to a local journal and returns; decisions are
+committed to AOS in groups — as soon as ``batch_size`` are waiting, or
+``flush_interval`` seconds after the first of a group arrived — and each
+group is resolved in the journal with one tombstone record.
+
+The journal is a :class:`~._spool.SegmentLog`, so a decision survives the
+instance dying before its group was committed: entries still open when the
+queue first runs are re-queued (see :meth:`DecisionLog.recover`).  Each
+process journals in its own slot of the directory (see
+:func:`~._spool.claim_slot`), so sequence numbers are never shared.  The
+application queue journals under :data:`DECISION_JOURNAL_DIR_ENV`
+(instance-local temp storage by default); when the journal cannot be
+opened, decisions are logged inline as before.  Decisions still failing
+after their attempts are retried every ``retry_interval`` seconds.  With
+``durable=True`` the journal is ``fsync``-ed once per group of concurrent
+submissions rather than once per decision.  The journal and the duplicate
+filters are only touched from one I/O thread (:meth:`DecisionLog.run_io`),
+never on the event loop.  :meth:`DecisionLog.close` commits everything
+still queued and belongs in shutdown.
+
+A retried request submitting its decision again is dropped before it
+reaches the journal when the caller passed an ``idempotency_key``: the key
+is checked against the keys this process's slot recorded over the last
+``dedup_days`` days (see :class:`~._dedup.RecentKeys`).  The filters live
+in the slot, so the window is per process: a retry served by another
+worker process or instance is not recognised, and AOS still receives its
+decision.  Decisions without a key are never deduplicated — two identical
+decisions may well be two real events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ._app import local_state_dir, logger
+from ._dedup import DEFAULT_DEDUP_DAYS, RecentKeys
+from ._spool import DEFAULT_SEGMENT_BYTES, SegmentLog, claim_slot, release_slot
+
+#: Environment variable locating the application queue's journal; empty disables it.
+DECISION_JOURNAL_DIR_ENV = "BUSINESS_INFINITY_DECISION_JOURNAL_DIR"
+
+#: Decisions committed together once this many are queued.
+DEFAULT_BATCH_SIZE = 64
+
+#: Seconds a partial group waits for more decisions before it is committed.
+DEFAULT_FLUSH_INTERVAL = 0.2
+
+#: Seconds before decisions that failed every attempt are tried again.
+DEFAULT_RETRY_INTERVAL = 30.0
+
+# Queued items are ``(journal_seq, client, decision)``; the sequence number
+# is ``None`` without a journal.
+_Item = Tuple[Optional[int], Any, Dict[str, Any]]
+
+
+def decision_key(idempotency_key: str) -> str:
+    """Return the duplicate-detection key for a request's *idempotency_key*.
+
+    Raises ``ValueError`` unless the key is a non-empty printable string
+    (keys are stored one per line).
+    """
+    if not isinstance(idempotency_key, str) or not idempotency_key or not idempotency_key.isprintable():
+        raise ValueError(f"idempotency_key must be a non-empty printable string, got {idempotency_key!r}")
+    return f"request:{idempotency_key}"
+
+
+class DecisionLog:
+    """Journaled, group-committed ``client.log_decision``.
+
+    Args:
+        journal_dir:    Root directory of the journal (``None`` for no
+                        journal; queued decisions are then lost with the
+                        instance).
+        batch_size:     Decisions per group commit.
+        flush_interval: Seconds before a partial group is committed.
+        concurrency:    ``log_decision`` calls in flight at once.
+        max_attempts:   Attempts per decision; one still failing stays open
+                        in the journal and is queued again after
+                        *retry_interval*.
+        backoff_base:   Seconds before the second attempt, doubling after.
+        retry_interval: Seconds before failed decisions are queued again.
+        durable:        ``fsync`` the journal before :meth:`submit` returns.
+        segment_bytes:  Journal segment rotation size.
+        dedup_days:     Days of idempotency keys, recorded by this process,
+                        a submission is checked against (``0`` disables
+                        duplicate detection).
+    """
+
+    def __init__(
+        self,
+        journal_dir: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        concurrency: int = DEFAULT_BATCH_SIZE,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+        durable: bool = False,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        dedup_days: int = DEFAULT_DEDUP_DAYS,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.journal_dir = journal_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.retry_interval = retry_interval
+        self.durable = durable
+        self.segment_bytes = segment_bytes
+        self.dedup_days = dedup_days
+        self.stats = {
+            "submitted": 0, "committed": 0, "failed": 0, "groups": 0, "recovered": 0, "syncs": 0, "duplicates": 0,
+            "retried": 0, "inline": 0,
+        }
+        self._slot: Optional[str] = None
+        self._opened = False
+        self._unavailable = False
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._journal: Optional[SegmentLog] = None
+        self._seen: Optional[RecentKeys] = None
+        self._recovered = False
+        self._pending: List[_Item] = []
+        self._failed: List[_Item] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._retry_timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._segments = 0
+
+    # ── Journal ──────────────────────────────────────────────────────────────
+
+    def _open(self) -> None:
+        """Open the journal in a slot of *journal_dir*, and the duplicate filters beside it."""
+        if self._opened:
+            return
+        self._opened = True
+        if self.journal_dir is not None and not self._unavailable:
+            try:
+                self._slot = claim_slot(self.journal_dir)
+                self._journal = SegmentLog(self._slot, "decisions", self.segment_bytes)
+                self._segments = len(self._journal.segments())
+            except OSError as exc:
+                self._unavailable = True
+                if self._slot is not None:
+                    release_slot(self._slot)
+                    self._slot = None
+                logger.warning(
+                    "Decision journal under %s unavailable; logging decisions inline: %s", self.journal_dir, exc,
+                )
+        if self.dedup_days > 0:
+            self._seen = RecentKeys(self._slot, "seen", self.dedup_days)
+
+    def _io_executor(self) -> ThreadPoolExecutor:
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decision-journal")
+        return self._io
+
+    async def run_io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the journal I/O thread; jobs run one at a time, in order."""
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor(), fn, *args)
+
+    @property
+    def journal(self) -> Optional[SegmentLog]:
+        """The journal, opened on first use (by :meth:`submit`, on the I/O thread).
+
+        ``None`` without a journal directory or when it cannot be opened
+        (see :attr:`unavailable`).
+        """
+        self._open()
+        return self._journal
+
+    @property
+    def unavailable(self) -> bool:
+        """Whether the journal directory was given but could not be opened."""
+        return self._unavailable
+
+    @property
+    def seen(self) -> Optional[RecentKeys]:
+        """Keys of the recently submitted decisions, opened with the journal."""
+        self._open()
+        return self._seen
+
+    async def _sync(self) -> None:
+        # Submissions arriving in the same loop iteration share one fsync.
+        if self._sync_task is None:
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_journal())
+        await asyncio.shield(self._sync_task)
+
+    async def _sync_journal(self) -> None:
+        await asyncio.sleep(0)
+        self._sync_task = None
+        # Queued behind the appends it covers on the I/O thread.
+        await self.run_io(self._journal.sync)
+        self.stats["syncs"] += 1
+
+    # ── Queueing ─────────────────────────────────────────────────────────────
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """Attach to the running loop (re-attaching after a loop change)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._timer = None
+            self._retry_timer = None
+            self._inflight = set()
+            self._sync_task = None
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            if self._failed:
+                self._schedule_retry()
+        return loop
+
+    async def submit(
+        self, client: Any, decision: Dict[str, Any], idempotency_key: Optional[str] = None,
+    ) -> Optional[int]:
+        """Journal *decision* and queue it for ``client.log_decision``.
+
+        Returns once the decision is in the journal (and, when durable, on
+        disk); the AOS call happens with its group.  The first submission
+        also re-queues decisions a previous instance left open, for *client*.
+        Returns the journal sequence number (``None`` without a journal, or
+        for a duplicate, which is dropped).  Only a decision submitted with
+        an *idempotency_key* this process (its journal slot) saw in the last
+        ``dedup_days`` days is a duplicate — pass the request's key, which
+        its retries repeat; retries landing on another process are not
+        caught.  When the journal cannot be opened the decision is logged
+        inline, as ``client.log_decision`` would be, and ``None`` is
+        returned.
+        """
+        key = decision_key(idempotency_key) if idempotency_key is not None else None
+        loop = self._bind()
+        if not self._recovered:
+            await self.recover(client)
+        elif not self._opened:  # reopening after close()
+            await self.run_io(self._open)
+        if self._unavailable:
+            self.stats["inline"] += 1
+            await client.log_decision(decision)
+            return None
+        if key is not None and self._seen is not None and not await self.run_io(self._seen.add_if_new, key):
+            self.stats["duplicates"] += 1
+            logger.info("Dropped duplicate decision %r", decision.get("title"))
+            return None
+        try:
+            seq = await self.run_io(self._journal.append, {"decision": decision}) if self._journal is not None else None
+        except OSError as exc:
+            logger.warning("Decision journal append failed; logging %r inline: %s", decision.get("title"), exc)
+            self.stats["inline"] += 1
+            await client.log_decision(decision)
+            return None
+        if self.durable and seq is not None:
+            await self._sync()
+        self._pending.append((seq, client, decision))
+        self.stats["submitted"] += 1
+        if len(self._pending) >= self.batch_size:
+            self._commit_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._commit_pending)
+        return seq
+
+    async def recover(self, client: Any) -> int:
+        """Re-queue the decisions left open in the journal, for *client*.
+
+        Runs once per instance (:meth:`submit` calls it first); returns the
+        number of decisions re-queued.
+        """
+        self._recovered = True
+        await self.run_io(self._open)
+        if self._journal is None:
+            return 0
+        queued = {seq for seq, _, _ in self._pending}
+        entries = await self.run_io(lambda: list(self._journal.open_entries()))
+        recovered = [(entry["seq"], client, entry["decision"]) for entry in entries if entry["seq"] not in queued]
+        if recovered:
+            self._bind()
+            self._pending[:0] = recovered
+            self.stats["recovered"] += len(recovered)
+            logger.info("Re-queued %d journaled decision(s) from a previous instance", len(recovered))
+            self._commit_pending()
+        return len(recovered)
+
+    async def flush(self) -> None:
+        """Commit every queued decision and wait for all groups in flight.
+
+        Decisions waiting to be retried are tried once more now; those
+        still failing wait for the next retry.
+        """
+        self._bind()
+        self._retry_failed()
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight))
+            self._commit_pending()
+        await self.run_io(self._compact)
+
+    async def close(self) -> None:
+        """Flush, then close the journal and the duplicate filters (call at shutdown)."""
+        await self.flush()
+        if self._retry_timer is not None:
+            # Still failing; they stay open in the journal for the next recover()
+            self._retry_timer.cancel()
+            self._retry_timer = None
+            self._failed = []
+        await self.run_io(self._close_files)
+        if self._io is not None:
+            self._io.shutdown()
+            self._io = None
+
+    def _compact(self) -> None:
+        if self._journal is not None:
+            self._journal.compact()
+            self._segments = len(self._journal.segments())
+        if self._seen is not None:
+            self._seen.flush()
+
+    def _close_files(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._seen is not None:
+            self._seen.close()
+            self._seen = None
+        if self._slot is not None:
+            release_slot(self._slot)
+            self._slot = None
+        self._opened = False
+
+    # ── Committing ───────────────────────────────────────────────────────────
+
+    def _commit_pending(self) -> None:
+        """Start a commit task for each group of queued decisions."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            group = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            task = self._loop.create_task(self._commit(group))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _schedule_retry(self) -> None:
+        if self._retry_timer is None:
+            self._retry_timer = self._loop.call_later(self.retry_interval, self._retry_failed)
+
+    def _retry_failed(self) -> None:
+        """Queue the decisions that failed every attempt again, then commit."""
+        if self._retry_timer is not None:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+        if self._failed:
+            self.stats["retried"] += len(self._failed)
+            self._pending[:0] = self._failed
+            self._failed = []
+        self._commit_pending()
+
+    async def _commit(self, group: List[_Item]) -> None:
+        results = await asyncio.gather(*(self._send(client, decision) for _, client, decision in group))
+        committed = [seq for (seq, _, _), ok in zip(group, results) if ok and seq is not None]
+        failed = [item for item, ok in zip(group, results) if not ok]
+        self.stats["groups"] += 1
+        self.stats["committed"] += sum(results)
+        self.stats["failed"] += len(failed)
+        if failed:
+            self._failed.extend(failed)
+            self._schedule_retry()
+        if self._journal is not None and committed:
+            await self.run_io(self._resolve, committed)
+
+    def _resolve(self, seqs: List[int]) -> None:
+        self._journal.resolve(seqs)
+        # Reclaim resolved segments once the journal has rotated.
+        if len(self._journal.segments()) != self._segments:
+            self._journal.compact()
+            self._segments = len(self._journal.segments())
+
+    async def _send(self, client: Any, decision: Dict[str, Any]) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            async with self._semaphore:
+                try:
+                    await client.log_decision(decision)
+                    return True
+                except Exception as exc:  # noqa: BLE001 — the decision stays journaled for recovery
+                    reason = f"{type(exc).__name__}: {exc}"
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.backoff_base * 2 ** (attempt - 1))
+        logger.error(
+            "Decision %r not logged after %d attempt(s): %s", decision.get("title"), self.max_attempts, reason,
+        )
+        return False
+
+
+#: Application-wide decision queue; journals under :data:`DECISION_JOURNAL_DIR_ENV`.
+decision_log = DecisionLog(local_state_dir("decision-journal", DECISION_JOURNAL_DIR_ENV))
@@ -0,0 +1,357 @@
+"""Duplicate detection over recent keys: Bloom filters backed by per-day sidecars.
+
+A retried workflow can submit the same decision twice, and confirming that
+a key was never seen against the full history means a scan.  Keys (event
+ids, decision fingerprints) are recorded per UTC day instead:
+
+- ``<name>_YYYY-MM-DD.keys`` — the sidecar index: every key recorded that
+  day, one per line, appended as it arrives;
+- ``<name>_YYYY-MM-DD.bloom`` — a :class:`ScalableBloomFilter` over the
+  same keys, saved on :meth:`RecentKeys.flush`.
+
+:meth:`RecentKeys.add_if_new` tests the filters of the last ``days`` days
+first; a key none of them holds is new, which costs a few hash probes.
+Only a probable hit reads that day's sidecar (once, then kept in memory)
+to tell a duplicate from a false positive.  A filter saved before the
+sidecar's last lines (a crash between the two) is caught up from the
+sidecar when loaded, so the filters never miss a recorded key.
+
+File layout of a filter: ``magic | header length (u32) | header JSON |
+bit arrays``; the header lists each stage's capacity, error rate and key
+count, and the sidecar bytes the filter covers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import struct
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+#: Leading file signature of a saved filter.
+MAGIC = b"BIBLOOM1"
+
+#: Keys the first stage of a filter holds before a larger one is added.
+DEFAULT_INITIAL_CAPACITY = 4096
+
+#: Target false-positive rate of a whole filter.
+DEFAULT_ERROR_RATE = 0.001
+
+#: Days of keys checked for duplicates (today and yesterday, so a retry
+#: across midnight is still caught); older days' files are deleted.
+DEFAULT_DEDUP_DAYS = 2
+
+_HEADER_LENGTH = struct.Struct("<I")
+_SUFFIXES = (".bloom", ".keys")
+
+
+def _probes(key: str) -> Tuple[int, int]:
+    """Two independent 64-bit hashes of *key* (double hashing derives the rest)."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for *capacity* keys at *error_rate*."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, probes: Tuple[int, int]) -> None:
+        first, second = probes
+        size, bits = self.size, self.bits
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, probes: Tuple[int, int]) -> bool:
+        first, second = probes
+        size, bits = self.size, self.bits
+        for i in range(self.hashes):
+            position = (first + i * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows with its keys while bounding the false-positive rate.
+
+    When the newest stage reaches its capacity a stage *growth* times
+    larger is added, at *tightening* times the previous stage's error rate,
+    so the rates sum to about *error_rate* however many keys arrive.
+
+    Args:
+        initial_capacity: Keys held by the first stage.
+        error_rate:       Target false-positive rate.
+        growth:           Capacity ratio between consecutive stages.
+        tightening:       Error-rate ratio between consecutive stages.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ) -> None:
+        if growth < 1:
+            raise ValueError("growth must be at least 1")
+        if not 0 < tightening < 1:
+            raise ValueError("tightening must be between 0 and 1")
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.stages: List[BloomFilter] = [BloomFilter(initial_capacity, error_rate * (1 - tightening))]
+
+    def __len__(self) -> int:
+        return sum(stage.count for stage in self.stages)
+
+    def add(self, key: str) -> None:
+        """Record *key*."""
+        self.add_probes(_probes(key))
+
+    def __contains__(self, key: str) -> bool:
+        """``False`` if *key* was never added; ``True`` if it probably was."""
+        return self.has_probes(_probes(key))
+
+    # Callers testing one key against several filters hash it once.
+
+    def add_probes(self, probes: Tuple[int, int]) -> None:
+        stage = self.stages[-1]
+        if stage.count >= stage.capacity:
+            stage = BloomFilter(stage.capacity * self.growth, stage.error_rate * self.tightening)
+            self.stages.append(stage)
+        stage.add(probes)
+
+    def has_probes(self, probes: Tuple[int, int]) -> bool:
+        for stage in self.stages:
+            if stage.count and probes in stage:
+                return True
+        return False
+
+    def to_bytes(self, **meta: Any) -> bytes:
+        """Serialise the filter, with *meta* stored in its header."""
+        header = json.dumps({
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "stages": [
+                {"capacity": stage.capacity, "error_rate": stage.error_rate, "count": stage.count}
+                for stage in self.stages
+            ],
+            "meta": meta,
+        }).encode()
+        return b"".join([MAGIC, _HEADER_LENGTH.pack(len(header)), header, *(stage.bits for stage in self.stages)])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["ScalableBloomFilter", Dict[str, Any]]:
+        """Return the filter serialised in *data* and its header's *meta*."""
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a serialised Bloom filter")
+        offset = len(MAGIC) + _HEADER_LENGTH.size
+        (length,) = _HEADER_LENGTH.unpack(data[len(MAGIC):offset])
+        header = json.loads(data[offset:offset + length])
+        offset += length
+        bloom = cls(header["initial_capacity"], header["error_rate"], header["growth"], header["tightening"])
+        bloom.stages = []
+        for spec in header["stages"]:
+            stage = BloomFilter(spec["capacity"], spec["error_rate"])
+            stage.count = spec["count"]
+            stage.bits[:] = data[offset:offset + len(stage.bits)]
+            if len(stage.bits) != (stage.size + 7) // 8:
+                raise ValueError("truncated Bloom filter")
+            offset += len(stage.bits)
+            bloom.stages.append(stage)
+        return bloom, header["meta"]
+
+
+class _Day:
+    """One day's filter, its sidecar and (after a probable hit) the sidecar's keys."""
+
+    def __init__(self, bloom: ScalableBloomFilter, keys_path: Optional[str], covered: int) -> None:
+        self.bloom = bloom
+        self.keys_path = keys_path
+        self.covered = covered
+        self.keys: Optional[Set[str]] = None if keys_path is not None else set()
+        self.dirty = False
+        self.handle: Optional[Any] = None
+
+
+class RecentKeys:
+    """Keys recorded over the last few days, for O(1) duplicate checks.
+
+    Args:
+        directory:        Directory of the per-day files (``None`` keeps
+                          everything in memory).
+        name:             File name prefix.
+        days:             Days of keys a new key is checked against.
+        initial_capacity: First-stage capacity of each day's filter.
+        error_rate:       Target false-positive rate of each day's filter.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        name: str,
+        days: int = DEFAULT_DEDUP_DAYS,
+        initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        if days < 1:
+            raise ValueError("days must be at least 1")
+        self.directory = directory
+        self.name = name
+        self.days = days
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.stats = {"checked": 0, "probable": 0, "sidecar_reads": 0, "duplicates": 0}
+        self._days: Dict[str, _Day] = {}
+        self._today: Optional[str] = None
+        self._window_days: List[str] = []
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    # ── Per-day files ────────────────────────────────────────────────────────
+
+    def _path(self, day: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.name}_{day}{suffix}")
+
+    def _load(self, day: str) -> _Day:
+        """Open *day*: its saved filter, caught up with the sidecar lines it lacks."""
+        if self.directory is None:
+            return _Day(ScalableBloomFilter(self.initial_capacity, self.error_rate), None, 0)
+        keys_path = self._path(day, ".keys")
+        bloom, covered = None, 0
+        try:
+            with open(self._path(day, ".bloom"), "rb") as handle:
+                bloom, meta = ScalableBloomFilter.from_bytes(handle.read())
+            covered = meta["covered_bytes"]
+        except (OSError, ValueError, KeyError):
+            bloom = None
+        if bloom is None or not os.path.exists(keys_path) or covered > os.path.getsize(keys_path):
+            bloom, covered = ScalableBloomFilter(self.initial_capacity, self.error_rate), 0
+        entry = _Day(bloom, keys_path, covered)
+        if os.path.exists(keys_path) and os.path.getsize(keys_path) > covered:
+            with open(keys_path, "r+b") as handle:
+                handle.seek(covered)
+                tail = handle.read()
+                complete = tail[:tail.rfind(b"\n") + 1]
+                # Drop a torn last line (a crash mid-append).
+                handle.truncate(covered + len(complete))
+            for line in complete.splitlines():
+                bloom.add(line.decode("utf-8"))
+            entry.covered = covered + len(complete)
+            entry.dirty = True
+        return entry
+
+    def _window(self, today: str) -> List[_Day]:
+        """The days of the window ending *today*, newest first."""
+        if today != self._today:
+            self._today = today
+            current = date.fromisoformat(today)
+            self._window_days = [(current - timedelta(days=i)).isoformat() for i in range(self.days)]
+            for day in [day for day in self._days if day not in self._window_days]:
+                self._release(day)
+            self._expire(self._window_days[-1])
+        window = []
+        for day in self._window_days:
+            entry = self._days.get(day)
+            if entry is None:
+                entry = self._days[day] = self._load(day)
+            window.append(entry)
+        return window
+
+    def _expire(self, oldest: str) -> None:
+        """Delete the files of days before *oldest*."""
+        if self.directory is None:
+            return
+        prefix = f"{self.name}_"
+        for filename in os.listdir(self.directory):
+            stem, suffix = os.path.splitext(filename)
+            if filename.startswith(prefix) and suffix in _SUFFIXES and stem[len(prefix):] < oldest:
+                os.remove(os.path.join(self.directory, filename))
+
+    def _save(self, day: str) -> None:
+        entry = self._days[day]
+        if not entry.dirty or self.directory is None:
+            return
+        target = self._path(day, ".bloom")
+        with open(target + ".tmp", "wb") as handle:
+            handle.write(entry.bloom.to_bytes(covered_bytes=entry.covered))
+        os.replace(target + ".tmp", target)
+        entry.dirty = False
+
+    def _release(self, day: str) -> None:
+        self._save(day)
+        entry = self._days.pop(day)
+        if entry.handle is not None:
+            entry.handle.close()
+
+    def _sidecar(self, entry: _Day) -> Set[str]:
+        if entry.keys is None:
+            self.stats["sidecar_reads"] += 1
+            with open(entry.keys_path, "rb") as handle:
+                entry.keys = {line.decode("utf-8") for line in handle.read().splitlines()}
+        return entry.keys
+
+    # ── Checks ───────────────────────────────────────────────────────────────
+
+    def add_if_new(self, key: str, today: Optional[date] = None) -> bool:
+        """Record *key* under *today* (UTC) unless the window already holds it.
+
+        Returns ``True`` for a new key, ``False`` for a duplicate.
+
+        Raises:
+            ValueError: *key* contains a line break.
+        """
+        if "\n" in key or "\r" in key:
+            raise ValueError("keys must not contain line breaks")
+        self.stats["checked"] += 1
+        window = self._window((today or datetime.now(timezone.utc).date()).isoformat())
+        probes = _probes(key)
+        for entry in window:
+            if entry.bloom.has_probes(probes):
+                self.stats["probable"] += 1
+                if key in self._sidecar(entry):
+                    self.stats["duplicates"] += 1
+                    return False
+        current = window[0]
+        current.bloom.add_probes(probes)
+        current.dirty = True
+        if current.keys is not None:
+            current.keys.add(key)
+        if current.keys_path is not None:
+            if current.handle is None:
+                current.handle = open(current.keys_path, "ab")
+            line = key.encode("utf-8") + b"\n"
+            current.handle.write(line)
+            current.handle.flush()
+            current.covered += len(line)
+        return True
+
+    def flush(self) -> None:
+        """Save the filters changed since they were loaded or last saved."""
+        for day in list(self._days):
+            self._save(day)
+
+    def close(self) -> None:
+        """Save the filters and close the sidecars (call at shutdown)."""
+        for day in list(self._days):
+            self._release(day)
+        self._today = None
@@ -0,0 +1,795 @@
+"""Webhook delivery engine.
+
+The AOS SDK registers webhooks but gives the app no control over how events
+reach them.  This module delivers webhook events itself:
+
+- :class:`WebhookEndpoint` — a delivery target with its own bounded queue,
+  so a slow endpoint cannot hold back the others;
+- :class:`WebhookDeliveryEngine` / :data:`delivery_engine` — per-endpoint
+  workers that batch events for endpoints accepting JSON arrays, reuse
+  keep-alive HTTP connections, retry transient failures with full-jitter
+  exponential backoff and cap the number of requests in flight;
+- :class:`Coalescer` — per-endpoint window that collapses bursts of events
+  (latest per key, latest overall, or one summary) before they are queued;
+- :func:`dispatch_event` — route an event through
+  :data:`~._webhooks.webhook_index` and enqueue it for every matching
+  endpoint.
+
+With a :class:`~._spool.WebhookSpool` attached, queued events are also
+written to disk so they survive an instance recycle, and abandoned events
+are dead-lettered for the ``replay-webhooks`` workflow.  The application
+engine opens its spool under :data:`WEBHOOK_SPOOL_DIR_ENV` (instance-local
+temp storage by default) when first used, and re-queues what a previous
+instance left pending.
+
+HTTP/1.1 is spoken directly over :mod:`asyncio` streams (the app has no HTTP
+client dependency); only what webhook delivery needs is implemented — JSON
+``POST`` requests and ``Content-Length``, chunked, bodiless (1xx / 204 /
+304) and read-until-close responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import ssl
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ._app import local_state_dir, logger
+from ._spool import WebhookSpool, claim_slot
+from ._webhooks import _MISSING, _compile_path, webhook_index
+
+#: Called with ``(webhook_id, events, reason)`` when a delivery is abandoned.
+FailureHandler = Callable[[str, List[Any], str], Optional[Awaitable[None]]]
+
+#: Environment variable locating the application engine's spool; empty disables it.
+WEBHOOK_SPOOL_DIR_ENV = "BUSINESS_INFINITY_WEBHOOK_SPOOL_DIR"
+
+#: Statuses worth retrying besides 5xx.
+RETRYABLE_STATUSES = frozenset({408, 425, 429})
+
+#: Coalescing modes accepted by :class:`Coalescer`.
+COALESCE_MODES = ("key", "latest", "summary")
+
+#: Coalescing applied by ``register-conditional-webhook`` to webhooks
+#: subscribed to these high-frequency events unless ``coalesce`` is given.
+DEFAULT_COALESCE: Dict[str, Dict[str, Any]] = {
+    "orchestration.updated": {"window_ms": 500, "mode": "key", "key": "orchestration_id"},
+    # ERPNext identifies documents by ``name``
+    "erp.order_created": {"window_ms": 250, "mode": "key", "key": "name"},
+}
+
+
+#: Request headers the engine writes itself; endpoints may not override them.
+RESERVED_HEADERS = frozenset({"host", "content-length", "content-type", "transfer-encoding", "connection"})
+
+_HEADER_NAME = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+
+
+def validate_headers(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Return *headers* if they can be written into a request verbatim.
+
+    Names must be HTTP tokens and values Latin-1 text without CR, LF or NUL,
+    so a value cannot inject further headers; :data:`RESERVED_HEADERS` are
+    rejected.
+
+    Raises:
+        ValueError: If any header is invalid.
+    """
+    if headers is None:
+        return {}
+    if not isinstance(headers, dict):
+        raise ValueError("Webhook headers must be an object of name → value")
+    for name, value in headers.items():
+        if not isinstance(name, str) or not _HEADER_NAME.fullmatch(name):
+            raise ValueError(f"Invalid webhook header name {name!r}")
+        if name.lower() in RESERVED_HEADERS:
+            raise ValueError(f"Webhook header '{name}' is set by the delivery engine")
+        if not isinstance(value, str) or any(c in value for c in "\r\n\0"):
+            raise ValueError(f"Invalid value for webhook header '{name}'")
+        try:
+            value.encode("latin-1")
+        except UnicodeEncodeError:
+            raise ValueError(f"Webhook header '{name}' must be Latin-1 text") from None
+    return headers
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection to a host."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool) -> None:
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.requests = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.writer is None or self.writer.is_closing()
+
+    async def open(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.use_ssl else None,
+        )
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def post(self, request: bytes) -> int:
+        """Send a fully serialised request; return the response status."""
+        assert self.reader is not None and self.writer is not None
+        self.writer.write(request)
+        await self.writer.drain()
+        self.requests += 1
+
+        while True:
+            status, headers = await self._read_head()
+            # Interim responses (100 Continue, 103 Early Hints) precede the real one
+            if not 100 <= status < 200 or status == 101:
+                break
+
+        if status == 204 or status == 304 or 100 <= status < 200:
+            pass  # never has a body
+        elif headers.get("transfer-encoding", "").endswith("chunked"):
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    break
+                await self.reader.readexactly(size + 2)
+            while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # trailer fields
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("connection") == "close":
+            await self.reader.read()
+        else:
+            # No framing on a keep-alive response: treat it as bodiless, but
+            # the connection's position in the stream is unknown, so drop it.
+            self.close()
+        if headers.get("connection") == "close":
+            self.close()
+        return status
+
+    async def _read_head(self) -> Tuple[int, Dict[str, str]]:
+        assert self.reader is not None
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+            # A ValueError takes the normal retry / dead-letter path in _deliver
+            raise ValueError(f"malformed status line {status_line[:64]!r}")
+        status = int(parts[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if status_line.startswith(b"HTTP/1.0") and headers.get("connection") != "keep-alive":
+            headers["connection"] = "close"
+        return status, headers
+
+
+class Coalescer:
+    """Collapse the events an endpoint receives within a window.
+
+    The window opens with the first event and closes *window_ms* later (or,
+    with *debounce*, *window_ms* after the most recent event but no later
+    than *max_wait_ms* after the first).  When it closes :meth:`drain`
+    returns what is delivered:
+
+    - ``"key"`` — the latest event for each distinct value of the dotted
+      *key* path, in order of first appearance; events without the key are
+      delivered unchanged;
+    - ``"latest"`` — only the most recent event;
+    - ``"summary"`` — one event ``{"coalesced": n, "window_ms", "first",
+      "last"}``, plus ``"latest_by_key"`` and ``"count_by_key"`` when *key*
+      is set.
+
+    Every mode keeps the final state: the last event (per key) always
+    survives.
+
+    Args:
+        window_ms:   Window length in milliseconds.
+        mode:        One of :data:`COALESCE_MODES`.
+        key:         Dotted path identifying the entity an event updates
+                     (required for ``"key"``).
+        debounce:    Restart the window on every event.
+        max_wait_ms: Upper bound on a debounced window (default 10 windows).
+    """
+
+    def __init__(
+        self,
+        window_ms: float,
+        mode: str = "key",
+        key: Optional[str] = None,
+        debounce: bool = False,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        if mode not in COALESCE_MODES:
+            raise ValueError(f"Unknown coalesce mode '{mode}'; expected one of {list(COALESCE_MODES)}")
+        if mode == "key" and not key:
+            raise ValueError("Coalesce mode 'key' requires a 'key' path")
+        if window_ms <= 0:
+            raise ValueError("Coalesce window_ms must be positive")
+        self.window = window_ms / 1000
+        self.mode = mode
+        self.key = key
+        self.debounce = debounce
+        self.max_wait = (max_wait_ms / 1000) if max_wait_ms else 10 * self.window
+        self._get_key = _compile_path(key, _MISSING) if key else None
+        # Latest event per slot, in order of first appearance; a slot is
+        # ("key", value) or, for uncollapsible events in "key" mode, ("event", n)
+        self._slots: Dict[Tuple[str, Any], Any] = {}
+        self._counts: Dict[Tuple[str, Any], int] = {}
+        self._first: Any = None
+        self._last_event: Any = None
+        self._received = 0
+        self._opened = self._last = 0.0
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "Coalescer":
+        """Build from a ``coalesce`` options object, rejecting unknown options."""
+        unknown = set(options) - {"window_ms", "mode", "key", "debounce", "max_wait_ms"}
+        if unknown:
+            raise ValueError(f"Unknown coalesce option(s): {sorted(unknown)}")
+        if "window_ms" not in options:
+            raise ValueError("Coalesce options require 'window_ms'")
+        return cls(**options)
+
+    def __len__(self) -> int:
+        return self._received
+
+    def _slot(self, event: Any) -> Optional[Tuple[str, Any]]:
+        if self._get_key is None or not isinstance(event, dict):
+            return None
+        value = self._get_key(event)
+        if value is _MISSING:
+            return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        return ("key", value)
+
+    def add(self, event: Any) -> None:
+        """Fold *event* into the open window (opening one if needed)."""
+        now = time.monotonic()
+        if not self._received:
+            self._opened = now
+            self._first = event
+        self._last = now
+        self._received += 1
+        self._last_event = event
+        slot = self._slot(event)
+        if self.mode == "key":
+            # Events without a usable key are never collapsed
+            self._slots[slot if slot is not None else ("event", self._received)] = event
+        elif slot is not None:
+            self._slots[slot] = event
+            self._counts[slot] = self._counts.get(slot, 0) + 1
+
+    def deadline(self) -> float:
+        """Monotonic time at which the open window closes."""
+        if self.debounce:
+            return min(self._last + self.window, self._opened + self.max_wait)
+        return self._opened + self.window
+
+    def drain(self) -> List[Any]:
+        """Close the window and return the events to deliver."""
+        if not self._received:
+            return []
+        if self.mode == "key":
+            events = list(self._slots.values())
+        elif self.mode == "latest":
+            events = [self._last_event]
+        else:
+            summary: Dict[str, Any] = {
+                "coalesced": self._received,
+                "window_ms": round(self.window * 1000),
+                "first": self._first,
+                "last": self._last_event,
+            }
+            if self.key:
+                summary["latest_by_key"] = {str(slot[1]): e for slot, e in self._slots.items()}
+                summary["count_by_key"] = {str(slot[1]): n for slot, n in self._counts.items()}
+            events = [summary]
+        self._slots = {}
+        self._counts = {}
+        self._first = self._last_event = None
+        self._received = 0
+        return events
+
+
+class WebhookEndpoint:
+    """A webhook delivery target.
+
+    Args:
+        webhook_id:      Id the endpoint is registered under.
+        url:             ``http://`` or ``https://`` URL events are POSTed to.
+        accepts_batches: When ``True`` events are sent as JSON arrays of up to
+                         *max_batch_size* events; otherwise one event per request.
+        max_batch_size:  Largest array sent in one request.
+        queue_size:      Capacity of the pending-event queue (backpressure).
+        headers:         Extra request headers (e.g. authorisation); see
+                         :func:`validate_headers`.
+        keep_alive:      Reuse connections between requests.
+        coalesce:        :class:`Coalescer` options (``window_ms``, ``mode``,
+                         ``key``, ``debounce``, ``max_wait_ms``); events are
+                         collapsed per window before they are queued.
+    """
+
+    def __init__(
+        self,
+        webhook_id: str,
+        url: str,
+        accepts_batches: bool = False,
+        max_batch_size: int = 50,
+        queue_size: int = 1000,
+        headers: Optional[Dict[str, str]] = None,
+        keep_alive: bool = True,
+        coalesce: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Webhook URL must be http(s)://host/..., got '{url}'")
+        self.webhook_id = webhook_id
+        self.url = url
+        self.accepts_batches = accepts_batches
+        self.max_batch_size = max(1, max_batch_size if accepts_batches else 1)
+        self.keep_alive = keep_alive
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.coalescer = Coalescer.from_options(coalesce) if coalesce else None
+        self.window_task: Optional[asyncio.Task] = None
+        self.window_closing = asyncio.Event()
+        self.window_tickets: List[Any] = []
+        self._host = parts.hostname
+        self._use_ssl = parts.scheme == "https"
+        self._port = parts.port or (443 if self._use_ssl else 80)
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = parts.netloc.rsplit("@", 1)[-1]
+        extra = "".join(f"{k}: {v}\r\n" for k, v in validate_headers(headers).items())
+        self._request_head = (
+            f"POST {self._path} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"{extra}"
+        )
+        self._idle: List[_Connection] = []
+        self.workers: List[asyncio.Task] = []
+
+    def build_request(self, body: bytes) -> bytes:
+        return f"{self._request_head}Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+
+    async def acquire(self) -> Tuple[_Connection, bool]:
+        """Return ``(connection, reused)`` — an idle connection if one is open."""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.closed:
+                return connection, True
+        connection = _Connection(self._host, self._port, self._use_ssl)
+        await connection.open()
+        return connection, False
+
+    def release(self, connection: _Connection, max_idle: int) -> None:
+        if self.keep_alive and not connection.closed and len(self._idle) < max_idle:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    def close(self) -> None:
+        for task in self.workers:
+            task.cancel()
+        self.workers = []
+        if self.window_task is not None:
+            self.window_task.cancel()
+            self.window_task = None
+        while self._idle:
+            self._idle.pop().close()
+
+
+class WebhookDeliveryEngine:
+    """Asynchronous, batched, retrying delivery of webhook events.
+
+    Events are enqueued per endpoint (:meth:`enqueue` waits while the queue
+    is full, :meth:`try_enqueue` refuses instead).  Each endpoint is served
+    by *workers_per_endpoint* tasks that take the next event, linger for
+    *batch_window* seconds to let a batch form when the endpoint accepts
+    arrays, and POST it over a pooled keep-alive connection.  A global
+    semaphore caps requests in flight across all endpoints at
+    *max_concurrency*.
+
+    Responses 2xx count as delivered.  Connection errors, timeouts, 5xx and
+    408/425/429 are retried up to *max_attempts* times with full-jitter
+    exponential backoff (``uniform(0, min(backoff_cap, backoff_base * 2**n))``);
+    other statuses fail immediately.  Abandoned events are passed to
+    *on_failure* when set.
+
+    Endpoints registered with ``coalesce`` options collect events in a
+    :class:`Coalescer` window instead; when the window closes its output is
+    queued as above.  With a spool, events are spooled as they enter the
+    window and resolved once its output has been spooled in turn, so a
+    recycle mid-window re-queues them uncoalesced rather than losing them.
+
+    When *spool* is set every enqueued event is appended to its pending log
+    and resolved once delivered or abandoned; abandoned events are written
+    to its dead-letter log before *on_failure* runs.  Spool files are only
+    touched from one I/O thread (:meth:`run_io`), never on the event loop.
+    :meth:`recover` re-queues whatever was still pending when the previous
+    instance stopped.
+
+    :meth:`start` runs once, on first use: it opens a spool in a slot of
+    *spool_dir* (see :func:`~._spool.claim_slot`) unless *spool* is given,
+    re-registers the endpoints recorded there and calls :meth:`recover`.
+
+    Args:
+        max_concurrency:      Requests in flight across all endpoints.
+        workers_per_endpoint: Concurrent requests per endpoint.
+        batch_window:         Seconds to wait for a batch to fill.
+        max_attempts:         Attempts per request, including the first.
+        backoff_base:         Backoff before the second attempt (seconds).
+        backoff_cap:          Upper bound of any single backoff (seconds).
+        request_timeout:      Timeout of one HTTP exchange (seconds).
+        on_failure:           Callback for abandoned events (sync or async).
+        spool:                Persistent pending / dead-letter spool.
+        spool_dir:            Root directory to open a spool under at start.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        workers_per_endpoint: int = 4,
+        batch_window: float = 0.05,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        request_timeout: float = 10.0,
+        on_failure: Optional[FailureHandler] = None,
+        spool: Optional[WebhookSpool] = None,
+        spool_dir: Optional[str] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.workers_per_endpoint = workers_per_endpoint
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.request_timeout = request_timeout
+        self.on_failure = on_failure
+        self.spool = spool
+        self.spool_dir = spool_dir
+        self.endpoints: Dict[str, WebhookEndpoint] = {}
+        self._registrations: Dict[str, Dict[str, Any]] = {}
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._start_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "delivered": 0, "failed": 0, "requests": 0, "retries": 0, "connections": 0, "coalesced": 0,
+        }
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    # ── Start-up and spool I/O ───────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Open the spool, restore recorded endpoints and recover pending events.
+
+        Idempotent; callers racing the first start wait for it to finish.
+        """
+        task = self._ensure_started()
+        if not task.done():
+            await asyncio.shield(task)
+
+    def _ensure_started(self) -> asyncio.Task:
+        task = self._start_task
+        loop = asyncio.get_running_loop()
+        # A start left unfinished by a closed loop is begun again
+        if task is None or (not task.done() and task.get_loop() is not loop):
+            task = self._start_task = loop.create_task(self._start())
+        return task
+
+    async def _start(self) -> None:
+        if self.spool is None and self.spool_dir:
+            try:
+                self.spool = await self.run_io(lambda: WebhookSpool(claim_slot(self.spool_dir)))
+            except OSError as exc:
+                logger.warning("Webhook spool under %s unavailable; queuing in memory only: %s",
+                               self.spool_dir, exc)
+                return
+        if self.spool is None:
+            return
+        for webhook_id, registration in (await self.run_io(self.spool.load_endpoints)).items():
+            if webhook_id in self.endpoints:
+                continue
+            try:
+                self.register_endpoint(webhook_id, registration["url"], **registration.get("options", {}))
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("Ignoring recorded endpoint for webhook %s: %s", webhook_id, exc)
+        requeued = await self.recover()
+        if requeued:
+            logger.info("Re-queued %d spooled webhook event(s) from a previous instance", requeued)
+
+    def _io_executor(self) -> ThreadPoolExecutor:
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook-spool")
+        return self._io
+
+    async def run_io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the spool I/O thread; jobs run one at a time, in order."""
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor(), fn, *args)
+
+    def _save_endpoints(self, registrations: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.spool.save_endpoints(registrations)
+        except OSError as exc:
+            logger.warning("Could not record webhook endpoints: %s", exc)
+
+    def _complete(self, tickets: List[Any]) -> None:
+        """Resolve the pending entries behind queue *tickets*; runs on the I/O thread."""
+        seqs = []
+        for ticket in tickets:
+            if isinstance(ticket, Future):
+                # Submitted to this thread earlier, so already finished
+                ticket = None if ticket.exception() else ticket.result()
+            seqs.append(ticket)
+        self.spool.complete(seqs)
+
+    # ── Registration ─────────────────────────────────────────────────────────
+
+    def register_endpoint(self, webhook_id: str, url: str, **options: Any) -> WebhookEndpoint:
+        """Register (or replace) the endpoint for *webhook_id*; see :class:`WebhookEndpoint`.
+
+        Invalid options raise :class:`ValueError` and leave any previous
+        endpoint in place.  With a spool attached the registration is
+        recorded there, so a new instance can deliver recovered events.
+        """
+        endpoint = WebhookEndpoint(webhook_id, url, **options)
+        previous = self.endpoints.pop(webhook_id, None)
+        if previous is not None:
+            previous.close()
+        self.endpoints[webhook_id] = endpoint
+        self._registrations[webhook_id] = {"url": url, "options": options}
+        if self.spool is not None:
+            self._io_executor().submit(self._save_endpoints, dict(self._registrations))
+        return endpoint
+
+    def has_endpoint(self, webhook_id: str) -> bool:
+        return webhook_id in self.endpoints
+
+    # ── Enqueueing ───────────────────────────────────────────────────────────
+
+    def _endpoint(self, webhook_id: str) -> WebhookEndpoint:
+        endpoint = self.endpoints.get(webhook_id)
+        if endpoint is None:
+            raise ValueError(f"No delivery endpoint registered for webhook '{webhook_id}'")
+        if not endpoint.workers:
+            loop = asyncio.get_running_loop()
+            endpoint.workers = [
+                loop.create_task(self._worker(endpoint)) for _ in range(self.workers_per_endpoint)
+            ]
+        return endpoint
+
+    # Queue items are ``(ticket, event)``: the pending sequence number, a
+    # Future of it for spool writes not awaited (:meth:`try_enqueue`), or
+    # ``None`` when no spool is attached.
+
+    async def enqueue(self, webhook_id: str, event: Any) -> None:
+        """Queue *event* for *webhook_id*, waiting while its queue is full."""
+        await self.start()
+        endpoint = self._endpoint(webhook_id)
+        if endpoint.coalescer is not None:
+            self._coalesce(endpoint, event)
+            return
+        await self._put(endpoint, event)
+
+    async def _put(self, endpoint: WebhookEndpoint, event: Any) -> None:
+        seq = None
+        if self.spool is not None:
+            seq = await self.run_io(self.spool.spool, endpoint.webhook_id, event)
+        await endpoint.queue.put((seq, event))
+
+    def try_enqueue(self, webhook_id: str, event: Any) -> bool:
+        """Queue *event* without waiting; returns ``False`` if the queue is full.
+
+        Events for a coalescing endpoint are always accepted into its window.
+        The spool write is queued on the I/O thread rather than awaited.
+        """
+        self._ensure_started()
+        endpoint = self._endpoint(webhook_id)
+        if endpoint.coalescer is not None:
+            self._coalesce(endpoint, event)
+            return True
+        if endpoint.queue.full():
+            return False
+        ticket = None
+        if self.spool is not None:
+            ticket = self._io_executor().submit(self.spool.spool, webhook_id, event)
+        endpoint.queue.put_nowait((ticket, event))
+        return True
+
+    async def recover(self) -> int:
+        """Re-queue events left pending in the spool by a previous instance.
+
+        Events whose webhook has no registered endpoint stay pending.  Returns
+        the number of events re-queued.
+        """
+        if self.spool is None:
+            return 0
+        requeued = 0
+        entries = await self.run_io(lambda: list(self.spool.pending.open_entries()))
+        for entry in entries:
+            if self.has_endpoint(entry["webhook_id"]):
+                await self._endpoint(entry["webhook_id"]).queue.put((entry["seq"], entry["event"]))
+                requeued += 1
+        return requeued
+
+    async def flush(self) -> None:
+        """Close open coalescing windows, then wait until every queued event
+        has been delivered or abandoned."""
+        windows = []
+        for endpoint in self.endpoints.values():
+            if endpoint.window_task is not None:
+                endpoint.window_closing.set()
+                windows.append(endpoint.window_task)
+        await asyncio.gather(*windows)
+        await asyncio.gather(*(ep.queue.join() for ep in self.endpoints.values()))
+
+    async def close(self) -> None:
+        """Flush pending events, then stop workers, close connections and the spool."""
+        await self.flush()
+        for endpoint in self.endpoints.values():
+            endpoint.close()
+        if self._io is not None:
+            if self.spool is not None:
+                await self.run_io(self.spool.close)
+            self._io.shutdown()
+            self._io = None
+
+    # ── Coalescing ───────────────────────────────────────────────────────────
+
+    def _coalesce(self, endpoint: WebhookEndpoint, event: Any) -> None:
+        endpoint.coalescer.add(event)
+        if self.spool is not None:
+            endpoint.window_tickets.append(
+                self._io_executor().submit(self.spool.spool, endpoint.webhook_id, event),
+            )
+        if endpoint.window_task is None:
+            endpoint.window_task = asyncio.get_running_loop().create_task(self._close_window(endpoint))
+
+    async def _close_window(self, endpoint: WebhookEndpoint) -> None:
+        """Wait for the window's deadline (or :meth:`flush`), then queue its output."""
+        coalescer = endpoint.coalescer
+        closing = endpoint.window_closing
+        # A debounced deadline moves with every event, so re-check after waking
+        while not closing.is_set() and (delay := coalescer.deadline() - time.monotonic()) > 0:
+            try:
+                await asyncio.wait_for(closing.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        closing.clear()
+        received = len(coalescer)
+        events = coalescer.drain()
+        tickets, endpoint.window_tickets = endpoint.window_tickets, []
+        endpoint.window_task = None
+        self.stats["coalesced"] += received - len(events)
+        for event in events:
+            await self._put(endpoint, event)
+        if tickets and self.spool is not None:
+            await self.run_io(self._complete, tickets)
+
+    # ── Delivery ─────────────────────────────────────────────────────────────
+
+    async def _worker(self, endpoint: WebhookEndpoint) -> None:
+        queue = endpoint.queue
+        while True:
+            batch = [await queue.get()]
+            if endpoint.max_batch_size > 1:
+                if queue.qsize() < endpoint.max_batch_size - 1 and self.batch_window > 0:
+                    await asyncio.sleep(self.batch_window)
+                while len(batch) < endpoint.max_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+            try:
+                await self._deliver(endpoint, [event for _, event in batch])
+                if self.spool is not None:
+                    await self.run_io(self._complete, [ticket for ticket, _ in batch])
+            except Exception as exc:  # noqa: BLE001 — keep the worker alive; events stay spooled
+                logger.error("Webhook %s delivery crashed: %s", endpoint.webhook_id, exc)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    async def _deliver(self, endpoint: WebhookEndpoint, events: List[Any]) -> bool:
+        payload = events if endpoint.accepts_batches else events[0]
+        request = endpoint.build_request(json.dumps(payload, default=str).encode())
+        reason = ""
+        for attempt in range(1, self.max_attempts + 1):
+            async with self._semaphore:
+                try:
+                    status = await asyncio.wait_for(
+                        self._send(endpoint, request), self.request_timeout,
+                    )
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+                    status, reason = None, f"{type(exc).__name__}: {exc}"
+            if status is not None:
+                if 200 <= status < 300:
+                    self.stats["delivered"] += len(events)
+                    return True
+                reason = f"HTTP {status}"
+                if status < 500 and status not in RETRYABLE_STATUSES:
+                    break
+            if attempt < self.max_attempts:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+        self.stats["failed"] += len(events)
+        logger.warning(
+            "Webhook %s: abandoned %d event(s) after %s", endpoint.webhook_id, len(events), reason,
+        )
+        if self.spool is not None:
+            await self.run_io(self.spool.dead_letter, endpoint.webhook_id, events, reason)
+        if self.on_failure is not None:
+            outcome = self.on_failure(endpoint.webhook_id, events, reason)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        return False
+
+    async def _send(self, endpoint: WebhookEndpoint, request: bytes) -> int:
+        connection, reused = await endpoint.acquire()
+        if not reused:
+            self.stats["connections"] += 1
+        try:
+            self.stats["requests"] += 1
+            try:
+                status = await connection.post(request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once fresh
+                connection.close()
+                await connection.open()
+                self.stats["connections"] += 1
+                status = await connection.post(request)
+        except BaseException:
+            connection.close()
+            raise
+        endpoint.release(connection, max_idle=self.workers_per_endpoint)
+        return status
+
+
+#: Application-wide delivery engine; spools under :data:`WEBHOOK_SPOOL_DIR_ENV`.
+delivery_engine = WebhookDeliveryEngine(
+    spool_dir=local_state_dir("webhook-spool", WEBHOOK_SPOOL_DIR_ENV),
+)
+
+
+async def dispatch_event(
+    event_type: str,
+    event: Dict[str, Any],
+    engine: Optional[WebhookDeliveryEngine] = None,
+) -> List[str]:
+    """Enqueue *event* for every matching webhook with a delivery endpoint.
+
+    Matching uses :data:`~._webhooks.webhook_index`.  Returns the ids of the
+    webhooks the event was queued for.
+    """
+    engine = engine or delivery_engine
+    await engine.start()
+    queued = []
+    for webhook_id in webhook_index.match(event_type, event):
+        if engine.has_endpoint(webhook_id):
+            await engine.enqueue(webhook_id, event)
+            queued.append(webhook_id)
+    return queued
@@ -0,0 +1,321 @@
+"""Persistent spool for webhook deliveries.
+
+Events queued in memory by :class:`~._delivery.WebhookDeliveryEngine` are
+lost when the Function instance recycles.  :class:`WebhookSpool` keeps them
+on disk in two append-only, segment-rotated logs:
+
+- ``pending`` — every event as it is enqueued, resolved once it has been
+  delivered or abandoned; unresolved entries are re-queued on start-up by
+  :meth:`~._delivery.WebhookDeliveryEngine.recover`;
+- ``dead-letter`` — events abandoned after their retries, resolved once
+  replayed by the ``replay-webhooks`` workflow.
+
+Each log is a directory of segment files ``<name>-<index>.seg``.  A record
+is a ``(length, crc32)`` header followed by a JSON body; entries carry a
+sequence number and resolutions are later tombstone records naming it, so
+nothing is ever rewritten in place.  Segments are read through
+:mod:`mmap`, and a torn or corrupt tail (from a crash mid-write) ends the
+scan of that segment; on open, the active segment is truncated to its last
+valid record so new records are never appended after one.  Fully resolved
+segments are deleted oldest-first by :meth:`SegmentLog.compact`.
+
+A log has a single writer: :func:`claim_slot` gives each process its own
+directory under a shared root, and a restarted process takes over the slot
+(and the unresolved entries) of one that has exited.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+#: Record header: payload length and CRC-32 of the payload.
+_HEADER = struct.Struct("<II")
+
+#: Segments are rotated once they reach this many bytes.
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+#: File under a spool directory recording the delivery endpoints, so events
+#: recovered by a new instance can be delivered before webhooks re-register.
+ENDPOINTS_FILE = "endpoints.json"
+
+#: Slot locks held by this process, kept open so the locks last as long as it.
+_SLOT_LOCKS: Dict[str, Any] = {}
+
+
+def claim_slot(root: str) -> str:
+    """Return a directory under *root* that no other live process is using.
+
+    Slots are ``slot-<n>`` directories locked with :func:`fcntl.flock`; the
+    lowest free slot is taken, so a restarted process picks up the slot of
+    one that has exited.  Where ``flock`` is unavailable ``slot-0`` is used.
+    """
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover — non-POSIX platforms
+        fcntl = None
+    index = 0
+    while True:
+        directory = os.path.join(root, f"slot-{index}")
+        if directory in _SLOT_LOCKS:
+            index += 1
+            continue
+        os.makedirs(directory, exist_ok=True)
+        if fcntl is None:
+            return directory
+        handle = open(os.path.join(directory, ".lock"), "a", encoding="utf-8")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            index += 1
+            continue
+        _SLOT_LOCKS[directory] = handle
+        return directory
+
+
+def release_slot(directory: str) -> None:
+    """Release a slot taken by :func:`claim_slot`."""
+    handle = _SLOT_LOCKS.pop(directory, None)
+    if handle is not None:
+        handle.close()
+
+
+class SegmentLog:
+    """Append-only log of entries and their resolutions, split into segments.
+
+    Args:
+        directory:     Directory holding the segment files.
+        name:          Segment file prefix.
+        segment_bytes: Size at which the active segment is rotated.
+        durable:       ``fsync`` after every append (survives power loss, at a
+                       large cost per record); otherwise records are flushed
+                       to the OS, which survives process crashes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        durable: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.name = name
+        self.segment_bytes = segment_bytes
+        self.durable = durable
+        os.makedirs(directory, exist_ok=True)
+        self._next_seq = 0
+        self._file: Optional[Any] = None
+        segments = self.segments()
+        self._active_index = segments[-1][0] if segments else 0
+        for index, path in segments:
+            end = 0
+            for end, record in self._scan_segment(path):
+                self._next_seq = max(self._next_seq, record.get("seq", -1) + 1)
+            if index == self._active_index and end < os.path.getsize(path):
+                # A crash tore the last append; records written after it
+                # would be unreadable, so cut the segment back first.
+                with open(path, "r+b") as handle:
+                    handle.truncate(end)
+
+    # ── Segment files ────────────────────────────────────────────────────────
+
+    def _path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.name}-{index:08d}.seg")
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """Return ``(index, path)`` for every segment, oldest first."""
+        prefix = f"{self.name}-"
+        found = []
+        for filename in os.listdir(self.directory):
+            if filename.startswith(prefix) and filename.endswith(".seg"):
+                index = filename[len(prefix):-4]
+                if index.isdigit():
+                    found.append((int(index), os.path.join(self.directory, filename)))
+        return sorted(found)
+
+    def _writer(self) -> Any:
+        if self._file is not None and self._file.tell() >= self.segment_bytes:
+            self._file.close()
+            self._file = None
+            self._active_index += 1
+        if self._file is None:
+            self._file = open(self._path(self._active_index), "ab")
+        return self._file
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def sync(self) -> None:
+        """``fsync`` the active segment, for callers batching durability themselves."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        body = json.dumps(record, separators=(",", ":"), default=str).encode()
+        handle = self._writer()
+        handle.write(_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        handle.flush()
+        if self.durable:
+            os.fsync(handle.fileno())
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Append an entry and return its sequence number."""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._append({**record, "seq": seq})
+        return seq
+
+    def resolve(self, seqs: List[int]) -> None:
+        """Append a tombstone resolving the entries *seqs*."""
+        if seqs:
+            self._append({"resolved": list(seqs)})
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the records of one segment via ``mmap``, stopping at a torn tail."""
+        for _, record in SegmentLog._scan_segment(path):
+            yield record
+
+    @staticmethod
+    def _scan_segment(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(end_offset, record)`` for the valid records of one segment."""
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                offset = 0
+                while offset + _HEADER.size <= size:
+                    length, crc = _HEADER.unpack_from(view, offset)
+                    start = offset + _HEADER.size
+                    body = view[start:start + length]
+                    if len(body) < length or zlib.crc32(body) != crc:
+                        break
+                    offset = start + length
+                    yield offset, json.loads(body)
+
+    def records(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(segment_index, record)`` for every record, oldest first."""
+        if self._file is not None:
+            self._file.flush()
+        for index, path in self.segments():
+            for record in self.read_segment(path):
+                yield index, record
+
+    def open_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield the entries not yet resolved, oldest first.
+
+        Two passes over the mapped segments: the first collects resolved
+        sequence numbers, the second streams the remaining entries, so only
+        the set of resolved numbers is held in memory.
+        """
+        resolved: Set[int] = set()
+        for _, record in self.records():
+            if "resolved" in record:
+                resolved.update(record["resolved"])
+        for _, record in self.records():
+            if "resolved" not in record and record["seq"] not in resolved:
+                yield record
+
+    def compact(self) -> int:
+        """Delete the oldest segments whose entries are all resolved; returns the count.
+
+        Only a prefix of segments is removed, so a tombstone is never deleted
+        while the entry it resolves still exists.
+        """
+        resolved: Set[int] = set()
+        per_segment: List[Tuple[int, str, List[int]]] = []
+        for index, path in self.segments():
+            seqs = []
+            for record in self.read_segment(path):
+                if "resolved" in record:
+                    resolved.update(record["resolved"])
+                else:
+                    seqs.append(record["seq"])
+            per_segment.append((index, path, seqs))
+
+        deleted = 0
+        for index, path, seqs in per_segment:
+            if index == self._active_index or not all(seq in resolved for seq in seqs):
+                break
+            os.remove(path)
+            deleted += 1
+        return deleted
+
+
+class WebhookSpool:
+    """Pending and dead-letter logs for webhook delivery.
+
+    Args:
+        directory:     Root directory; the logs share it with distinct prefixes.
+        segment_bytes: Segment rotation size for both logs.
+        durable:       ``fsync`` every record (see :class:`SegmentLog`).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        durable: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.pending = SegmentLog(directory, "pending", segment_bytes, durable)
+        self.dead_letters = SegmentLog(directory, "dead-letter", segment_bytes, durable)
+
+    def spool(self, webhook_id: str, event: Any) -> int:
+        """Record an event about to be queued; returns its pending sequence number."""
+        return self.pending.append({"webhook_id": webhook_id, "event": event})
+
+    def complete(self, seqs: List[Optional[int]]) -> None:
+        """Mark pending entries as finished (delivered or dead-lettered)."""
+        self.pending.resolve([seq for seq in seqs if seq is not None])
+
+    def dead_letter(self, webhook_id: str, events: List[Any], reason: str) -> int:
+        """Record events abandoned after their retries."""
+        return self.dead_letters.append({
+            "webhook_id": webhook_id,
+            "events": events,
+            "reason": reason,
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def save_endpoints(self, endpoints: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the recorded endpoint registrations (``webhook_id`` → options)."""
+        path = os.path.join(self.directory, ENDPOINTS_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump(endpoints, handle, default=str)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(path + ".tmp", path)
+
+    def load_endpoints(self) -> Dict[str, Dict[str, Any]]:
+        """Return the endpoint registrations recorded by :meth:`save_endpoints`."""
+        with suppress(FileNotFoundError, ValueError):
+            with open(os.path.join(self.directory, ENDPOINTS_FILE), encoding="utf-8") as handle:
+                endpoints = json.load(handle)
+            if isinstance(endpoints, dict):
+                return endpoints
+        return {}
+
+    def compact(self) -> int:
+        """Delete fully resolved segments of both logs."""
+        return self.pending.compact() + self.dead_letters.compact()
+
+    def close(self) -> None:
+        self.pending.close()
+        self.dead_letters.close()
@@ -0,0 +1,771 @@
+"""Conditional webhook filter evaluation.
+
+Filters registered through ``register-conditional-webhook`` are stored in
+:data:`~._app._WEBHOOK_FILTERS` as rule dicts.  Evaluating a rule by
+interpreting the dict on every event (building an operator table, looking up
+the field, dispatching on ``op``) costs more than the comparison itself, so
+each rule is compiled once into a predicate closure:
+
+- :func:`compile_filter` — turn a filter expression (a leaf rule or a nested
+  ``and``/``or``/``not`` tree over dotted field paths) into
+  ``predicate(event) -> bool``
+- :func:`get_compiled_filter` — cached predicate for a webhook id, recompiled
+  whenever the stored rule object is replaced (:func:`legacy_rule` keeps
+  rules stored before validation working)
+- :func:`evaluate_webhook_filter` — the public per-event entry point
+- :class:`WebhookIndex` / :data:`webhook_index` — fan-out index returning the
+  webhooks that match an event without evaluating every registered filter
+- :func:`evaluate_webhook_filters_batch` / :meth:`WebhookIndex.match_batch` —
+  columnar evaluation of filters over a batch of events as NumPy masks
+"""
+
+from __future__ import annotations
+
+import bisect
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ._app import _WEBHOOK_FILTERS, logger
+
+#: A compiled webhook filter.
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _contains(actual: Any, expected: Any) -> bool:
+    return expected in actual if actual is not None else False
+
+
+def _in(actual: Any, expected: Any) -> bool:
+    return actual in expected
+
+
+#: Filter ``op`` → binary comparison ``(actual, expected) -> bool``.
+FILTER_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "contains": _contains,
+    "in": _in,
+    "not_in": lambda actual, expected: actual not in expected,
+}
+
+#: Ops compiled specially rather than through :data:`FILTER_OPS`.
+SPECIAL_OPS = ("matches", "exists")
+
+#: Boolean combinators of the filter language.
+FILTER_COMBINATORS = ("and", "or", "not")
+
+_MISSING = object()
+
+#: Maps webhook_id → ``(rule, predicate)``; the rule object is kept so a
+#: replaced rule is detected by identity and recompiled.
+_COMPILED_FILTERS: Dict[str, Tuple[Dict[str, Any], Predicate]] = {}
+
+
+def _always(event: Dict[str, Any]) -> bool:
+    return True
+
+
+def _compile_path(field: str, default: Any = None) -> Callable[[Dict[str, Any]], Any]:
+    """Return a getter for a dotted *field* path (``"details.amount"``).
+
+    Path segments index into dicts by key and into lists by integer position.
+    The getter returns *default* when any segment is absent.
+    """
+    if "." not in field:
+        return lambda event: event.get(field, default)
+    parts = tuple(int(p) if p.isdigit() else p for p in field.split("."))
+
+    def getter(event: Dict[str, Any]) -> Any:
+        value: Any = event
+        for part in parts:
+            try:
+                value = value[part]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+
+    return getter
+
+
+def _compile_leaf(rule: Dict[str, Any]) -> Predicate:
+    op_name = rule.get("op", "eq")
+    field = str(rule.get("field", ""))
+    expected = rule.get("value")
+
+    if op_name == "exists":
+        present = _compile_path(field, _MISSING)
+        wanted = expected is None or bool(expected)
+        return lambda event: (present(event) is not _MISSING) is wanted
+
+    get = _compile_path(field)
+
+    if op_name == "matches":
+        try:
+            pattern = re.compile(expected)
+        except (re.error, TypeError) as exc:
+            raise ValueError(f"Invalid 'matches' pattern {expected!r}: {exc}") from exc
+        fullmatch = pattern.fullmatch
+
+        def matches(event: Dict[str, Any]) -> bool:
+            actual = get(event)
+            return isinstance(actual, str) and fullmatch(actual) is not None
+
+        return matches
+
+    compare = FILTER_OPS.get(op_name)
+    if compare is None:
+        raise ValueError(
+            f"Unknown webhook filter op '{op_name}'. Expected one of: "
+            f"{sorted([*FILTER_OPS, *SPECIAL_OPS])}"
+        )
+    if op_name in ("in", "not_in"):
+        if not isinstance(expected, (list, tuple, set, frozenset)):
+            raise ValueError(f"Webhook filter op '{op_name}' needs a list value")
+        try:
+            expected = frozenset(expected)
+        except TypeError:
+            expected = tuple(expected)
+
+    def predicate(event: Dict[str, Any]) -> bool:
+        try:
+            return bool(compare(get(event), expected))
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def _compile_node(node: Any) -> Predicate:
+    if not isinstance(node, dict):
+        raise ValueError(f"Webhook filter node must be an object, got {type(node).__name__}")
+    combinators = [key for key in FILTER_COMBINATORS if key in node]
+    if not combinators:
+        return _compile_leaf(node)
+    if len(combinators) > 1 or len(node) > 1:
+        raise ValueError(f"Webhook filter node mixes {sorted(node)}; use one of {FILTER_COMBINATORS}")
+
+    name = combinators[0]
+    if name == "not":
+        inner = _compile_node(node["not"])
+        return lambda event: not inner(event)
+
+    children = node[name]
+    if not isinstance(children, list) or not children:
+        raise ValueError(f"Webhook filter '{name}' needs a non-empty list of filters")
+    predicates = tuple(_compile_node(child) for child in children)
+    if len(predicates) == 1:
+        return predicates[0]
+
+    if name == "and":
+        def all_of(event: Dict[str, Any]) -> bool:
+            for predicate in predicates:
+                if not predicate(event):
+                    return False
+            return True
+
+        return all_of
+
+    def any_of(event: Dict[str, Any]) -> bool:
+        for predicate in predicates:
+            if predicate(event):
+                return True
+        return False
+
+    return any_of
+
+
+def compile_filter(rule: Optional[Dict[str, Any]]) -> Predicate:
+    """Compile a webhook filter expression into a single predicate.
+
+    A filter is either a leaf rule ``{"field", "op", "value"}`` or a boolean
+    node ``{"and": [...]}``, ``{"or": [...]}`` or ``{"not": {...}}``, nested
+    freely.  Leaf fields are dotted paths into the event
+    (``"details.amount"``; integer segments index lists).  Leaf ops:
+
+    - ``eq``, ``ne``, ``gt``, ``gte``, ``lt``, ``lte`` — comparisons
+    - ``contains`` — *value* is an element/substring of the field
+    - ``in`` / ``not_in`` — the field is (not) one of the listed values
+    - ``matches`` — the field is a string fully matching the regex *value*
+    - ``exists`` — the field is present (``"value": false`` for absent)
+
+    Regexes and ``in`` sets are built once here, and ``and``/``or`` short-
+    circuit, so evaluating an event costs at most one step per node.
+    Comparisons that raise :class:`TypeError` (e.g. ``gt`` between a number
+    and a string) evaluate to ``False``; a missing field compares as ``None``.
+    An empty rule matches every event.
+
+    Example — "priority in [high, critical] and details.amount > 1e6 and not
+    source matches test-.*"::
+
+        {"and": [
+            {"field": "priority", "op": "in", "value": ["high", "critical"]},
+            {"field": "details.amount", "op": "gt", "value": 1e6},
+            {"not": {"field": "source", "op": "matches", "value": "test-.*"}},
+        ]}
+
+    Raises:
+        ValueError: If the expression is malformed, uses an unknown ``op`` or
+            contains an invalid regular expression.
+    """
+    if not rule:
+        return _always
+    return _compile_node(rule)
+
+
+def legacy_rule(rule: Dict[str, Any], webhook_id: str = "") -> Dict[str, Any]:
+    """Return *rule* with every leaf that does not compile rewritten as ``eq``.
+
+    Filters are validated by :func:`register_filter`, but
+    :data:`~._app._WEBHOOK_FILTERS` may hold rules stored before that, which
+    were evaluated with an unknown ``op`` meaning ``eq``.  Such rules keep
+    that meaning instead of raising while events are evaluated; each
+    rewritten leaf is logged.
+    """
+    if not isinstance(rule, dict):
+        return rule
+    combinators = [key for key in FILTER_COMBINATORS if key in rule]
+    if combinators:
+        try:
+            _compile_node(rule)
+            return rule
+        except ValueError:
+            pass
+        if len(combinators) == 1 and len(rule) == 1:
+            children = rule[combinators[0]]
+            if combinators[0] == "not":
+                return {"not": legacy_rule(children, webhook_id)}
+            if isinstance(children, list) and children:
+                return {combinators[0]: [legacy_rule(child, webhook_id) for child in children]}
+    else:
+        try:
+            _compile_leaf(rule)
+            return rule
+        except ValueError:
+            pass
+    logger.warning("Webhook %s filter %s is invalid; evaluating it as 'eq'", webhook_id, rule)
+    return {"field": rule.get("field", ""), "op": "eq", "value": rule.get("value")}
+
+
+def get_compiled_filter(webhook_id: str) -> Optional[Predicate]:
+    """Return the compiled filter for *webhook_id*, or ``None`` if it has none.
+
+    Rules are compiled on first use and whenever the entry in
+    :data:`~._app._WEBHOOK_FILTERS` is replaced.  Replace a rule rather than
+    mutating it in place so the change is picked up.  Rules that never went
+    through :func:`register_filter` are compiled via :func:`legacy_rule`.
+    """
+    rule = _WEBHOOK_FILTERS.get(webhook_id)
+    if rule is None:
+        _COMPILED_FILTERS.pop(webhook_id, None)
+        return None
+    cached = _COMPILED_FILTERS.get(webhook_id)
+    if cached is not None and cached[0] is rule:
+        return cached[1]
+    predicate = compile_filter(legacy_rule(rule, webhook_id))
+    _COMPILED_FILTERS[webhook_id] = (rule, predicate)
+    return predicate
+
+
+def register_filter(
+    webhook_id: str,
+    rule: Dict[str, Any],
+    predicate: Optional[Predicate] = None,
+) -> Predicate:
+    """Store *rule* for *webhook_id* together with its compiled predicate.
+
+    The rule is compiled here (unless *predicate* was already compiled from
+    it), so invalid rules are rejected at registration rather than when the
+    first event arrives.
+    """
+    predicate = predicate or compile_filter(rule)
+    _WEBHOOK_FILTERS[webhook_id] = rule
+    _COMPILED_FILTERS[webhook_id] = (rule, predicate)
+    return predicate
+
+
+def evaluate_webhook_filter(webhook_id: str, event: Dict[str, Any]) -> bool:
+    """Return ``True`` if *event* passes the filter registered for *webhook_id*.
+
+    See :func:`compile_filter` for the filter language.
+
+    If no filter is registered for *webhook_id* this always returns ``True``.
+    """
+    predicate = get_compiled_filter(webhook_id)
+    return True if predicate is None else predicate(event)
+
+
+# ── Indexed fan-out ──────────────────────────────────────────────────────────
+
+_RANGE_OPS = {"gt": "lower", "gte": "lower", "lt": "upper", "lte": "upper"}
+
+
+def _is_number(value: Any) -> bool:
+    # bool is an int subclass and the predicates compare it as one (True >= 1),
+    # so the index does too; NaN compares false with everything.
+    return isinstance(value, (int, float)) and value == value
+
+
+def _index_keys(rule: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Any]]:
+    """Return the indexable conjuncts of *rule* — conditions every match satisfies.
+
+    ``eq``/``in`` leaves yield ``("hash", field, values)`` and numeric range
+    leaves yield ``("lower" | "upper", field, bound)``; hash keys come first.
+    A rule whose top level is ``or``/``not`` (or that has no filter) has none.
+    """
+    if not rule:
+        return []
+    leaves = rule["and"] if "and" in rule and isinstance(rule["and"], list) else [rule]
+    hashed: List[Tuple[str, str, Any]] = []
+    ranged: List[Tuple[str, str, Any]] = []
+    for leaf in leaves:
+        if not isinstance(leaf, dict) or "field" not in leaf:
+            continue
+        op_name, value = leaf.get("op", "eq"), leaf.get("value")
+        if op_name == "eq":
+            values: Any = (value,)
+        elif op_name == "in" and isinstance(value, (list, tuple, set, frozenset)):
+            values = tuple(value)
+        else:
+            values = None
+        if values is not None:
+            try:
+                frozenset(values)
+            except TypeError:
+                continue
+            hashed.append(("hash", str(leaf["field"]), values))
+        elif op_name in _RANGE_OPS and _is_number(value):
+            ranged.append((_RANGE_OPS[op_name], str(leaf["field"]), value))
+    return hashed + ranged
+
+
+class _RangeIndex:
+    """Sorted numeric bounds for one (event type, field) pair."""
+
+    __slots__ = ("bounds", "ids", "_pending")
+
+    def __init__(self) -> None:
+        self.bounds: List[float] = []
+        self.ids: List[str] = []
+        self._pending: List[Tuple[float, str]] = []
+
+    def add(self, bound: float, webhook_id: str) -> None:
+        self._pending.append((bound, webhook_id))
+
+    def remove(self, webhook_id: str) -> None:
+        self._flush()
+        keep = [(b, w) for b, w in zip(self.bounds, self.ids) if w != webhook_id]
+        self.bounds = [b for b, _ in keep]
+        self.ids = [w for _, w in keep]
+
+    def _flush(self) -> None:
+        if self._pending:
+            merged = sorted([*zip(self.bounds, self.ids), *self._pending], key=lambda p: p[0])
+            self.bounds = [b for b, _ in merged]
+            self.ids = [w for _, w in merged]
+            self._pending = []
+
+    def at_most(self, value: float) -> List[str]:
+        """Ids whose bound is ``<= value`` (lower-bound filters that may match)."""
+        self._flush()
+        return self.ids[:bisect.bisect_right(self.bounds, value)]
+
+    def at_least(self, value: float) -> List[str]:
+        """Ids whose bound is ``>= value`` (upper-bound filters that may match)."""
+        self._flush()
+        return self.ids[bisect.bisect_left(self.bounds, value):]
+
+
+class WebhookIndex:
+    """Discrimination index routing an event to the webhooks whose filters match.
+
+    Each webhook is indexed under every event type it subscribes to, by one
+    conjunct of its filter (see :func:`_index_keys`) — among ``eq``/``in``
+    conjuncts, the one whose buckets are smallest at registration time:
+
+    - ``eq`` / ``in`` leaves go into hash buckets keyed by
+      ``(event type, field, value)``;
+    - numeric ``gt``/``gte``/``lt``/``lte`` leaves go into per-field sorted
+      bound lists searched with :mod:`bisect`;
+    - webhooks without such a conjunct (no filter, or a top-level ``or`` /
+      ``not``) are kept in a per-type residual list.
+
+    :meth:`match` gathers candidates from the buckets for the event's field
+    values, the range lists and the residual list, then confirms each with
+    the webhook's compiled predicate, so routing an event costs time
+    proportional to the candidates rather than to all registered webhooks.
+    Subscribing to ``"*"`` matches every event type.
+    """
+
+    def __init__(self) -> None:
+        self._predicates: Dict[str, Predicate] = {}
+        self._rules: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._entries: Dict[str, List[Tuple[str, Optional[Tuple[str, str, Any]]]]] = {}
+        self._buckets: Dict[Tuple[str, str, Any], Set[str]] = {}
+        self._hash_fields: Dict[str, Set[str]] = {}
+        self._ranges: Dict[Tuple[str, str, str], _RangeIndex] = {}
+        self._range_fields: Dict[str, List[Tuple[str, str, _RangeIndex]]] = {}
+        self._residual: Dict[str, Set[str]] = {}
+        self._getters: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._predicates)
+
+    def __contains__(self, webhook_id: object) -> bool:
+        return webhook_id in self._predicates
+
+    def add(
+        self,
+        webhook_id: str,
+        events: List[str],
+        rule: Optional[Dict[str, Any]] = None,
+        predicate: Optional[Predicate] = None,
+    ) -> None:
+        """Index *webhook_id* for *events* with filter *rule* (replacing any previous entry)."""
+        if webhook_id in self._predicates:
+            self.remove(webhook_id)
+        self._predicates[webhook_id] = predicate or compile_filter(rule)
+        self._rules[webhook_id] = rule
+        keys = _index_keys(rule)
+        entries = self._entries[webhook_id] = []
+        for event_type in dict.fromkeys(events):
+            key = self._most_selective(event_type, keys)
+            entries.append((event_type, key))
+            if key is None:
+                self._residual.setdefault(event_type, set()).add(webhook_id)
+                continue
+            field = key[1]
+            if field not in self._getters:
+                self._getters[field] = _compile_path(field, _MISSING)
+            if key[0] == "hash":
+                self._hash_fields.setdefault(event_type, set()).add(field)
+                for value in key[2]:
+                    self._buckets.setdefault((event_type, field, value), set()).add(webhook_id)
+                continue
+            ranges = self._ranges.get((event_type, field, key[0]))
+            if ranges is None:
+                ranges = self._ranges[(event_type, field, key[0])] = _RangeIndex()
+                self._range_fields.setdefault(event_type, []).append((field, key[0], ranges))
+            ranges.add(key[2], webhook_id)
+
+    def _most_selective(
+        self,
+        event_type: str,
+        keys: List[Tuple[str, str, Any]],
+    ) -> Optional[Tuple[str, str, Any]]:
+        """Pick the hash key whose buckets are currently smallest, else the first range key."""
+        hashed = [key for key in keys if key[0] == "hash"]
+        if not hashed:
+            return keys[0] if keys else None
+        return min(hashed, key=lambda key: sum(
+            len(self._buckets.get((event_type, key[1], value), ())) for value in key[2]
+        ))
+
+    def remove(self, webhook_id: str) -> None:
+        """Drop *webhook_id* from the index (no-op if it is not indexed)."""
+        self._predicates.pop(webhook_id, None)
+        self._rules.pop(webhook_id, None)
+        for event_type, key in self._entries.pop(webhook_id, []):
+            if key is None:
+                self._residual.get(event_type, set()).discard(webhook_id)
+            elif key[0] == "hash":
+                for value in key[2]:
+                    self._buckets.get((event_type, key[1], value), set()).discard(webhook_id)
+            else:
+                self._ranges[(event_type, key[1], key[0])].remove(webhook_id)
+
+    def candidates(self, event_type: str, event: Dict[str, Any]) -> Set[str]:
+        """Return the webhooks that may match *event*, before predicate checks."""
+        found: Set[str] = set()
+        getters = self._getters
+        for etype in (event_type, "*"):
+            residual = self._residual.get(etype)
+            if residual:
+                found |= residual
+            for field in self._hash_fields.get(etype, ()):
+                value = getters[field](event)
+                try:
+                    # A missing field compares equal to None, as in the predicates
+                    bucket = self._buckets.get((etype, field, None if value is _MISSING else value))
+                except TypeError:  # unhashable field value
+                    continue
+                if bucket:
+                    found |= bucket
+            for field, side, ranges in self._range_fields.get(etype, ()):
+                value = getters[field](event)
+                if _is_number(value):
+                    found.update(ranges.at_most(value) if side == "lower" else ranges.at_least(value))
+        return found
+
+    def match(self, event_type: str, event: Dict[str, Any]) -> List[str]:
+        """Return the ids of webhooks subscribed to *event_type* whose filter accepts *event*."""
+        predicates = self._predicates
+        return sorted(w for w in self.candidates(event_type, event) if predicates[w](event))
+
+    def match_batch(
+        self,
+        event_types: Sequence[str],
+        events: Sequence[Dict[str, Any]],
+    ) -> Dict[str, List[int]]:
+        """Route a batch of events at once; returns webhook id → matching event indices.
+
+        Candidate webhooks are collected from the index for every event, then
+        each candidate's filter is evaluated once over the whole batch as a
+        NumPy mask (see :func:`compile_vector_filter`) and combined with the
+        mask of events whose type it subscribes to.
+        """
+        if not events:
+            return {}
+        columns = EventColumns(events)
+        types = np.asarray(event_types, dtype=object)
+        candidates: Set[str] = set()
+        for event_type, event in zip(event_types, events):
+            candidates |= self.candidates(event_type, event)
+
+        result: Dict[str, List[int]] = {}
+        for webhook_id in sorted(candidates):
+            subscribed = {event_type for event_type, _ in self._entries[webhook_id]}
+            type_mask = (
+                np.ones(len(events), dtype=bool) if "*" in subscribed
+                else np.isin(types, list(subscribed))
+            )
+            mask = type_mask & get_vector_filter(webhook_id, self._rules[webhook_id])(columns)
+            if mask.any():
+                result[webhook_id] = np.flatnonzero(mask).tolist()
+        return result
+
+
+#: Application-wide fan-out index populated by ``register-conditional-webhook``.
+webhook_index = WebhookIndex()
+
+
+# ── Batched columnar evaluation ──────────────────────────────────────────────
+
+#: Mask-producing form of a compiled filter.
+VectorPredicate = Callable[["EventColumns"], np.ndarray]
+
+
+class EventColumns:
+    """Column view of a batch of events, built lazily per field path.
+
+    For each field used by a filter the batch is materialised once as:
+
+    - :meth:`codes` — dictionary-encoded values (missing fields encode as
+      ``None``, unhashable values as ``-1``) plus the value → code map;
+    - :meth:`numeric` — ``float64`` values with ``NaN`` for non-numbers, and
+      the events whose integers ``float64`` would round;
+    - :meth:`present` — whether the field exists in each event.
+
+    All filters evaluated over the same batch share these columns.
+    """
+
+    def __init__(self, events: Sequence[Dict[str, Any]]) -> None:
+        self.events = events
+        self._raw: Dict[str, List[Any]] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, Dict[Any, int]]] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def raw(self, field: str) -> List[Any]:
+        column = self._raw.get(field)
+        if column is None:
+            get = _compile_path(field, _MISSING)
+            column = self._raw[field] = [get(event) for event in self.events]
+        return column
+
+    def present(self, field: str) -> np.ndarray:
+        return np.fromiter((v is not _MISSING for v in self.raw(field)), bool, len(self))
+
+    def codes(self, field: str) -> Tuple[np.ndarray, Dict[Any, int]]:
+        cached = self._codes.get(field)
+        if cached is None:
+            mapping: Dict[Any, int] = {}
+            codes = np.empty(len(self), dtype=np.int64)
+            for i, value in enumerate(self.raw(field)):
+                if value is _MISSING:
+                    value = None
+                try:
+                    codes[i] = mapping.setdefault(value, len(mapping))
+                except TypeError:  # unhashable value
+                    codes[i] = -1
+            cached = self._codes[field] = (codes, mapping)
+        return cached
+
+    def numeric(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``float64`` column of *field* and the indices it cannot hold exactly.
+
+        Integers beyond ±2**53 round when cast to ``float64``; their indices
+        are returned so callers can decide those events with exact Python
+        comparisons instead.
+        """
+        cached = self._numeric.get(field)
+        if cached is None:
+            raw = self.raw(field)
+            column = np.fromiter(
+                (float(v) if isinstance(v, (int, float)) else np.nan for v in raw),
+                np.float64,
+                len(self),
+            )
+            inexact = np.fromiter(
+                (i for i, v in enumerate(raw) if isinstance(v, int) and abs(v) > _EXACT_INT),
+                np.int64,
+            )
+            cached = self._numeric[field] = (column, inexact)
+        return cached
+
+
+#: Largest magnitude up to which every integer is exact in ``float64``.
+_EXACT_INT = 2 ** 53
+
+_VECTOR_COMPARE = {
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "lt": np.less,
+    "lte": np.less_equal,
+}
+
+
+def _code_lookup(field: str, scalar: Predicate) -> VectorPredicate:
+    """Mask events by deciding *scalar* once per distinct value of *field*.
+
+    Events whose value is unhashable (and so has no dictionary code) are
+    evaluated individually.
+    """
+    def vector(columns: EventColumns) -> np.ndarray:
+        codes, mapping = columns.codes(field)
+        table = np.zeros(len(mapping) + 1, dtype=bool)
+        for value, code in mapping.items():
+            table[code] = scalar(_nest(field, value))
+        mask = table[codes]
+        for i in np.flatnonzero(codes < 0):
+            mask[i] = scalar(columns.events[i])
+        return mask
+
+    return vector
+
+
+def _fallback(predicate: Predicate) -> VectorPredicate:
+    return lambda columns: np.fromiter(
+        (predicate(event) for event in columns.events), bool, len(columns),
+    )
+
+
+def _nest(field: str, value: Any) -> Dict[str, Any]:
+    """Build a minimal event holding *value* at the dotted path *field*."""
+    event: Dict[str, Any] = {}
+    node = event
+    parts = field.split(".")
+    for part in parts[:-1]:
+        node = node.setdefault(part, {})
+    node[parts[-1]] = value
+    return event
+
+
+def _vector_leaf(rule: Dict[str, Any]) -> VectorPredicate:
+    op_name = rule.get("op", "eq")
+    field = str(rule.get("field", ""))
+    expected = rule.get("value")
+    scalar = _compile_leaf(rule)  # validates the rule and provides exact semantics
+
+    if op_name == "exists":
+        wanted = expected is None or bool(expected)
+        return lambda columns: columns.present(field) == wanted
+
+    if op_name in _VECTOR_COMPARE and _is_number(expected) and not (
+        isinstance(expected, int) and abs(expected) > _EXACT_INT
+    ):
+        compare = _VECTOR_COMPARE[op_name]
+
+        def ranged(columns: EventColumns) -> np.ndarray:
+            column, inexact = columns.numeric(field)
+            mask = compare(column, expected)
+            for i in inexact:
+                mask[i] = scalar(columns.events[i])
+            return mask
+
+        return ranged
+
+    # Per-distinct-value decisions need paths made of dict keys only
+    by_value = op_name in ("eq", "ne", "in", "not_in", "matches") and not any(
+        part.isdigit() for part in field.split(".")
+    )
+    return _code_lookup(field, scalar) if by_value else _fallback(scalar)
+
+
+def _vector_node(node: Dict[str, Any]) -> VectorPredicate:
+    if "not" in node:
+        inner = _vector_node(node["not"])
+        return lambda columns: ~inner(columns)
+    for name, reduce in (("and", np.logical_and.reduce), ("or", np.logical_or.reduce)):
+        if name in node:
+            children = [_vector_node(child) for child in node[name]]
+            if len(children) == 1:
+                return children[0]
+            return lambda columns: reduce([child(columns) for child in children])
+    return _vector_leaf(node)
+
+
+def compile_vector_filter(rule: Optional[Dict[str, Any]]) -> VectorPredicate:
+    """Compile a filter into a function mapping :class:`EventColumns` to a bool mask.
+
+    Accepts the same language as :func:`compile_filter` and gives the same
+    answers, but evaluates a whole batch per call:
+
+    - numeric range comparisons become NumPy comparisons on a float column
+      (integers beyond ±2**53, in the event or the rule, are compared
+      exactly in Python);
+    - ``eq``/``ne``/``in``/``not_in``/``matches`` are decided once per
+      distinct value and broadcast through the dictionary codes, so a regex
+      runs once per distinct string rather than once per event;
+    - ``and``/``or``/``not`` combine masks;
+    - anything else (``contains``, list indices into a path, non-numeric
+      ranges) falls back to the scalar predicate per event.
+    """
+    if not rule:
+        return lambda columns: np.ones(len(columns), dtype=bool)
+    compile_filter(rule)  # raise ValueError for malformed filters up front
+    return _vector_node(rule)
+
+
+#: Maps webhook_id → ``(rule, vector predicate)``, like :data:`_COMPILED_FILTERS`.
+_COMPILED_VECTOR_FILTERS: Dict[str, Tuple[Optional[Dict[str, Any]], VectorPredicate]] = {}
+
+
+def get_vector_filter(webhook_id: str, rule: Optional[Dict[str, Any]]) -> VectorPredicate:
+    """Return the vector form of *rule* for *webhook_id*, recompiling when the rule is replaced."""
+    cached = _COMPILED_VECTOR_FILTERS.get(webhook_id)
+    if cached is not None and cached[0] is rule:
+        return cached[1]
+    vector = compile_vector_filter(legacy_rule(rule, webhook_id) if rule else rule)
+    _COMPILED_VECTOR_FILTERS[webhook_id] = (rule, vector)
+    return vector
+
+
+def evaluate_webhook_filters_batch(
+    events: Sequence[Dict[str, Any]],
+    webhook_ids: Optional[Sequence[str]] = None,
+) -> Dict[str, List[int]]:
+    """Evaluate registered filters over a batch of events in one pass.
+
+    Returns a mapping of webhook id → indices of the events in *events* that
+    pass its filter, for every webhook in *webhook_ids* (default: all of
+    :data:`~._app._WEBHOOK_FILTERS`) with at least one match.  A webhook with
+    no registered filter matches every event.
+    """
+    if not events:
+        return {}
+    columns = EventColumns(events)
+    result: Dict[str, List[int]] = {}
+    for webhook_id in webhook_ids if webhook_ids is not None else list(_WEBHOOK_FILTERS):
+        mask = get_vector_filter(webhook_id, _WEBHOOK_FILTERS.get(webhook_id))(columns)
+        if mask.any():
+            result[webhook_id] = np.flatnonzero(mask).tolist()
+    return result
@@ -7,29 +7,73 @@ as documented in ``docs/AOS_NEXT_ENHANCEMENTS.md``:
 2. Rate limiting (utilities in :mod:`._app`)
 3. ``start-workflow-chain`` — dependency-aware workflow launch
 4. ``start/get/stop-orchestration-group`` — bulk orchestration management
-5. ``find-agents`` — capability-based agent matching
-6. ``checkpoint/resume-orchestration`` — KB-backed checkpointing
-7. ``register-conditional-webhook`` + :func:`evaluate_webhook_filter`
-8. ``verify-audit-integrity`` — SHA-256 hash-chain tamper detection
+5. ``find-agents`` — capability-based agent matching (exact + hashed n-gram semantic)
+6. ``checkpoint/resume-orchestration`` — KB-backed incremental checkpointing,
+   ``compact-checkpoints`` — checkpoint retention and garbage collection
+7. ``register-conditional-webhook`` + :func:`~._webhooks.evaluate_webhook_filter`,
+   ``replay-webhooks`` — dead-lettered event replay
+8. ``verify-audit-integrity`` — SHA-256 hash-chain tamper detection (streamed,
+   incremental from a trusted anchor, or per-day Merkle roots),
+   ``prove-audit-entry`` — Merkle inclusion proofs,
+   ``verify-audit-logs`` / ``query-audit-logs`` / ``compact-audit-logs`` /
+   ``sweep-audit-logs`` — local audit-log files, their compacted columnar
+   segments and ``retention_until`` enforcement
 9. Middleware (utilities in :mod:`._app`)
 10. ``generate-api-docs`` — workflow documentation generation
 """
 
 from __future__ import annotations
 
-import hashlib
 import uuid
-from typing import Any, Callable, Dict, List
+from datetime import timedelta
+from typing import Any, Dict, List
 
 from aos_client import WorkflowRequest
 
 from ._app import (
     WORKFLOW_DEPENDENCIES,
     _ORCHESTRATION_GROUPS,
-    _WEBHOOK_FILTERS,
+    RateLimiter,
     app,
+    catalog_version,
+    descriptor_cache,
     logger,
 )
+from ._audit import (
+    DEFAULT_MAX_ANOMALIES,
+    DEFAULT_MERKLE_CHUNK,
+    DEFAULT_PAGE_ENTRIES,
+    ChainVerifier,
+    as_utc,
+    get_process_pool,
+    load_anchor,
+    prove_entry,
+    save_anchor,
+    verify_audit_chain,
+    verify_merkle_roots,
+)
+from ._audit_logs import DEFAULT_COMPACT_GRACE_DAYS, audit_log_store
+from ._capability_index import get_capability_index
+from ._delivery import DEFAULT_COALESCE, Coalescer, delivery_engine, validate_headers
+from ._webhooks import (
+    compile_filter,
+    register_filter,
+    webhook_index,
+)
+from ._checkpoints import (
+    _LATEST_CHECKPOINTS,
+    CHECKPOINT_DOC_TYPE,
+    DEFAULT_CHUNK_THRESHOLD,
+    DEFAULT_COMPRESS_THRESHOLD,
+    DEFAULT_FULL_SNAPSHOT_EVERY,
+    CheckpointRetentionPolicy,
+    checkpoint_scheduler,
+    compact_checkpoints,
+    doc_field,
+    get_latest_checkpoint,
+    load_checkpoint_data,
+    save_checkpoint,
+)
 
 
 # ── Beyond-SDK Workflows — Enhancement #5: Agent Capability Matching ─────────
@@ -43,40 +87,73 @@ async def find_agents_workflow(request: WorkflowRequest) -> Dict[str, Any]:
     ``list_agents()`` returns all agents without capability-based filtering;
     this workflow applies the filter and scoring locally.
 
+    With ``"semantic": true`` capabilities are also matched fuzzily against a
+    hashed n-gram index of the catalog (see :mod:`._capability_index`), so
+    ``"risk assessment"`` finds an agent advertising ``"risk-analysis"``.  A
+    required capability is then satisfied by an exact match or by a similarity
+    of at least ``semantic_threshold``, and the final score blends the exact
+    score with the semantic score using ``semantic_weight``.
+
     Request body::
 
         {
             "required_capabilities": ["risk-analysis", "financial-governance"],
             "preferred_capabilities": ["compliance"],
-            "min_score": 0.5
+            "min_score": 0.5,
+            "semantic": false,
+            "semantic_weight": 0.5,
+            "semantic_threshold": 0.35,
+            "top_k": 10
         }
     """
     all_agents = await request.client.list_agents()
     required = set(request.body.get("required_capabilities", []))
     preferred = set(request.body.get("preferred_capabilities", []))
     min_score: float = request.body.get("min_score", 0.0)
+    semantic: bool = bool(request.body.get("semantic", False))
+    semantic_weight: float = float(request.body.get("semantic_weight", 0.5))
+    semantic_threshold: float = float(request.body.get("semantic_threshold", 0.35))
+    top_k = request.body.get("top_k")
+
+    version = catalog_version(all_agents)
+    terms = sorted(required | preferred)
+    similarity = None
+    if semantic and terms:
+        similarity = get_capability_index(all_agents, version).similarity(terms)
+    required_rows = [i for i, term in enumerate(terms) if term in required]
 
     matches: List[Dict[str, Any]] = []
-    for agent in all_agents:
+    for position, agent in enumerate(all_agents):
         caps = set(getattr(agent, "capabilities", []))
-        if required and not required.issubset(caps):
+        if similarity is None:
+            if required and not required.issubset(caps):
+                continue
+        elif any(
+            terms[i] not in caps and similarity[i, position] < semantic_threshold
+            for i in required_rows
+        ):
             continue
         matched = caps & (required | preferred)
         denom = max(len(required | preferred), 1)
         score = len(matched) / denom
+        match: Dict[str, Any] = {}
+        if similarity is not None:
+            semantic_score = float(similarity[:, position].mean())
+            match["exact_score"] = score
+            match["semantic_score"] = semantic_score
+            score = (1.0 - semantic_weight) * score + semantic_weight * semantic_score
         if score < min_score:
             continue
-        agent_dict = (
-            agent.model_dump(mode="json") if hasattr(agent, "model_dump")
-            else {"agent_id": agent.agent_id}
-        )
         matches.append({
-            "agent": agent_dict,
+            "agent": descriptor_cache.dump(agent, version),
             "score": score,
             "matched_capabilities": sorted(matched),
+            **match,
         })
 
     matches.sort(key=lambda m: m["score"], reverse=True)
+    if top_k is not None:
+        matches = matches[:int(top_k)]
     return {"matches": matches, "total": len(matches)}
 
 
@@ -157,6 +234,7 @@ async def stop_orchestration_group(request: WorkflowRequest) -> Dict[str, Any]:
     for orch_id in group.get("orchestration_ids", []):
         if hasattr(request.client, "stop_orchestration"):
             await request.client.stop_orchestration(orch_id)
+            await checkpoint_scheduler.untrack(orch_id)
         else:
             logger.warning("SDK does not support stop_orchestration; skipping %s", orch_id)
 
@@ -176,41 +254,53 @@ async def checkpoint_orchestration_workflow(request: WorkflowRequest) -> Dict[st
     data is persisted via the knowledge-base document API so it survives
     restarts.
 
+    Checkpoints are incremental: when the previous checkpoint of the same
+    orchestration was written by this instance, only a JSON patch against it
+    is stored, with a full snapshot every ``full_snapshot_every`` deltas (see
+    :func:`~._checkpoints.build_checkpoint_document`).  Payloads larger than
+    ``compress_threshold`` bytes are stored zlib/LZMA-compressed, and
+    sub-trees of at least ``chunk_threshold`` bytes (agendas, covenants,
+    C-suite profiles) are stored once as content-addressed, reference-counted
+    chunks shared by every checkpoint that contains them.  Perpetual
+    orchestrations are also checkpointed automatically by
+    :data:`~._checkpoints.checkpoint_scheduler`.
+
     Request body::
 
         {
             "orchestration_id": "orch-abc123",
-            "checkpoint_data": {"phase": "risk-review", "iteration": 12}
+            "checkpoint_data": {"phase": "risk-review", "iteration": 12},
+            "full_snapshot_every": 10,
+            "compress_threshold": 4096,
+            "chunk_threshold": 2048
         }
     """
-    from datetime import datetime as dt, timezone
-
-    doc_body = {
-        "doc_type": "orchestration-checkpoint",
-        "title": f"Checkpoint for {request.body['orchestration_id']}",
-        "orchestration_id": request.body["orchestration_id"],
-        "checkpoint_data": request.body.get("checkpoint_data", {}),
-        "created_at": dt.now(timezone.utc).isoformat(),
-    }
-    doc = await request.client.create_document(doc_body)
-    checkpoint_id = doc.document_id if hasattr(doc, "document_id") else str(uuid.uuid4())
-    logger.info(
-        "Checkpoint %s saved for orchestration %s",
-        checkpoint_id,
+    return await save_checkpoint(
+        request.client,
         request.body["orchestration_id"],
+        request.body.get("checkpoint_data", {}),
+        full_snapshot_every=int(
+            request.body.get("full_snapshot_every", DEFAULT_FULL_SNAPSHOT_EVERY)
+        ),
+        compress_threshold=int(
+            request.body.get("compress_threshold", DEFAULT_COMPRESS_THRESHOLD)
+        ),
+        chunk_threshold=int(
+            request.body.get("chunk_threshold", DEFAULT_CHUNK_THRESHOLD)
+        ),
     )
-    return {
-        "checkpoint_id": checkpoint_id,
-        "orchestration_id": request.body["orchestration_id"],
-        "status": "saved",
-    }
 
 
 @app.workflow("resume-orchestration")
 async def resume_orchestration_workflow(request: WorkflowRequest) -> Dict[str, Any]:
     """Resume a perpetual orchestration from its latest checkpoint.
 
-    Implements SDK enhancement #6 (docs/AOS_NEXT_ENHANCEMENTS.md).
+    Implements SDK enhancement #6 (docs/AOS_NEXT_ENHANCEMENTS.md).  The
+    latest checkpoint is found through the orchestration's pointer document
+    (see :func:`~._checkpoints.get_latest_checkpoint`) with a direct get;
+    a full-text search is only used for orchestrations checkpointed before
+    pointers existed.  Delta checkpoints are resolved by replaying their
+    patches on top of the most recent full snapshot.
 
     Request body::
 
@@ -223,26 +313,20 @@ async def resume_orchestration_workflow(request: WorkflowRequest) -> Dict[str, A
     """
     orch_id: str = request.body["orchestration_id"]
 
-    # Find the latest checkpoint from the knowledge base
-    docs = await request.client.search_documents(
-        query=orch_id,
-        doc_type="orchestration-checkpoint",
-        limit=1,
-    )
-    if not docs:
-        raise ValueError(f"No checkpoint found for orchestration '{orch_id}'")
-
-    checkpoint_doc = docs[0]
-    checkpoint_data = (
-        checkpoint_doc.get("checkpoint_data", {})
-        if isinstance(checkpoint_doc, dict)
-        else getattr(checkpoint_doc, "checkpoint_data", {})
-    )
-    checkpoint_id = (
-        checkpoint_doc.get("document_id")
-        if isinstance(checkpoint_doc, dict)
-        else getattr(checkpoint_doc, "document_id", None)
-    )
+    checkpoint_doc = await get_latest_checkpoint(request.client, orch_id)
+    if checkpoint_doc is None:
+        # Legacy orchestrations without a pointer document
+        docs = await request.client.search_documents(
+            query=orch_id,
+            doc_type=CHECKPOINT_DOC_TYPE,
+            limit=1,
+        )
+        if not docs:
+            raise ValueError(f"No checkpoint found for orchestration '{orch_id}'")
+        checkpoint_doc = docs[0]
+
+    checkpoint_data = await load_checkpoint_data(request.client, checkpoint_doc)
+    checkpoint_id = doc_field(checkpoint_doc, "document_id") or _LATEST_CHECKPOINTS.get(orch_id)
 
     status = await request.client.start_orchestration(
         agent_ids=request.body.get("agent_ids", []),
@@ -267,33 +351,123 @@ async def resume_orchestration_workflow(request: WorkflowRequest) -> Dict[str, A
     }
 
 
+@app.workflow("compact-checkpoints")
+async def compact_checkpoints_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Delete superseded checkpoints according to a retention policy.
+
+    Keeps the ``keep_last`` most recent checkpoints of each orchestration plus
+    one per day for ``keep_daily_days`` days, together with every checkpoint a
+    retained delta depends on and the checkpoint the pointer references (see
+    :class:`~._checkpoints.CheckpointRetentionPolicy`).  Deletions are batched
+    and rate-capped.  Without ``orchestration_ids`` the orchestrations tracked
+    by :data:`~._checkpoints.checkpoint_scheduler` and those checkpointed by
+    this instance are compacted.
+
+    Request body::
+
+        {
+            "orchestration_ids": ["orch-abc123"],
+            "keep_last": 10,
+            "keep_daily_days": 30,
+            "batch_size": 25,
+            "dry_run": false
+        }
+    """
+    orchestration_ids: List[str] = request.body.get("orchestration_ids") or sorted(
+        set(checkpoint_scheduler.tracked_ids()) | set(_LATEST_CHECKPOINTS)
+    )
+    policy = CheckpointRetentionPolicy(
+        keep_last=int(request.body.get("keep_last", 10)),
+        keep_daily_days=int(request.body.get("keep_daily_days", 30)),
+    )
+    return await compact_checkpoints(
+        request.client,
+        orchestration_ids,
+        policy,
+        batch_size=int(request.body.get("batch_size", 25)),
+        dry_run=bool(request.body.get("dry_run", False)),
+    )
+
+
 # ── Beyond-SDK Workflows — Enhancement #7: Conditional Webhooks ──────────────
 
+#: Options accepted in the ``delivery`` object of ``register-conditional-webhook``.
+_DELIVERY_OPTIONS = frozenset({"accepts_batches", "max_batch_size", "queue_size", "headers", "coalesce"})
+
 
 @app.workflow("register-conditional-webhook")
 async def register_conditional_webhook(request: WorkflowRequest) -> Dict[str, Any]:
     """Register a webhook with an optional event filter.
 
     Implements SDK enhancement #7 (docs/AOS_NEXT_ENHANCEMENTS.md).  The filter
-    is stored locally and evaluated by :func:`evaluate_webhook_filter` when
-    deciding whether to deliver an event.
+    is validated and compiled into a predicate here, stored locally, and
+    evaluated by :func:`~._webhooks.evaluate_webhook_filter` when deciding
+    whether to deliver an event.  The webhook is also added to
+    :data:`~._webhooks.webhook_index`, which returns every webhook matching
+    an event without scanning all registered filters.  When ``delivery`` is
+    given, events routed to the webhook are delivered by
+    :data:`~._delivery.delivery_engine` (batched, pooled, retried) instead of
+    relying on the SDK.
+
+    ``delivery.coalesce`` collapses bursts before delivery (see
+    :class:`~._delivery.Coalescer`): the latest event per ``key`` within
+    ``window_ms``, the latest event only, or one summary per window.
+    Webhooks subscribed to ``orchestration.updated`` or ``erp.order_created``
+    get the matching :data:`~._delivery.DEFAULT_COALESCE` window unless
+    ``coalesce`` is given (``null`` disables it); this also holds without a
+    ``delivery`` object, in which case the engine delivers them with its
+    default options.
 
     Request body::
 
         {
             "url": "https://hooks.slack.com/...",
             "events": ["decision.created"],
-            "filter": {"field": "priority", "op": "eq", "value": "critical"}
+            "filter": {"and": [
+                {"field": "priority", "op": "in", "value": ["high", "critical"]},
+                {"field": "details.amount", "op": "gt", "value": 1000000}
+            ]},
+            "delivery": {
+                "accepts_batches": true,
+                "max_batch_size": 50,
+                "coalesce": {"window_ms": 250, "mode": "key", "key": "order_id"}
+            }
         }
+
+    See :func:`~._webhooks.compile_filter` for the filter language and
+    :class:`~._delivery.WebhookEndpoint` for the delivery options.
     """
+    webhook_filter = request.body.get("filter")
+    delivery = request.body.get("delivery")
+    if delivery is not None:
+        unknown = set(delivery) - _DELIVERY_OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown delivery option(s): {sorted(unknown)}")
+    if delivery is None or "coalesce" not in delivery:
+        defaults = {
+            tuple(sorted(DEFAULT_COALESCE[event].items()))
+            for event in request.body["events"] if event in DEFAULT_COALESCE
+        }
+        # Only when the subscribed events agree on a single window
+        if len(defaults) == 1:
+            delivery = {**(delivery or {}), "coalesce": dict(defaults.pop())}
+    if delivery is not None:
+        if delivery.get("coalesce"):
+            Coalescer.from_options(delivery["coalesce"])
+        validate_headers(delivery.get("headers"))
+    # Compile first so an invalid filter is rejected before the webhook exists
+    predicate = compile_filter(webhook_filter) if webhook_filter else None
     webhook = await request.client.register_webhook(
         url=request.body["url"],
         events=request.body["events"],
     )
     webhook_id = webhook.webhook_id if hasattr(webhook, "webhook_id") else str(uuid.uuid4())
-    webhook_filter = request.body.get("filter")
     if webhook_filter:
-        _WEBHOOK_FILTERS[webhook_id] = webhook_filter
+        register_filter(webhook_id, webhook_filter, predicate)
+    webhook_index.add(webhook_id, request.body["events"], webhook_filter, predicate)
+    if delivery is not None:
+        await delivery_engine.start()
+        delivery_engine.register_endpoint(webhook_id, request.body["url"], **delivery)
 
     result = (
         webhook.model_dump(mode="json") if hasattr(webhook, "model_dump")
@@ -304,34 +478,71 @@ async def register_conditional_webhook(request: WorkflowRequest) -> Dict[str, An
     return result
 
 
-def evaluate_webhook_filter(webhook_id: str, event: Dict[str, Any]) -> bool:
-    """Return ``True`` if *event* passes the filter registered for *webhook_id*.
+@app.workflow("replay-webhooks")
+async def replay_webhooks_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Send dead-lettered webhook events back through delivery.
+
+    Streams the unresolved entries of the dead-letter log of the spool
+    attached to :data:`~._delivery.delivery_engine` (see
+    :class:`~._spool.WebhookSpool`) and re-enqueues their events at no more
+    than ``rate_per_second``.  Each entry is resolved once its events are
+    queued; events that fail again are dead-lettered anew.  Entries for
+    webhooks without a delivery endpoint are left in place.  Fully resolved
+    spool segments are deleted afterwards.  Spool reads and writes run on
+    the engine's I/O thread.
+
+    Request body::
 
-    Supports ``op`` values: ``eq``, ``ne``, ``gt``, ``gte``, ``lt``, ``lte``,
-    ``contains``.
+        {
+            "webhook_id": "wh-123",
+            "rate_per_second": 10,
+            "limit": 1000
+        }
 
-    If no filter is registered for *webhook_id* this always returns ``True``.
+    ``webhook_id`` is optional (all webhooks by default); ``limit`` caps the
+    number of events replayed by one run.
     """
-    rule = _WEBHOOK_FILTERS.get(webhook_id)
-    if rule is None:
-        return True
-    field = rule.get("field", "")
-    op = rule.get("op", "eq")
-    expected = rule.get("value")
-    actual = event.get(field)
-    _ops: Dict[str, Callable] = {
-        "eq": lambda a, e: a == e,
-        "ne": lambda a, e: a != e,
-        "gt": lambda a, e: a > e,
-        "gte": lambda a, e: a >= e,
-        "lt": lambda a, e: a < e,
-        "lte": lambda a, e: a <= e,
-        "contains": lambda a, e: e in a if a is not None else False,
+    await delivery_engine.start()
+    spool = delivery_engine.spool
+    if spool is None:
+        raise ValueError("No webhook spool is attached to the delivery engine")
+    webhook_id = request.body.get("webhook_id")
+    rate = float(request.body.get("rate_per_second", 10))
+    limit = int(request.body.get("limit", 1000))
+    if rate <= 0:
+        raise ValueError("rate_per_second must be positive")
+    limiter = RateLimiter(requests_per_minute=max(1, round(rate * 60)), burst_limit=max(1, int(rate)))
+
+    replayed_entries = replayed_events = skipped = 0
+    entries = spool.dead_letters.open_entries()
+    while (entry := await delivery_engine.run_io(next, entries, None)) is not None:
+        target = entry["webhook_id"]
+        if webhook_id and target != webhook_id:
+            continue
+        if not delivery_engine.has_endpoint(target):
+            skipped += 1
+            continue
+        if replayed_events + len(entry["events"]) > limit and replayed_entries:
+            break
+        for event in entry["events"]:
+            await limiter.acquire()
+            await delivery_engine.enqueue(target, event)
+        await delivery_engine.run_io(spool.dead_letters.resolve, [entry["seq"]])
+        replayed_entries += 1
+        replayed_events += len(entry["events"])
+
+    await delivery_engine.run_io(entries.close)
+    segments_deleted = await delivery_engine.run_io(spool.compact)
+    logger.info(
+        "Replayed %d dead-lettered event(s) from %d entries (%d skipped)",
+        replayed_events, replayed_entries, skipped,
+    )
+    return {
+        "replayed_entries": replayed_entries,
+        "replayed_events": replayed_events,
+        "skipped_entries": skipped,
+        "segments_deleted": segments_deleted,
     }
-    try:
-        return _ops.get(op, _ops["eq"])(actual, expected)
-    except TypeError:
-        return False
 
 
 # ── Beyond-SDK Workflows — Enhancement #8: Audit Trail Tamper Detection ──────
@@ -345,74 +556,320 @@ async def verify_audit_integrity_workflow(request: WorkflowRequest) -> Dict[str,
     audit records via ``generate_compliance_report`` and chains their hashes to
     detect any tampering or missing entries.
 
+    The range is streamed in time slices sized adaptively towards
+    ``page_entries`` records per call (see :func:`~._audit.iter_audit_pages`);
+    only the running hash, counters and the first ``max_anomalies``
+    anomalies are kept, so memory does not grow with the length of the
+    trail.  Progress is logged after every page.
+
+    Without ``start_time`` the run is anchored: a clean run persists the
+    last verified (timestamp, entry id, chain hash) as a trusted anchor (see
+    :func:`~._audit.save_anchor`), and the next run verifies only the entries
+    after it (``"mode": "incremental"``).  ``"full": true`` — or an anchor
+    whose last full run is older than ``full_every_days`` — re-verifies from
+    the beginning and checks that the chain still reaches the anchor with
+    the same hash.  With ``start_time`` the given range is verified from the
+    genesis hash and the anchor is neither used nor moved.
+
+    ``"merkle": true`` instead recomputes a Merkle root per UTC day — the
+    root over roots of ``chunk_size``-entry chunks hashed in the shared
+    worker pool (``processes: 0`` hashes inline) — and compares each with
+    the root sealed for that day, sealing complete days seen for the first
+    time; days the range covers only in part are skipped (see
+    :func:`~._audit.verify_merkle_roots`).  Sealed roots back the inclusion
+    proofs of ``prove-audit-entry``.
+
     Request body::
 
         {
             "start_time": "2026-01-01T00:00:00",
-            "end_time":   "2026-03-31T23:59:59"
+            "end_time":   "2026-03-31T23:59:59",
+            "merkle": false,
+            "chunk_size": 1024,
+            "processes": 4,
+            "full": false,
+            "full_every_days": 30,
+            "slice_hours": 24,
+            "page_entries": 5000,
+            "max_anomalies": 100
         }
     """
     from datetime import datetime as dt, timezone
 
-    start_time = (
-        dt.fromisoformat(request.body["start_time"])
-        if "start_time" in request.body
-        else dt(2000, 1, 1)
-    )
-    end_time = (
-        dt.fromisoformat(request.body["end_time"])
-        if "end_time" in request.body
-        else dt.now(timezone.utc)
-    )
+    now = dt.now(timezone.utc)
+    end_time = dt.fromisoformat(request.body["end_time"]) if "end_time" in request.body else now
+    max_anomalies = int(request.body.get("max_anomalies", DEFAULT_MAX_ANOMALIES))
+    slice_size = timedelta(hours=float(request.body.get("slice_hours", 24)))
+    page_entries = int(request.body.get("page_entries", DEFAULT_PAGE_ENTRIES))
+
+    if request.body.get("merkle"):
+        result = await verify_merkle_roots(
+            request.client,
+            dt.fromisoformat(request.body["start_time"]) if "start_time" in request.body else dt(2000, 1, 1),
+            end_time,
+            chunk_size=int(request.body.get("chunk_size", DEFAULT_MERKLE_CHUNK)),
+            processes=request.body.get("processes"),
+            max_anomalies=max_anomalies,
+            slice_size=slice_size,
+            page_entries=page_entries,
+        )
+        logger.info(
+            "Audit Merkle verification: %d entries over %d days, %d sealed, %d anomalies",
+            result["entries_checked"], result["days_checked"], result["days_sealed"], result["anomaly_count"],
+        )
+        return result
+
+    anchor = None if "start_time" in request.body else await load_anchor(request.client)
+    full = bool(request.body.get("full", False))
+    full_every_days = request.body.get("full_every_days")
+    if anchor is not None and full_every_days is not None:
+        last_full = anchor.get("full_verified_at")
+        full = full or not last_full or (
+            now - as_utc(dt.fromisoformat(last_full)) >= timedelta(days=float(full_every_days))
+        )
 
-    report = await request.client.generate_compliance_report(
-        start_time=start_time,
-        end_time=end_time,
-        report_type="decisions",
-    )
+    if "start_time" in request.body:
+        mode = "range"
+        start_time = dt.fromisoformat(request.body["start_time"])
+        verifier = ChainVerifier(max_anomalies=max_anomalies)
+    elif anchor is not None and not full:
+        mode = "incremental"
+        start_time = dt.fromisoformat(anchor["timestamp"])
+        verifier = ChainVerifier(anchor["chain_hash"], max_anomalies)
+    else:
+        mode = "full"
+        start_time = dt(2000, 1, 1)
+        verifier = ChainVerifier(max_anomalies=max_anomalies, anchor=anchor)
 
-    entries = []
-    if hasattr(report, "entries"):
-        entries = report.entries
-    elif isinstance(report, dict):
-        entries = report.get("entries", [])
+    def log_progress(state: Dict[str, Any]) -> None:
+        logger.info(
+            "Audit verification: %d entries through %s (%d anomalies)",
+            state["entries_checked"], state["slice_end"], state["anomaly_count"],
+        )
 
-    prev_hash = "0" * 64
-    anomalies: List[Dict[str, Any]] = []
+    verifier, pages = await verify_audit_chain(
+        request.client,
+        start_time,
+        end_time,
+        verifier=verifier,
+        slice_size=slice_size,
+        page_entries=page_entries,
+        progress=log_progress,
+        resume_after=anchor if mode == "incremental" else None,
+    )
 
-    for i, entry in enumerate(entries):
-        entry_dict = (
-            entry.model_dump(mode="json") if hasattr(entry, "model_dump") else dict(entry)
-        )
-        # Exclude the stored hash field when recomputing
-        entry_for_hash = {k: v for k, v in entry_dict.items() if k != "hash"}
-        entry_str = str(sorted(entry_for_hash.items()))
-        current_hash = hashlib.sha256(f"{prev_hash}{entry_str}".encode()).hexdigest()
-
-        stored_hash = entry_dict.get("hash")
-        if stored_hash and stored_hash != current_hash:
-            anomalies.append({
-                "index": i,
-                "entry_id": entry_dict.get("id"),
-                "reason": "hash_mismatch",
-            })
-
-        prev_hash = current_hash
-
-    integrity_verified = len(anomalies) == 0
+    integrity_verified = verifier.anomaly_count == 0
     if integrity_verified:
-        logger.info("Audit integrity verified: %d entries checked", len(entries))
+        logger.info("Audit integrity verified (%s): %d entries checked", mode, verifier.entries_checked)
     else:
-        logger.warning("Audit integrity anomalies detected: %s", anomalies)
+        logger.warning(
+            "Audit integrity anomalies detected (%d): %s", verifier.anomaly_count, verifier.anomalies,
+        )
+
+    # Only a clean anchored run may move the anchor
+    new_anchor = None
+    position = verifier.to_anchor() or (
+        {k: anchor[k] for k in ("timestamp", "entry_id", "chain_hash")} if mode == "incremental" else None
+    )
+    if mode != "range" and integrity_verified and position is not None:
+        new_anchor = {
+            **position,
+            "verified_at": now.isoformat(),
+            "full_verified_at": now.isoformat() if mode == "full" else anchor.get("full_verified_at"),
+        }
+        try:
+            await save_anchor(request.client, new_anchor)
+        except Exception as exc:  # noqa: BLE001 — the next run starts from the old anchor
+            logger.warning("Audit verification anchor not saved: %s", exc)
+            new_anchor = None
 
     return {
         "verified": integrity_verified,
-        "entries_checked": len(entries),
-        "integrity_hash": prev_hash,
-        "anomalies": anomalies,
+        "mode": mode,
+        "entries_checked": verifier.entries_checked,
+        "integrity_hash": verifier.prev_hash,
+        "anomalies": verifier.anomalies,
+        "anomaly_count": verifier.anomaly_count,
+        "pages_fetched": pages,
+        "anchor": new_anchor or anchor,
     }
 
 
+@app.workflow("prove-audit-entry")
+async def prove_audit_entry_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Return a Merkle inclusion proof for one decision record.
+
+    Rebuilds the Merkle tree of the record's UTC day (see
+    :func:`~._audit.prove_entry`) and returns the O(log n) sibling path from
+    the record's leaf to the day root, together with the root sealed for
+    that day by ``verify-audit-integrity`` in Merkle mode.  A verifier
+    holding the sealed root can check the proof with
+    :func:`~._audit.verify_inclusion` without seeing any other record.
+
+    Request body::
+
+        {
+            "entry_id": "decision-123",
+            "timestamp": "2026-03-02T14:05:00",
+            "chunk_size": 1024,
+            "processes": 4
+        }
+    """
+    from datetime import datetime as dt
+
+    if "entry_id" not in request.body or "timestamp" not in request.body:
+        raise ValueError("prove-audit-entry requires 'entry_id' and 'timestamp'")
+    proof = await prove_entry(
+        request.client,
+        request.body["entry_id"],
+        dt.fromisoformat(request.body["timestamp"]),
+        chunk_size=int(request.body.get("chunk_size", DEFAULT_MERKLE_CHUNK)),
+        executor=get_process_pool(request.body.get("processes")),
+    )
+    logger.info(
+        "Inclusion proof for %s on %s: %d steps (verified: %s)",
+        proof["entry_id"], proof["day"], len(proof["proof"]), proof["verified"],
+    )
+    return proof
+
+
+@app.workflow("verify-audit-logs")
+async def verify_audit_logs_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Verify the per-event checksums of the local daily audit-log files.
+
+    Memory-maps each ``audit_logs/audit_log_YYYY-MM-DD.jsonl`` file of
+    :data:`~._audit_logs.audit_log_store` and recomputes every event's
+    SHA-256 ``checksum``, one file per worker process.  The same pass
+    rewrites each file's sidecar indexes used by ``query-audit-logs``.
+
+    Request body::
+
+        {
+            "processes": 4,
+            "max_anomalies": 100
+        }
+
+    ``processes`` defaults to the shared pool of one worker per CPU; ``0``
+    verifies without a pool.
+    """
+    max_anomalies = int(request.body.get("max_anomalies", DEFAULT_MAX_ANOMALIES))
+    result = await audit_log_store.verify(request.body.get("processes"), max_anomalies)
+    if result["verified"]:
+        logger.info(
+            "Audit logs verified: %d events in %d files", result["events_checked"], result["files_checked"],
+        )
+    else:
+        logger.warning("Audit log anomalies detected (%d): %s", result["anomaly_count"], result["anomalies"])
+    return result
+
+
+@app.workflow("query-audit-logs")
+async def query_audit_logs_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Query the local daily audit-log files through their sidecar indexes.
+
+    Filters on ``event_type``, ``subject_id`` and ``severity`` are answered
+    from each file's index (built or extended on demand), so only matching
+    lines are read and parsed.  A time window is binary-searched in each
+    file's sparse timestamp index, so reads start near ``start_time`` and
+    stop past ``end_time`` (see :meth:`~._audit_logs.AuditLogStore.query`).
+
+    Request body::
+
+        {
+            "event_type": "boardroom_decision",
+            "subject_id": "decision_2024_001",
+            "severity": "high",
+            "start_time": "2025-09-23T00:00:00",
+            "end_time": "2025-09-30T00:00:00",
+            "limit": 100
+        }
+
+    All fields are optional.
+    """
+    import asyncio
+    from datetime import datetime as dt
+    from itertools import islice
+
+    limit = int(request.body.get("limit", 100))
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    start_time = request.body.get("start_time")
+    end_time = request.body.get("end_time")
+    stats: Dict[str, int] = {}
+    matches = audit_log_store.query(
+        event_type=request.body.get("event_type"),
+        subject_id=request.body.get("subject_id"),
+        severity=request.body.get("severity"),
+        start_time=dt.fromisoformat(start_time) if start_time else None,
+        end_time=dt.fromisoformat(end_time) if end_time else None,
+        stats=stats,
+    )
+    events = await asyncio.to_thread(lambda: list(islice(matches, limit)))
+    return {"events": events, "count": len(events), **stats}
+
+
+@app.workflow("compact-audit-logs")
+async def compact_audit_logs_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Compact closed daily audit-log files into columnar segments.
+
+    Each file more than ``grace_days`` days old is rewritten as a
+    compressed ``audit_log_YYYY-MM-DD.col`` segment, read back and compared
+    with the file, and the file removed unless ``keep_source`` is set; a
+    file recreated for a day already compacted is appended to its segment
+    (see :meth:`~._audit_logs.AuditLogStore.compact`).
+
+    Request body::
+
+        {
+            "grace_days": 1,
+            "codec": "zlib",
+            "keep_source": false,
+            "processes": 4
+        }
+    """
+    result = await audit_log_store.compact(
+        grace_days=int(request.body.get("grace_days", DEFAULT_COMPACT_GRACE_DAYS)),
+        codec=request.body.get("codec", "zlib"),
+        processes=request.body.get("processes"),
+        keep_source=bool(request.body.get("keep_source", False)),
+    )
+    logger.info(
+        "Compacted %d audit-log files: %d -> %d bytes",
+        result["files_compacted"], result["source_bytes"], result["segment_bytes"],
+    )
+    return result
+
+
+@app.workflow("sweep-audit-logs")
+async def sweep_audit_logs_workflow(request: WorkflowRequest) -> Dict[str, Any]:
+    """Prune local audit-log events whose ``retention_until`` has passed.
+
+    Only the closed days whose earliest expiry is due are rewritten; each
+    keeps a retention manifest so ``verify-audit-logs`` still checks the
+    day's Merkle root over every event it held (see
+    :meth:`~._audit_logs.AuditLogStore.sweep`).
+
+    Request body::
+
+        {
+            "now": "2026-01-01T00:00:00Z",
+            "processes": 4
+        }
+    """
+    from datetime import datetime as dt
+
+    now = request.body.get("now")
+    result = await audit_log_store.sweep(
+        now=dt.fromisoformat(now) if now else None,
+        processes=request.body.get("processes"),
+    )
+    logger.info(
+        "Swept audit logs: %d events pruned from %d files, %d bytes reclaimed",
+        result["events_pruned"], result["files_swept"], result["bytes_reclaimed"],
+    )
+    return result
+
+
 # ── Beyond-SDK Workflows — Enhancement #3: Workflow Dependency Chains ─────────
 
 
@@ -12,6 +12,8 @@ from typing import Any, Dict
 from aos_client import WorkflowRequest
 
 from ._app import app, logger
+from ._checkpoints import TERMINAL_ORCHESTRATION_STATUSES, checkpoint_scheduler
+from ._delivery import delivery_engine, dispatch_event
 
 
 # ── Enterprise Capability Workflows (Enhancement #1–#12) ────────────────────
@@ -106,6 +108,40 @@ async def ask_agent_workflow(request: WorkflowRequest) -> Dict[str, Any]:
 # ── Orchestration Update Handlers ───────────────────────────────────────────
 
 
+async def _record_for_checkpoint(update) -> None:
+    """Fold an orchestration update into the scheduler's pending checkpoint state.
+
+    An update reporting a terminal status (see
+    :data:`~._checkpoints.TERMINAL_ORCHESTRATION_STATUSES`) writes the final
+    state and stops checkpointing the orchestration.
+    """
+    orchestration_id = getattr(update, "orchestration_id", None)
+    if orchestration_id:
+        checkpoint_scheduler.record_update(
+            orchestration_id,
+            getattr(update, "agent_id", "unknown"),
+            getattr(update, "output", ""),
+        )
+        status = getattr(update, "status", None)
+        status = getattr(status, "value", status)
+        if isinstance(status, str) and status.lower() in TERMINAL_ORCHESTRATION_STATUSES:
+            await checkpoint_scheduler.untrack(orchestration_id)
+
+
+async def _publish_update(update) -> None:
+    """Route an orchestration update to ``orchestration.updated`` webhooks.
+
+    Such webhooks coalesce per ``orchestration_id`` by default (see
+    :data:`~._delivery.DEFAULT_COALESCE`), so a burst of updates becomes one
+    request carrying the latest state of each orchestration.
+    """
+    await dispatch_event("orchestration.updated", {
+        "orchestration_id": getattr(update, "orchestration_id", None),
+        "agent_id": getattr(update, "agent_id", "unknown"),
+        "output": getattr(update, "output", ""),
+    })
+
+
 @app.on_orchestration_update("strategic-review")
 async def handle_strategic_review_update(update) -> None:
     """Handle intermediate updates from strategic review orchestrations."""
@@ -114,6 +150,8 @@ async def handle_strategic_review_update(update) -> None:
         getattr(update, "agent_id", "unknown"),
         getattr(update, "output", ""),
     )
+    await _record_for_checkpoint(update)
+    await _publish_update(update)
 
 
 @app.on_orchestration_update("boardroom-session")
@@ -124,6 +162,25 @@ async def handle_boardroom_session_update(update) -> None:
         getattr(update, "agent_id", "unknown"),
         getattr(update, "output", ""),
     )
+    await _record_for_checkpoint(update)
+    await _publish_update(update)
+
+
+async def handle_perpetual_orchestration_update(update) -> None:
+    """Record updates from the other perpetual orchestrations for checkpointing."""
+    await _record_for_checkpoint(update)
+    await _publish_update(update)
+
+
+for _workflow_name in (
+    "market-analysis",
+    "budget-approval",
+    "risk-assessment",
+    "covenant-compliance",
+    "talent-management",
+    "technology-review",
+):
+    app.on_orchestration_update(_workflow_name)(handle_perpetual_orchestration_update)
 
 
 @app.on_orchestration_update("create-conversation")
@@ -134,6 +191,7 @@ async def handle_boardroom_conversation_update(update) -> None:
         getattr(update, "agent_id", "unknown"),
         getattr(update, "output", ""),
     )
+    await _publish_update(update)
 
 
 # ── MCP Tool Integration (Enhancement #7) ───────────────────────────────────
@@ -254,11 +312,15 @@ async def handle_covenant_expiring(event) -> None:
 
 @app.on_mcp_event("erpnext", "order_created")
 async def handle_erp_order(event) -> None:
-    """Handle ERP order creation events."""
-    logger.info(
-        "ERP order created: %s",
-        getattr(event, "payload", {}),
-    )
+    """Handle ERP order creation events.
+
+    The order is routed to ``erp.order_created`` webhooks, which coalesce per
+    order by default (see :data:`~._delivery.DEFAULT_COALESCE`).
+    """
+    payload = getattr(event, "payload", {})
+    logger.info("ERP order created: %s", payload)
+    if isinstance(payload, dict):
+        await dispatch_event("erp.order_created", payload)
 
 
 # ── Webhook Handler (v5.0.0 Enhancement #12) ────────────────────────────────
@@ -266,8 +328,14 @@ async def handle_erp_order(event) -> None:
 
 @app.webhook("slack-notifications")
 async def notify_slack(event) -> None:
-    """Send notification to Slack when significant events occur."""
-    logger.info(
-        "Slack notification: %s",
-        getattr(event, "payload", {}),
-    )
+    """Send notification to Slack when significant events occur.
+
+    When a ``slack-notifications`` endpoint has been registered with
+    :data:`~._delivery.delivery_engine` at start-up, the payload is queued
+    for delivery there; otherwise it is only logged.
+    """
+    payload = getattr(event, "payload", {})
+    logger.info("Slack notification: %s", payload)
+    await delivery_engine.start()
+    if delivery_engine.has_endpoint("slack-notifications"):
+        await delivery_engine.enqueue("slack-notifications", payload)
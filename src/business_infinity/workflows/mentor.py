@@ -12,7 +12,8 @@ from typing import Any, Dict
 
 from aos_client import WorkflowRequest
 
-from ._app import app, logger
+from ._app import app, catalog_version, descriptor_cache, logger
+from ._decision_log import decision_log
 
 _TRAINING_JOB_DOC_TYPE = "mentor-training-job"
 
@@ -29,15 +30,11 @@ async def mentor_list_agents(request: WorkflowRequest) -> Dict[str, Any]:
         {}
     """
     all_agents = await request.client.list_agents()
+    version = catalog_version(all_agents)
     mentor_agents = []
     for agent in all_agents:
-        agent_id = getattr(agent, "agent_id", "unknown")
-        agent_dict = (
-            agent.model_dump(mode="json") if hasattr(agent, "model_dump")
-            else {"agent_id": agent_id}
-        )
         mentor_agents.append({
-            **agent_dict,
+            **descriptor_cache.dump(agent, version),
             "lora_version": "v1.0.0",
             "capabilities": getattr(agent, "capabilities", ["chat", "fine-tune"]),
             "status": "available",
@@ -161,7 +158,8 @@ async def mentor_deploy_adapter(request: WorkflowRequest) -> Dict[str, Any]:
 
     Request body::
 
-        {"agent_id": "ceo", "version": "v1.1.0", "job_id": "job_ceo_abc12345"}
+        {"agent_id": "ceo", "version": "v1.1.0", "job_id": "job_ceo_abc12345",
+         "idempotency_key": "req-7f3a"}
     """
     from datetime import datetime as dt, timezone
 
@@ -169,12 +167,12 @@ async def mentor_deploy_adapter(request: WorkflowRequest) -> Dict[str, Any]:
         if field not in request.body:
             raise ValueError(f"Missing required field: {field}")
 
-    await request.client.log_decision({
+    await decision_log.submit(request.client, {
         "title": f"Deploy LoRA adapter v{request.body['version']} for {request.body['agent_id']}",
         "rationale": "Mentor Mode adapter deployment",
         "agent_id": request.body["agent_id"],
         "adapter_version": request.body["version"],
-    })
+    }, idempotency_key=request.body.get("idempotency_key"))
     deployed_at = dt.now(timezone.utc).isoformat()
     logger.info(
         "LoRA adapter %s deployed for agent %s", request.body["version"], request.body["agent_id"]
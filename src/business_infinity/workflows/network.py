@@ -12,7 +12,8 @@ from typing import Any, Dict
 
 from aos_client import WorkflowRequest
 
-from ._app import app, logger
+from ._app import app, descriptor_cache, logger
+from ._decision_log import decision_log
 
 _NEGOTIATION_DOC_TYPE = "network-negotiation"
 
@@ -58,7 +59,8 @@ async def join_network(request: WorkflowRequest) -> Dict[str, Any]:
         {
             "linkedin_url": "https://linkedin.com/company/example",
             "company_name": "Example Corp",
-            "covenant_id": "cov-ethics-001"
+            "covenant_id": "cov-ethics-001",
+            "idempotency_key": "req-7f3a"
         }
     """
     if "linkedin_url" not in request.body:
@@ -81,12 +83,12 @@ async def join_network(request: WorkflowRequest) -> Dict[str, Any]:
             "joined_at": dt.now(timezone.utc).isoformat(),
         }
 
-    await request.client.log_decision({
+    await decision_log.submit(request.client, {
         "title": f"Joined Global Boardroom Network: {request.body.get('company_name', '')}",
         "rationale": "Network membership initiated via join-network workflow",
         "agent_id": "ceo",
         "linkedin_url": request.body["linkedin_url"],
-    })
+    }, idempotency_key=request.body.get("idempotency_key"))
     logger.info("Network join completed: %s", result)
     return result
 
@@ -109,10 +111,7 @@ async def discover_boardrooms(request: WorkflowRequest) -> Dict[str, Any]:
         peers = await request.client.discover_peers(
             filters={"industry": industry, "location": location} if (industry or location) else {}
         )
-        boardrooms = [
-            p.model_dump(mode="json") if hasattr(p, "model_dump") else dict(p)
-            for p in (peers[:max_results] if peers else [])
-        ]
+        boardrooms = descriptor_cache.dump_all(peers[:max_results] if peers else [])
     else:
         # Local stub when SDK peer discovery is unavailable
         boardrooms = []
@@ -178,7 +177,8 @@ async def sign_agreement(request: WorkflowRequest) -> Dict[str, Any]:
         {
             "agreement_id": "agr_abc12345",
             "signer_role": "ceo",
-            "covenant_id": "cov-001"
+            "covenant_id": "cov-001",
+            "idempotency_key": "req-7f3a"
         }
     """
     from datetime import datetime as dt, timezone
@@ -202,11 +202,11 @@ async def sign_agreement(request: WorkflowRequest) -> Dict[str, Any]:
             "signed_at": dt.now(timezone.utc).isoformat(),
         }
 
-    await request.client.log_decision({
+    await decision_log.submit(request.client, {
         "title": f"Agreement {request.body['agreement_id']} signed",
         "rationale": "Network agreement signature",
         "agent_id": request.body["signer_role"],
-    })
+    }, idempotency_key=request.body.get("idempotency_key"))
     logger.info("Agreement %s signed by %s", request.body["agreement_id"], request.body["signer_role"])
     return {
         "success": True,
@@ -12,6 +12,7 @@ from typing import Any, Dict
 from aos_client import WorkflowRequest
 
 from ._app import app, logger
+from ._decision_log import decision_log
 
 _ONBOARDING_CONSENT_DOC_TYPE = "onboarding-consent"
 
@@ -69,15 +70,17 @@ async def onboarding_parse_website(request: WorkflowRequest) -> Dict[str, Any]:
 async def onboarding_connect_system(request: WorkflowRequest) -> Dict[str, Any]:
     """Generate an OAuth authorization URL to connect an external system.
 
-    Logs the user's consent decision in the audit trail before returning
-    the redirect URL.
+    Journals the user's consent decision for the audit trail before
+    returning the redirect URL; it reaches AOS with the next group commit of
+    :data:`~._decision_log.decision_log`.
 
     Request body::
 
         {
             "system": "salesforce",
             "user_id": "founder-001",
-            "customer_id": "cust-001"
+            "customer_id": "cust-001",
+            "idempotency_key": "req-7f3a"
         }
     """
     if "system" not in request.body:
@@ -89,13 +92,13 @@ async def onboarding_connect_system(request: WorkflowRequest) -> Dict[str, Any]:
     auth_url: str = _OAUTH_URLS.get(system_name, f"https://example.com/oauth/{system_name}")
 
     # Log consent in the audit trail
-    await request.client.log_decision({
+    await decision_log.submit(request.client, {
         "title": f"Onboarding consent: connect {system_name}",
         "rationale": f"User {user_id} consented to connect {system_name} with read-only access",
         "agent_id": user_id,
         "customer_id": customer_id,
         "consent_type": "system_integration",
-    })
+    }, idempotency_key=request.body.get("idempotency_key"))
 
     logger.info("OAuth URL generated for system %s (user %s)", system_name, user_id)
     return {
@@ -193,7 +196,7 @@ async def onboarding_delete_data(request: WorkflowRequest) -> Dict[str, Any]:
 
     Request body::
 
-        {"customer_id": "cust-001", "user_id": "founder-001"}
+        {"customer_id": "cust-001", "user_id": "founder-001", "idempotency_key": "req-7f3a"}
     """
     from datetime import datetime as dt, timezone
 
@@ -203,12 +206,12 @@ async def onboarding_delete_data(request: WorkflowRequest) -> Dict[str, Any]:
     customer_id: str = request.body["customer_id"]
     user_id: str = request.body.get("user_id", customer_id)
 
-    await request.client.log_decision({
+    await decision_log.submit(request.client, {
         "title": f"Data deletion request: customer {customer_id}",
         "rationale": "GDPR right-to-erasure request submitted via onboarding-delete-data workflow",
         "agent_id": user_id,
         "customer_id": customer_id,
-    })
+    }, idempotency_key=request.body.get("idempotency_key"))
     requested_at = dt.now(timezone.utc).isoformat()
     logger.info("Data deletion request submitted for customer %s", customer_id)
     return {
@@ -8,6 +8,9 @@ independently.
 
 Each workflow starts an ongoing orchestration guided by a purpose.  Agents
 work toward the purpose continuously — there is no finite task to complete.
+Every orchestration started here is registered with the
+:data:`~._checkpoints.checkpoint_scheduler` so its state is checkpointed
+periodically without an explicit ``checkpoint-orchestration`` call.
 """
 
 from __future__ import annotations
@@ -17,6 +20,19 @@ from typing import Any, Dict, List
 from aos_client import AgentDescriptor, WorkflowRequest
 
 from ._app import app, c_suite_orchestration, logger, select_c_suite_agents
+from ._checkpoints import checkpoint_scheduler
+
+
+def _schedule_checkpoints(
+    workflow_name: str,
+    request: WorkflowRequest,
+    result: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Register a newly started perpetual orchestration for periodic checkpoints."""
+    checkpoint_scheduler.track(
+        request.client, result["orchestration_id"], workflow_name, context=request.body,
+    )
+    return result
 
 
 # ── Primary Perpetual Orchestration ──────────────────────────────────────────
@@ -35,12 +51,13 @@ async def boardroom_session(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"agenda": ["Q1 review", "hiring plan"], "mode": "autonomous"}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: True,
         purpose="Run autonomous boardroom with perpetual strategic governance and decision-making",
         purpose_scope="Full C-suite collaboration, strategic planning, operational reviews, and covenant compliance",
     )
+    return _schedule_checkpoints("boardroom-session", request, result)
 
 
 # ── Specialised Perpetual Orchestrations ─────────────────────────────────────
@@ -58,12 +75,13 @@ async def strategic_review(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"quarter": "Q1-2026", "focus_areas": ["revenue", "growth"]}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: True,
         purpose="Drive strategic review and continuous organisational improvement",
         purpose_scope="C-suite strategic alignment and cross-functional coordination",
     )
+    return _schedule_checkpoints("strategic-review", request, result)
 
 
 @app.workflow("market-analysis")
@@ -105,7 +123,11 @@ async def market_analysis(request: WorkflowRequest) -> Dict[str, Any]:
         workflow="hierarchical",
     )
     logger.info("Market analysis orchestration started: %s", status.orchestration_id)
-    return {"orchestration_id": status.orchestration_id, "status": status.status.value}
+    return _schedule_checkpoints(
+        "market-analysis",
+        request,
+        {"orchestration_id": status.orchestration_id, "status": status.status.value},
+    )
 
 
 @app.workflow("budget-approval")
@@ -138,7 +160,11 @@ async def budget_approval(request: WorkflowRequest) -> Dict[str, Any]:
         workflow="sequential",
     )
     logger.info("Budget governance orchestration started: %s", status.orchestration_id)
-    return {"orchestration_id": status.orchestration_id, "status": status.status.value}
+    return _schedule_checkpoints(
+        "budget-approval",
+        request,
+        {"orchestration_id": status.orchestration_id, "status": status.status.value},
+    )
 
 
 @app.workflow("risk-assessment")
@@ -152,12 +178,13 @@ async def risk_assessment(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"risk_domain": "cybersecurity", "risk_tolerance": "moderate"}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: a.agent_id in ("cso", "cto", "coo"),
         purpose="Continuously monitor, assess, and mitigate enterprise risks",
         purpose_scope="Risk identification, assessment, mitigation, and governance across all domains",
     )
+    return _schedule_checkpoints("risk-assessment", request, result)
 
 
 @app.workflow("covenant-compliance")
@@ -171,12 +198,13 @@ async def covenant_compliance(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"compliance_standard": "BIC", "scope": "global"}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: a.agent_id in ("ceo", "coo", "cso"),
         purpose="Ensure continuous covenant compliance and governance adherence",
         purpose_scope="Compliance monitoring, audit trail validation, and covenant enforcement",
     )
+    return _schedule_checkpoints("covenant-compliance", request, result)
 
 
 @app.workflow("talent-management")
@@ -190,12 +218,13 @@ async def talent_management(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"focus": "retention", "departments": ["engineering", "marketing"]}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: a.agent_id in ("chro", "ceo", "coo"),
         purpose="Drive talent strategy, organizational development, and workforce optimization",
         purpose_scope="Talent acquisition, retention, development, culture, and HR governance",
     )
+    return _schedule_checkpoints("talent-management", request, result)
 
 
 @app.workflow("technology-review")
@@ -209,9 +238,10 @@ async def technology_review(request: WorkflowRequest) -> Dict[str, Any]:
 
         {"focus_areas": ["cloud", "ai", "security"], "review_scope": "quarterly"}
     """
-    return await c_suite_orchestration(
+    result = await c_suite_orchestration(
         request,
         agent_filter=lambda a: a.agent_id in ("cto", "ceo", "cso"),
         purpose="Drive technology strategy, architecture excellence, and innovation",
         purpose_scope="Technology roadmap, architecture review, engineering practices, and innovation pipeline",
     )
+    return _schedule_checkpoints("technology-review", request, result)
@@ -6,6 +6,7 @@ imported and all decorator-based registrations can be verified without a
 live AOS installation.
 """
 
+import os
 import sys
 import types
 from typing import Any, Callable, Dict, List, Optional
@@ -139,3 +140,10 @@ _obs_module.ObservabilityConfig = ObservabilityConfig
 
 sys.modules["aos_client"] = _aos_client_module
 sys.modules["aos_client.observability"] = _obs_module
+
+# ── Instance-local state ─────────────────────────────────────────────────────
+# Keep the application-wide webhook spool and decision journal off disk; tests
+# attach their own.
+
+os.environ["BUSINESS_INFINITY_WEBHOOK_SPOOL_DIR"] = ""
+os.environ["BUSINESS_INFINITY_DECISION_JOURNAL_DIR"] = ""